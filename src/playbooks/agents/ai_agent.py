@@ -5,12 +5,13 @@ agents that can execute various types of playbooks, handle LLM interactions,
 and manage execution state.
 """
 
-import copy
+import asyncio
 import hashlib
+import inspect
 import tempfile
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, List, Optional, Union
 
 from playbooks.compilation.expression_engine import (
     ExpressionContext,
@@ -30,8 +31,10 @@ from playbooks.core.identifiers import AgentID
 from playbooks.core.message import MessageType
 from playbooks.execution.agents_accessor import AgentsAccessor
 from playbooks.execution.call import PlaybookCall, PlaybookCallResult
+from playbooks.execution.prompt_sections import PromptSectionCache
 from playbooks.infrastructure.event_bus import EventBus
 from playbooks.infrastructure.logging.debug_logger import debug
+from playbooks.llm.llm_context_compactor import CompactionConfig, LLMContextCompactor
 from playbooks.llm.messages import (
     ExecutionResultLLMMessage,
     FileLoadLLMMessage,
@@ -90,10 +93,13 @@ class AIAgentMeta(BaseAgentMeta):
         """Validate the metadata for this agent.
 
         Raises:
-            ValueError: If startup_mode is invalid
+            ValueError: If startup_mode or warm_pool is invalid
         """
         if self.startup_mode not in [StartupMode.DEFAULT, StartupMode.STANDBY]:
             raise ValueError(f"Invalid startup mode: {self.startup_mode}")
+        warm_pool = getattr(self, "metadata", {}).get("warm_pool", 0)
+        if not isinstance(warm_pool, int) or warm_pool < 0:
+            raise ValueError(f"Invalid warm pool size: {warm_pool}")
 
     def should_create_instance_at_start(self) -> bool:
         """Whether to create an instance of the agent at start.
@@ -156,7 +162,7 @@ class AIAgent(BaseAgent, ABC, metaclass=AIAgentMeta):
             source_file_path=source_file_path,
             **kwargs,
         )
-        self.playbooks: Dict[str, Playbook] = self.deep_copy_playbooks(
+        self.playbooks: Dict[str, Playbook] = self.bind_playbooks(
             self.__class__.playbooks or {}
         )
         # Create instance-specific namespace with playbook wrappers
@@ -174,6 +180,13 @@ class AIAgent(BaseAgent, ABC, metaclass=AIAgentMeta):
         self.agents_list: List[str] = []
         self.last_llm_response: str = ""
         self.last_message_target: Optional[str] = None
+        self.last_message_to_human: bool = False
+        # Prompt context renderings reused across LLM calls
+        self.prompt_sections: PromptSectionCache = PromptSectionCache()
+        # Keeps summaries of compacted-away history across LLM calls
+        self.context_compactor: LLMContextCompactor = LLMContextCompactor(
+            CompactionConfig.from_settings()
+        )
 
         # Meetings
         self.owned_meetings: Dict[str, Meeting] = {}
@@ -236,58 +249,74 @@ class AIAgent(BaseAgent, ABC, metaclass=AIAgentMeta):
             )
             self.call_stack.top_level_llm_messages.append(trigger_msg)
 
-    def deep_copy_playbooks(self, playbooks):
-        """Deep copy the playbooks."""
-        playbooks_copy = copy.deepcopy(playbooks)
-        for playbook in playbooks_copy.values():
-            if hasattr(playbook, "func") and playbook.func:
-                playbook.func = copy_func(playbook.func)
+    def assign_id(self, agent_id: str) -> None:
+        """Give a constructed but not yet registered agent its ID.
+
+        Also updates the copies of the ID taken during construction.
+
+        Args:
+            agent_id: Unique identifier for this agent instance
+        """
+        super().assign_id(agent_id)
+        self.session_log.agent_id = agent_id
+        self.call_stack.agent_id = agent_id
+        self.meeting_manager.agent_id = agent_id
+        self.meeting_manager.meeting_message_handler.agent_id = agent_id
+        for playbook in self.playbooks.values():
+            playbook.agent_name = str(self)
 
-        return playbooks_copy
+    def bind_playbooks(self, playbooks: Dict[str, Playbook]) -> Dict[str, Playbook]:
+        """Bind the class playbooks to this agent instance.
+
+        Playbook definitions are shared by all instances of the agent class;
+        each instance only gets lightweight bound copies (see Playbook.bind).
+        """
+        return {name: playbook.bind(self) for name, playbook in playbooks.items()}
 
     def _setup_isolated_namespace(self):
         """Create isolated namespace with instance-specific agent reference and playbook wrappers."""
         # Create isolated namespace for this instance
         # Preserve class-level namespace if it exists (contains imports from Python code blocks)
+        class_namespace = None
         if (
             hasattr(self.__class__, "namespace_manager")
             and self.__class__.namespace_manager
         ):
-            # Copy the class namespace to preserve imports and module-level variables
-            self.namespace_manager = AgentNamespaceManager(
-                namespace=self.__class__.namespace_manager.namespace.copy()
-            )
-        else:
-            self.namespace_manager = AgentNamespaceManager()
-        self.namespace_manager.namespace["self"] = self
-        self.namespace_manager.namespace["agent"] = (
-            self  # Allow 'agent' as alias for 'self'
-        )
-        self.namespace_manager.namespace["agents"] = (
-            self.all_agents  # Provide access to agents list
-        )
-
-        # Set up cross-playbook wrapper functions and bind agent-specific functions
+            class_namespace = self.__class__.namespace_manager.namespace
+        # AgentNamespaceManager copies the class namespace, so imports and
+        # module-level variables are preserved without being shared
+        self.namespace_manager = AgentNamespaceManager(namespace=class_namespace)
+        namespace = self.namespace_manager.namespace
+        namespace["self"] = self
+        namespace["agent"] = self  # Allow 'agent' as alias for 'self'
+        namespace["agents"] = self.all_agents  # Provide access to agents list
+
+        # Set up cross-playbook wrapper functions
         for playbook_name, playbook in self.playbooks.items():
-            # Create cross-playbook wrapper function
-            call_through = playbook.create_namespace_function(self)
-            self.namespace_manager.namespace[playbook_name] = call_through
-            playbook.agent_name = str(self)
+            namespace[playbook_name] = playbook.create_namespace_function(self)
 
-        for playbook_name, playbook in self.playbooks.items():
+        # Bind agent-specific functions. Python playbooks defined in the class
+        # namespace run against this agent's namespace directly; functions
+        # defined elsewhere get it overlaid on their own globals, built once
+        # per globals dict rather than once per playbook.
+        overlaid_globals: Dict[int, Dict[str, Any]] = {}
+        for playbook in self.playbooks.values():
             if (
                 hasattr(playbook, "create_agent_specific_function")
                 and not playbook.func
             ):
                 playbook.func = playbook.create_agent_specific_function(self)
+                continue
+
+            func_globals = playbook.func.__globals__
+            if func_globals is class_namespace:
+                func_globals = namespace
             else:
-                playbook.func = copy_func(
-                    playbook.func,
-                    globals={
-                        **playbook.func.__globals__,
-                        **self.namespace_manager.namespace,
-                    },
-                )
+                key = id(func_globals)
+                if key not in overlaid_globals:
+                    overlaid_globals[key] = {**func_globals, **namespace}
+                func_globals = overlaid_globals[key]
+            playbook.func = copy_func(playbook.func, globals=func_globals)
 
         # Add agent classes for factory pattern access
         self._add_agent_classes_to_namespace()
@@ -350,8 +379,16 @@ class AIAgent(BaseAgent, ABC, metaclass=AIAgentMeta):
             filter(lambda x: isinstance(x, AIAgent) and x != self, self.program.agents)
         )
 
-    def event_agents_changed(self):
-        self.agents_list = [str(agent) for agent in self.program.agents]
+    def event_agents_changed(self, agents_list: Optional[List[str]] = None):
+        """Refresh the list of agents after agents were created or removed.
+
+        Args:
+            agents_list: Names of all program agents, when already computed
+                by the caller; shared between agents and must not be mutated
+        """
+        if agents_list is None:
+            agents_list = [str(agent) for agent in self.program.agents]
+        self.agents_list = agents_list
 
     def get_available_playbooks(self) -> List[str]:
         """Get a list of available playbook names.
@@ -407,23 +444,54 @@ async def {self.bgn_playbook_name}(**kwargs) -> None:
     await MessageProcessingEventLoop()
 """
 
-        # Save to tmp file
-        filename = f"{self.klass}_{self.bgn_playbook_name}_{hashlib.sha256(code_block.encode()).hexdigest()[:16]}.pb"
-        file_path = Path(tempfile.gettempdir()) / filename
-        with open(file_path, "w") as f:
-            f.write(code_block)
-
-        # debug("BGN Playbook Code Block: " + code_block)
-        new_playbook = PythonPlaybook.create_playbooks_from_code_block(
-            code_block,
-            self.namespace_manager,
-            file_path,
-            1,
-        )
-        for playbook in new_playbook.values():
-            playbook.source_file_path = file_path
-            playbook.agent_name = str(self)
-        self.playbooks.update(new_playbook)
+        # Compiled once per agent class and bound to each instance
+        namespace = self.namespace_manager.namespace
+        namespace.update(self.namespace_manager.prepare_execution_environment())
+        for name, definition in self._begin_playbook_definitions(
+            self.bgn_playbook_name, code_block
+        ).items():
+            playbook = definition.bind(self)
+            if inspect.isfunction(definition.func):
+                playbook.func = copy_func(definition.func, globals=namespace)
+            namespace[name] = playbook.create_namespace_function(self)
+            self.playbooks[name] = playbook
+
+    @classmethod
+    def _begin_playbook_definitions(
+        cls, name: str, code_block: str
+    ) -> Dict[str, Playbook]:
+        """Get the begin playbook defined by code_block, created once per class.
+
+        Args:
+            name: Name of the begin playbook
+            code_block: Generated code of the begin playbook
+
+        Returns:
+            Playbook definitions to bind to each instance
+        """
+        cache = cls.__dict__.get("_begin_playbooks_cache")
+        if cache is None:
+            cache = {}
+            cls._begin_playbooks_cache = cache
+        definitions = cache.get(code_block)
+        if definitions is None:
+            # Save to tmp file
+            filename = f"{cls.klass}_{name}_{hashlib.sha256(code_block.encode()).hexdigest()[:16]}.pb"
+            file_path = Path(tempfile.gettempdir()) / filename
+            with open(file_path, "w") as f:
+                f.write(code_block)
+
+            # debug("BGN Playbook Code Block: " + code_block)
+            definitions = PythonPlaybook.create_playbooks_from_code_block(
+                code_block,
+                AgentNamespaceManager(),
+                file_path,
+                1,
+            )
+            for playbook in definitions.values():
+                playbook.source_file_path = file_path
+            cache[code_block] = definitions
+        return definitions
 
     async def initialize(self) -> None:
         """Initialize the agent.
@@ -555,7 +623,15 @@ async def {self.bgn_playbook_name}(**kwargs) -> None:
         instructions = self.trigger_instructions(with_namespace=False)
         seen = set(instructions)
 
+        # Instances of a class with playbooks share its playbook definitions,
+        # so their public triggers are the same and only one is visited
+        seen_klasses = set()
         for agent in self.other_agents:
+            agent_klass = type(agent)
+            if getattr(agent_klass, "playbooks", None):
+                if agent_klass in seen_klasses:
+                    continue
+                seen_klasses.add(agent_klass)
             # Only include public triggers from other agents
             agent_instructions = agent.trigger_instructions(
                 with_namespace=True, public_only=True
@@ -569,6 +645,25 @@ async def {self.bgn_playbook_name}(**kwargs) -> None:
 
     @classmethod
     def get_compact_information(cls, public_only: bool = False) -> str:
+        # Rendered once per class and rebuilt only if its playbooks or
+        # description are replaced
+        source = (cls.playbooks, len(cls.playbooks or ()), cls.description)
+        cache = cls.__dict__.get("_compact_information_cache")
+        if cache is None:
+            cache = {}
+            cls._compact_information_cache = cache
+        cached = cache.get(public_only)
+        if (
+            cached is None
+            or cached[0][0] is not source[0]
+            or cached[0][1:] != source[1:]
+        ):
+            cached = (source, cls._render_compact_information(public_only))
+            cache[public_only] = cached
+        return cached[1]
+
+    @classmethod
+    def _render_compact_information(cls, public_only: bool) -> str:
         info_parts = []
         info_parts.append(f"class {cls.klass}:")
         if cls.description:
@@ -732,6 +827,24 @@ async def {self.bgn_playbook_name}(**kwargs) -> None:
         # Default to human
         return "human"
 
+    def is_conversing_with_human(self) -> bool:
+        """Check whether the agent's current conversation includes a human.
+
+        In a meeting, a human must have joined it. Otherwise the agent's last
+        1:1 message must have gone to a human.
+
+        Returns:
+            True if a human is part of the current conversation
+        """
+        meeting = self.get_current_meeting()
+        if meeting is None:
+            return self.last_message_to_human
+        if isinstance(meeting, JoinedMeeting):
+            agents_by_id = getattr(self.program, "agents_by_id", None) or {}
+            owner = agents_by_id.get(meeting.owner_id)
+            meeting = getattr(owner, "owned_meetings", {}).get(meeting.id)
+        return bool(meeting and meeting.get_humans())
+
     @property
     def public_playbooks(self) -> List[Playbook]:
         """Get list of public playbooks with their information.
@@ -1459,6 +1572,29 @@ async def {self.bgn_playbook_name}(**kwargs) -> None:
         """
         await self._current_executor.capture_trigger(code)
 
+    async def Parallel(self, *calls: Awaitable[Any]) -> List[Any]:
+        """Run independent playbook calls concurrently.
+
+        Each call runs in its own task on a fork of the call stack, so the
+        frames of concurrent calls never interleave. If a call fails, the
+        calls still running are cancelled and awaited before its error is
+        raised.
+
+        Args:
+            calls: Unawaited playbook calls, e.g. self.A(x), other_agent.B(y)
+
+        Returns:
+            The results of the calls, in the order given
+        """
+        tasks = [asyncio.create_task(self.call_stack.run_forked(c)) for c in calls]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     @classmethod
     async def get_or_create(cls, *, requester, **create_kwargs):
         """Get an available agent of this type or create a new one.
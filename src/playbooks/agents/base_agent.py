@@ -111,6 +111,17 @@ class BaseAgent(MessagingMixin, ABC, metaclass=BaseAgentMeta):
         self._debug_thread_id: Optional[int] = None
         self.paused: Optional[str] = None
 
+    def assign_id(self, agent_id: str) -> None:
+        """Give a constructed but not yet registered agent its ID.
+
+        Agents built ahead of use (see AgentWarmPool) get their ID when they
+        are taken, so IDs follow the order agents are created in.
+
+        Args:
+            agent_id: Unique identifier for this agent instance
+        """
+        self.id = agent_id
+
     async def begin(self) -> None:
         """Agent startup logic. Override in subclasses.
 
@@ -317,6 +328,8 @@ class BaseAgent(MessagingMixin, ABC, metaclass=BaseAgentMeta):
         if resolved_target not in ["human", "user"]:
             if hasattr(self, "last_message_target"):
                 self.last_message_target = resolved_target
+        if hasattr(self, "last_message_to_human"):
+            self.last_message_to_human = self._is_human_target(resolved_target)
 
         # Check if we're re-executing already-streamed code
         already_streamed = getattr(self, "_currently_streaming", False)
@@ -328,6 +341,22 @@ class BaseAgent(MessagingMixin, ABC, metaclass=BaseAgentMeta):
 
         return message
 
+    def _is_human_target(self, resolved_target: str) -> bool:
+        """Check whether a resolved 1:1 target is a human agent.
+
+        Args:
+            resolved_target: Resolved target identifier (agent ID or "human")
+
+        Returns:
+            True if the target is a human
+        """
+        if resolved_target in ["human", "user"]:
+            return True
+        from playbooks.agents.human_agent import HumanAgent
+
+        agents_by_id = getattr(self.program, "agents_by_id", None) or {}
+        return isinstance(agents_by_id.get(resolved_target), HumanAgent)
+
     async def _say_with_streaming(self, resolved_target: str, message: str) -> None:
         """Send message with streaming support (for human recipients).
 
@@ -4,12 +4,33 @@ This module provides standard playbooks that are automatically available
 to all agents, including messaging, artifact handling, and system operations.
 """
 
+import hashlib
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
 from playbooks.compilation.compiler import Compiler
 from playbooks.compilation.markdown_to_ast import markdown_to_ast
 
+logger = logging.getLogger(__name__)
+
+# Compiled form of BuiltinPlaybooks.get_llm_playbooks_markdown(), shipped with
+# the package. After changing the markdown, regenerate it with
+# `playbooks compile` and update its source marker (see llm_playbooks_source_key)
+BUILTIN_PLAYBOOKS_PBASM_PATH = os.path.join(
+    os.path.dirname(__file__), "builtin_playbooks.pbasm"
+)
+
 
 class BuiltinPlaybooks:
-    """Provides built-in playbooks that are automatically added to every agent."""
+    """Provides built-in playbooks that are automatically added to every agent.
+
+    The AST nodes are built once per process and shared by every agent
+    class, so they must not be modified.
+    """
+
+    _python_ast_nodes: Optional[List[Dict[str, Any]]] = None
+    _llm_ast_nodes: Optional[List[Dict[str, Any]]] = None
 
     @staticmethod
     async def get_ast_nodes():
@@ -23,11 +44,20 @@ class BuiltinPlaybooks:
 
     @staticmethod
     def get_python_playbooks_ast_nodes():
-        """Get AST nodes for built-in python playbooks.
+        """Get AST nodes for built-in python playbooks (parsed once per process).
 
         Returns:
             List of AST nodes representing built-in python playbooks.
         """
+        if BuiltinPlaybooks._python_ast_nodes is None:
+            BuiltinPlaybooks._python_ast_nodes = (
+                BuiltinPlaybooks._parse_python_playbooks()
+            )
+        return list(BuiltinPlaybooks._python_ast_nodes)
+
+    @staticmethod
+    def _parse_python_playbooks():
+        """Parse the built-in python playbooks code block."""
         code_block = '''
 ```python
 from playbooks.llm.messages.types import ArtifactLLMMessage
@@ -132,21 +162,65 @@ hidden: true
 """
 
     @staticmethod
-    async def get_llm_playbooks_ast_nodes():
+    def llm_playbooks_source_key() -> str:
+        """Key of the LLM playbooks markdown the shipped .pbasm was compiled from."""
         markdown = BuiltinPlaybooks.get_llm_playbooks_markdown()
-        compiler = Compiler()
-
-        # Compile the playbooks content
-        _, compiled_content, compiled_file_path = await compiler.compile(
-            content=markdown
-        )
-
-        # Parse the compiled content to extract steps
-        ast = markdown_to_ast(compiled_content, source_file_path=compiled_file_path)
-        h1 = list(filter(lambda node: node.get("type") == "h1", ast.get("children")))[0]
-        if not h1.get("type") == "h1":
-            raise Exception("Expected a single h1 child")
-
-        # filter h1 children for h2 nodes
-        h2s = list(filter(lambda node: node.get("type") == "h2", h1.get("children")))
-        return h2s
+        return hashlib.sha256(markdown.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def load_compiled_llm_playbooks() -> Optional[str]:
+        """Read the shipped compiled LLM playbooks.
+
+        Returns:
+            The compiled playbooks, or None if the file is missing or was
+            compiled from a different version of the markdown
+        """
+        try:
+            with open(BUILTIN_PLAYBOOKS_PBASM_PATH, "r", encoding="utf-8") as f:
+                compiled = f.read()
+        except OSError:
+            return None
+        marker = f"<!-- source: {BuiltinPlaybooks.llm_playbooks_source_key()} -->"
+        if marker not in compiled:
+            logger.warning(
+                f"{BUILTIN_PLAYBOOKS_PBASM_PATH} is out of date, compiling the "
+                "builtin playbooks instead"
+            )
+            return None
+        return compiled
+
+    @staticmethod
+    async def get_llm_playbooks_ast_nodes():
+        """Get AST nodes for built-in LLM playbooks (built once per process).
+
+        Uses the compiled playbooks shipped with the package, and compiles
+        the markdown only if they are out of date.
+
+        Returns:
+            List of H2 nodes representing built-in LLM playbooks.
+        """
+        if BuiltinPlaybooks._llm_ast_nodes is None:
+            compiled_content = BuiltinPlaybooks.load_compiled_llm_playbooks()
+            compiled_file_path = BUILTIN_PLAYBOOKS_PBASM_PATH
+            if compiled_content is None:
+                markdown = BuiltinPlaybooks.get_llm_playbooks_markdown()
+                compiler = Compiler()
+                _, compiled_content, compiled_file_path = await compiler.compile(
+                    content=markdown
+                )
+
+            # Parse the compiled content to extract steps
+            ast = markdown_to_ast(
+                compiled_content, source_file_path=str(compiled_file_path)
+            )
+            h1 = list(
+                filter(lambda node: node.get("type") == "h1", ast.get("children"))
+            )[0]
+            if not h1.get("type") == "h1":
+                raise Exception("Expected a single h1 child")
+
+            # filter h1 children for h2 nodes
+            BuiltinPlaybooks._llm_ast_nodes = list(
+                filter(lambda node: node.get("type") == "h2", h1.get("children"))
+            )
+        return list(BuiltinPlaybooks._llm_ast_nodes)
@@ -90,6 +90,15 @@ class HumanAgent(BaseAgent):
         # Humans don't execute playbooks, so don't need call stacks, variables, or session logs
         self.state = HumanState(event_bus, self.klass, self.id)
 
+    def assign_id(self, agent_id: str) -> None:
+        """Give a constructed but not yet registered agent its ID.
+
+        Args:
+            agent_id: Unique identifier for this agent instance
+        """
+        super().assign_id(agent_id)
+        self.state.agent_id = agent_id
+
     async def begin(self) -> None:
         """Begin execution for human agent (no-op).
 
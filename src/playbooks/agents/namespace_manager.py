@@ -7,13 +7,16 @@ agent execution, including playbook function registration and variable scoping.
 from typing import Any, Dict
 
 from playbooks.playbook_decorator import playbook_decorator
+from playbooks.utils.versioned_namespace import VersionedNamespace
+
+__all__ = ["AgentNamespaceManager", "VersionedNamespace"]
 
 
 class AgentNamespaceManager:
     """Manages Python namespace for agent execution environment."""
 
     def __init__(self, namespace: Dict[str, Any] = None):
-        self.namespace = namespace if namespace is not None else {}
+        self.namespace = VersionedNamespace(namespace or {})
 
     def prepare_execution_environment(self) -> Dict[str, Any]:
         """Prepare the execution environment for code blocks.
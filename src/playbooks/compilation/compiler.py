@@ -19,6 +19,7 @@ from playbooks.compilation.markdown_to_ast import (
     refresh_markdown_attributes,
 )
 from playbooks.config import config
+from playbooks.core.enums import LLMCallPriority
 from playbooks.core.events import CompilationEndedEvent, CompilationStartedEvent
 from playbooks.core.exceptions import CompilationError, ProgramLoadError
 from playbooks.infrastructure.event_bus import EventBus
@@ -430,6 +431,7 @@ class Compiler:
                 event_bus=None,  # Compilation happens before event bus is available
                 agent_id=None,
                 session_id=None,
+                priority=LLMCallPriority.BACKGROUND,
             )
         ):
             response_chunks.append(chunk)
@@ -0,0 +1,115 @@
+"""Binary cache of parsed programs.
+
+Loading a compiled program parses its markdown into an AST, then parses every
+LLM playbook (signature, triggers, steps, metadata) and compiles every python
+code block. The result of that work depends only on the compiled content, so
+it is stored in .pbasm_cache next to the compiled programs and later loaded
+with a single unpickling.
+
+Entries are keyed by the content, the source file path recorded in the AST,
+the playbooks version and the Python version (code objects are stored in
+marshal format). Entries are trusted like the .pbasm files next to them: the
+python code of a program is executed when it loads anyway.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.utils.version import get_playbooks_version
+
+logger = logging.getLogger(__name__)
+
+PROGRAM_CACHE_DIR = Path(".pbasm_cache")
+PROGRAM_CACHE_FORMAT = 1  # Bump when the cached AST or playbook classes change
+
+
+@functools.lru_cache(maxsize=1)
+def _version_salt() -> str:
+    return f"{PROGRAM_CACHE_FORMAT}:{get_playbooks_version()}:{sys.version}"
+
+
+def program_cache_key(markdown: str, source_file_path: Optional[str] = None) -> str:
+    """Hash identifying the parsed form of a compiled program."""
+    digest = hashlib.sha256()
+    for part in (_version_salt(), source_file_path or "", markdown):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def precompile_ast(ast: Dict[str, Any]) -> None:
+    """Attach the parsed playbooks of each agent to their AST nodes.
+
+    H2 nodes get a "playbook" (an LLMPlaybook) and python code blocks a
+    "compiled" entry (see PythonPlaybook.compile_code_block), which agent
+    class creation uses instead of parsing the nodes again. Nodes that fail
+    to parse are left alone, so the error surfaces when the agent is built.
+    """
+    # Imported here: playbooks.playbook imports the execution and agent modules
+    from playbooks.playbook.llm_playbook import LLMPlaybook
+    from playbooks.playbook.python_playbook import PythonPlaybook
+
+    for h1 in ast.get("children", []):
+        if h1.get("type") != "h1":
+            continue
+        for child in h1.get("children", []):
+            try:
+                if child.get("type") == "h2":
+                    child["playbook"] = LLMPlaybook.from_h2(child)
+                elif (
+                    child.get("type") == "code-block"
+                    and child.get("language") == "python"
+                ):
+                    child["compiled"] = PythonPlaybook.compile_code_block(child["text"])
+            except Exception:
+                pass
+
+
+def load_program_ast(
+    markdown: str,
+    source_file_path: Optional[str] = None,
+    cache_dir: Path = PROGRAM_CACHE_DIR,
+) -> Dict[str, Any]:
+    """AST of a compiled program with its playbooks precompiled.
+
+    Args:
+        markdown: Compiled program content
+        source_file_path: Source path recorded on the AST nodes
+        cache_dir: Directory of the cache entries
+
+    Returns:
+        The AST as returned by markdown_to_ast, with precompile_ast applied
+    """
+    cache_path = cache_dir / f"{program_cache_key(markdown, source_file_path)}.pbir"
+    try:
+        return pickle.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Stale or truncated entry, parse again and overwrite it
+        logger.debug(f"Ignoring unreadable program cache entry {cache_path}: {e}")
+
+    ast = markdown_to_ast(markdown, source_file_path=source_file_path)
+    precompile_ast(ast)
+    tmp_path = None
+    try:
+        data = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.debug(f"Could not write program cache entry {cache_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return ast
@@ -47,6 +47,7 @@ class ModelsConfig(BaseModel):
 
     execution: ModelConfig | None = None
     compilation: ModelConfig | None = None
+    summarization: ModelConfig | None = None  # summarizes compacted-away context
     default: ModelConfig | None = None  # fallback model from [model] section
 
     def model_post_init(self, _):
@@ -56,6 +57,8 @@ class ModelsConfig(BaseModel):
             self.execution = self.default
         if self.compilation is None:
             self.compilation = self.default
+        if self.summarization is None:
+            self.summarization = self.default
 
 
 class LLMCacheConfig(BaseModel):
@@ -64,6 +67,58 @@ class LLMCacheConfig(BaseModel):
     type: str = "disk"  # "disk" or "redis"
     enabled: bool = True
     path: str = ".llm_cache"  # for disk cache
+    memory_max_bytes: int = Field(64 * 1024 * 1024, ge=0)  # in-process LRU tier, 0=off
+    max_bytes: int | None = Field(None, gt=0)  # disk cache size limit (default 1 GB)
+    ttl_s: int | None = Field(None, gt=0)  # entry time-to-live, None=never expire
+    compression: str = "none"  # "none" or "zstd" for persisted responses
+    redis_max_connections: int = Field(16, gt=0)  # async Redis connection pool size
+
+
+class LLMCompactionConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # catch typos early
+
+    token_budget: int | None = Field(None, gt=0)  # est. input tokens, None=unbounded
+    models: dict[str, int] = Field(default_factory=dict)  # per-model token budgets
+    summarize: bool = False  # replace dropped history with a running summary
+    summary_span_messages: int = Field(
+        20, gt=0
+    )  # messages dropped and summarized together
+    summary_max_tokens: int = Field(400, gt=0)  # completion limit per summary
+
+
+class LLMRateLimitConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # catch typos early
+
+    rpm: int | None = Field(None, gt=0)  # requests per minute
+    tpm: int | None = Field(None, gt=0)  # input tokens per minute
+
+
+class LLMSchedulerConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # catch typos early
+
+    enabled: bool = True
+    max_concurrency: int | None = Field(None, gt=0)  # process-wide in-flight calls
+    models: dict[str, LLMRateLimitConfig] = Field(default_factory=dict)
+    providers: dict[str, LLMRateLimitConfig] = Field(default_factory=dict)
+
+
+class FakeLLMConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")  # catch typos early
+
+    # Synthetic mode (model "playbooks-fake/synthetic")
+    ttft_s: float = Field(0.3, ge=0)  # time to first token
+    tokens_per_s: float = Field(100.0, gt=0)
+    response: str | None = None  # fixed response text, default is filler
+    response_tokens: int = Field(200, gt=0)  # length of the filler response
+    error_rate: float = Field(0.0, ge=0, le=1)  # fraction of calls failing with 500
+    rate_limit_every_s: float | None = Field(None, gt=0)  # start a 429 burst this often
+    rate_limit_burst_s: float = Field(0.0, ge=0)  # length of each 429 burst
+    seed: int | None = None  # for reproducible error injection
+    # Replay mode (model "playbooks-fake/replay")
+    replay_path: str | None = None  # recording to play back
+    replay_speed: float = Field(1.0, gt=0)  # 2.0 replays twice as fast
+    # Recording of real get_completion traffic, for later replay
+    record_path: str | None = None
 
 
 class LangfuseConfig(BaseModel):
@@ -96,8 +151,19 @@ class PlaybooksConfig(BaseModel):
     timestamp_granularity: int = Field(
         0, ge=-3, le=6
     )  # Timestamp granularity: 0=seconds, 3=milliseconds, -1=10s, etc.
+    token_count_mode: str = "exact"  # "exact" (tiktoken) or "approximate" (chars/4)
+    await_mode: str = (
+        "top_level"  # "top_level" (coroutine on frame locals) or "wrapper"
+    )
+    startup_max_concurrency: int | None = Field(
+        None, gt=0
+    )  # Concurrent program startup steps (discovery, agent init), None=unbounded
+    program_cache: bool = True  # Keep parsed compiled programs in .pbasm_cache
     model: ModelsConfig = ModelsConfig()
     llm_cache: LLMCacheConfig = LLMCacheConfig()
+    llm_compaction: LLMCompactionConfig = LLMCompactionConfig()
+    llm_scheduler: LLMSchedulerConfig = LLMSchedulerConfig()
+    fake_llm: FakeLLMConfig = FakeLLMConfig()
     langfuse: LangfuseConfig = LangfuseConfig()
     litellm: LitellmConfig = LitellmConfig()
 
@@ -306,6 +372,9 @@ __all__ = [
     "ModelConfig",
     "ModelsConfig",
     "LLMCacheConfig",
+    "LLMRateLimitConfig",
+    "LLMSchedulerConfig",
+    "FakeLLMConfig",
     "LangfuseConfig",
     "config",
     "load_config",
@@ -5,7 +5,7 @@ LLM message roles and types, execution modes, and other categorical values
 used in the system.
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class AgentType(str, Enum):
@@ -49,6 +49,22 @@ class LLMMessageType(str, Enum):
     ARTIFACT = "artifact"
 
 
+class LLMCallPriority(IntEnum):
+    """Dispatch lanes for LLM calls; lower values are scheduled first."""
+
+    INTERACTIVE = 0  # Turns of agents conversing with a human
+    AGENT = 1  # Regular agent turns
+    BACKGROUND = 2  # Compilation and other offline work
+
+
+class LLMMessageStability(IntEnum):
+    """How long a message keeps its rendering; drives prompt-cache breakpoints."""
+
+    VOLATILE = 0  # Re-rendered or removed by the next LLM call
+    SESSION = 1  # Append-only history, stable while its frame is on the stack
+    STATIC = 2  # Identical for every LLM call of the agent
+
+
 class StartupMode(str, Enum):
     DEFAULT = "default"
     STANDBY = "standby"
@@ -52,6 +52,15 @@ class CompiledProgramEvent(Event):
     original_file_paths: List[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class ProgramStartupEvent(Event):
+    """Program initialization finished, with the timeline of its steps."""
+
+    duration: float = 0.0  # seconds, the length of the critical path
+    critical_path: List[str] = field(default_factory=list)
+    tasks: List[dict] = field(default_factory=list)  # name, depends_on, started_at, ...
+
+
 @dataclass(frozen=True)
 class ProgramTerminatedEvent(Event):
     """Program terminated."""
@@ -245,6 +254,21 @@ class LLMCallEndedEvent(Event):
     output: Any = None
     error: Optional[str] = None
     cache_hit: bool = False
+    coalesced: bool = False
+    cache_read_tokens: int = 0  # Input tokens served from the provider's prompt cache
+    cache_write_tokens: int = 0  # Input tokens written to the provider's prompt cache
+
+
+@dataclass(frozen=True)
+class LLMCacheStatsEvent(Event):
+    """LLM response cache counters after a lookup."""
+
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    memory_entries: int = 0
+    memory_bytes: int = 0
 
 
 @dataclass(frozen=True)
@@ -1,31 +1,65 @@
 """Incremental code buffer for streaming Python execution.
 
-This module provides a buffer that accumulates code chunks and identifies
-executable prefixes using an indentation-aware algorithm.
+This module provides a buffer that accumulates code chunks and splits them
+into complete top-level statements as they arrive, without re-parsing the
+buffered code.
 """
 
-import ast
 import re
-from typing import Optional
+from typing import List, Optional
 
+# Bracket, quote and comment characters that change the scanner state
+_SCAN = re.compile(r"'''|\"\"\"|['\"#()\[\]{}]")
 
-class CodeBuffer:
-    """Buffers incoming code chunks and finds executable prefixes.
+# Markdown code fence lines (```python, ```) that wrap LLM-generated code
+_FENCE = re.compile(r"^```[\w+-]*\s*$")
+
+_FIRST_WORD = re.compile(r"[A-Za-z_]\w*")
 
-    The buffer accumulates code as it arrives in chunks and uses an
-    indentation-aware algorithm to find the longest executable prefix:
+# Clauses that continue the preceding compound statement instead of starting one
+_CONTINUATION_KEYWORDS = frozenset({"else", "elif", "except", "finally"})
 
-    1. Split buffer into lines
-    2. Find the last line that doesn't start with whitespace
-    3. Try parsing from that line backwards until a valid prefix is found
+# Statements that may still be followed by a continuation clause even when
+# written on one line (e.g. "if x: y = 1" followed by "else: y = 2")
+_CLAUSE_OPENERS = frozenset(
+    {"if", "elif", "else", "for", "while", "try", "except", "finally", "async"}
+)
 
-    This approach correctly handles multiline constructs like loops and
-    functions that are only complete when a line with lower indentation arrives.
+
+class CodeBuffer:
+    """Buffers incoming code chunks and splits off complete statements.
+
+    Each line is scanned once as it is completed, tracking bracket depth,
+    open strings and line continuations. A top-level statement is complete
+    when its logical line ends, unless it opens an indented block; a block
+    is complete when the next top-level statement starts at column zero
+    (other than else/elif/except/finally, which continue it).
+
+    This keeps the work per chunk proportional to the chunk size, however
+    long the response or the block being streamed.
     """
 
     def __init__(self):
         """Initialize an empty code buffer."""
-        self._buffer = ""
+        # Complete statements, not yet consumed
+        self._ready: List[str] = []
+        # Lines of the statement still being received
+        self._pending: List[str] = []
+        # Blank and comment lines after the last statement line
+        self._trivia: List[str] = []
+        # Fragments of the last, unterminated line
+        self._partial: List[str] = []
+
+        # Scanner state at the end of the last complete line
+        self._depth = 0
+        self._string: Optional[str] = None
+        self._continued = False
+
+        # State of the top-level statement in self._pending
+        self._in_header = False
+        self._opens_block = False
+        self._after_decorator = False
+        self._last_char = ""
 
     def add_chunk(self, chunk: str):
         """Add a code chunk to the buffer.
@@ -33,86 +67,45 @@ class CodeBuffer:
         Args:
             chunk: Code chunk to add (may be partial line, full line, or multiple lines)
         """
-        self._buffer += chunk
+        if "\n" not in chunk:
+            if chunk:
+                self._partial.append(chunk)
+            return
 
-    def get_executable_prefix(self) -> Optional[str]:
-        """Find the longest executable prefix in the buffer.
+        lines = chunk.split("\n")
+        self._partial.append(lines[0])
+        lines[0] = "".join(self._partial)
+        self._partial = [lines[-1]] if lines[-1] else []
+        for line in lines[:-1]:
+            self._add_line(line)
 
-        Uses the indentation-aware algorithm from the specification:
-        1. Strip code block markers (```python, ```)
-        2. Only consider complete lines (up to last newline)
-        3. Split into lines (0 to N)
-        4. Walk from bottom to find last non-whitespace-starting line (M)
-        5. Try parsing lines[0:M], if not executable try [0:M-1], etc.
-        6. Return first prefix that parses successfully
+    def close(self):
+        """Mark the end of the input.
 
-        Returns:
-            The longest executable prefix (original code with $var), or None if
-            no complete statements are available yet.
+        A statement whose block is still open at the end of the input is
+        complete. A statement cut off mid-line (e.g. an unclosed bracket) is
+        left in the buffer.
         """
-        if not self._buffer.strip():
-            return None
-
-        # Only consider content up to the last newline
-        # Everything after the last newline is incomplete (could be mid-token)
-        last_newline_pos = self._buffer.rfind("\n")
-        if last_newline_pos == -1:
-            # No complete lines yet
-            return None
-
-        # Include the newline itself
-        buffer_up_to_last_newline = self._buffer[: last_newline_pos + 1]
-
-        # Strip code block markers
-        code_to_parse = self._strip_code_block_markers(buffer_up_to_last_newline)
+        if self._partial:
+            line = "".join(self._partial)
+            self._partial = []
+            self._add_line(line)
+        if self._pending and self._logical_line_ended():
+            self._complete_pending()
 
-        if not code_to_parse.strip():
-            return None
-
-        # Split into lines
-        lines = code_to_parse.split("\n")
+    def get_executable_prefix(self) -> Optional[str]:
+        """Return the complete statements received so far.
 
-        # Find the last non-whitespace-starting line (M)
-        M = self._find_last_non_whitespace_line(lines)
+        Code block markers and trailing comments are not included. Leading
+        comments are included with the statement that follows them.
 
-        if M is None:
-            # All lines start with whitespace (or are empty) - nothing executable
+        Returns:
+            The complete statements (original code with $var), or None if no
+            complete statement is available yet.
+        """
+        if not self._ready:
             return None
-
-        # Try parsing from M backwards to find executable prefix
-        # Special case: if M-1 has higher indentation than M, prefer M-1 (M closes a block)
-        # Otherwise, prefer M (flat sequence of statements)
-        should_prefer_m_minus_1 = False
-        if M > 0:
-            # Check if previous non-empty line has indentation
-            for i in range(M - 1, -1, -1):
-                if lines[i].strip():  # Found a non-empty line
-                    if lines[i][0] in (" ", "\t"):
-                        # Previous non-empty line is indented, M closes a block
-                        should_prefer_m_minus_1 = True
-                    break
-
-        for end_idx in range(M, -1, -1):
-            # Try M-1 first only if it closes an indented block
-            if end_idx == M and M > 0 and should_prefer_m_minus_1:
-                # First try without M (just up to M-1)
-                prefix_lines = lines[0:M]
-                prefix = "\n".join(prefix_lines)
-                if prefix.strip() and self._can_parse(prefix):
-                    return prefix.rstrip()
-
-            # Now try including this line
-            prefix_lines = lines[0 : end_idx + 1]
-            prefix = "\n".join(prefix_lines)
-
-            if not prefix.strip():
-                continue
-
-            if self._can_parse(prefix):
-                # Found executable prefix - return original with proper line ending
-                return prefix.rstrip()
-
-        return None
+        return "\n".join(self._ready).rstrip()
 
     def consume_prefix(self, prefix: str):
         """Remove an executed prefix from the buffer.
@@ -122,30 +115,7 @@ class CodeBuffer:
         """
         if not prefix:
             return
-
-        # Strip code block markers from buffer for comparison
-        stripped_buffer = self._strip_code_block_markers(self._buffer)
-
-        # Find where the prefix ends in the stripped buffer
-        prefix_stripped = prefix.rstrip()
-
-        if stripped_buffer.startswith(prefix_stripped):
-            # Remove the prefix and any trailing newlines that were part of it
-            remaining = stripped_buffer[len(prefix_stripped) :]
-
-            # If there's a newline immediately after, consume it too
-            if remaining.startswith("\n"):
-                remaining = remaining[1:]
-
-            self._buffer = remaining
-        else:
-            # Fallback: try to find and remove the prefix
-            # This handles cases where code block markers might be involved
-            if prefix_stripped in self._buffer:
-                idx = self._buffer.index(prefix_stripped)
-                self._buffer = self._buffer[idx + len(prefix_stripped) :]
-                if self._buffer.startswith("\n"):
-                    self._buffer = self._buffer[1:]
+        del self._ready[: prefix.count("\n") + 1]
 
     def get_buffer(self) -> str:
         """Get the current buffer contents.
@@ -153,79 +123,107 @@ class CodeBuffer:
         Returns:
             The full buffer including any unexecuted code
         """
-        return self._buffer
-
-    def _strip_code_block_markers(self, code: str) -> str:
-        """Strip markdown code block markers from code.
-
-        Removes markers like ```python or ``` from the beginning and end.
-
-        Args:
-            code: Code potentially wrapped in markdown code block markers
-
-        Returns:
-            Code with markers removed
-        """
-        code = code.strip()
-
-        # Remove opening marker: ``` or ```python or ```python3, etc.
-        code = re.sub(r"^```(?:[a-z0-9_-]*)\n?", "", code)
-
-        # Remove closing marker: ```
-        code = re.sub(r"\n?```$", "", code)
-
-        return code
-
-    def _find_last_non_whitespace_line(self, lines: list) -> Optional[int]:
-        """Find the index of the last line that doesn't start with whitespace.
-
-        This is used to identify where a block might be complete. When an indented
-        block is followed by a line with lower indentation, that indicates the
-        block is complete.
-
-        Args:
-            lines: List of code lines
-
-        Returns:
-            Index of the last non-whitespace-starting line, or None if all lines
-            start with whitespace (or are empty)
-        """
-        for i in range(len(lines) - 1, -1, -1):
-            line = lines[i]
-            # Skip empty lines
-            if not line.strip():
-                continue
-            # Check if line starts with whitespace
-            if line and line[0] not in (" ", "\t"):
-                return i
-
-        return None
-
-    def _can_parse(self, code: str) -> bool:
-        """Check if code can be parsed as valid Python and contains actual statements.
-
-        Uses preprocess_program to handle $variable syntax before parsing.
-        Only returns True if the code contains at least one executable statement
-        (not just comments or empty lines).
-
-        Args:
-            code: Code to check
-
-        Returns:
-            True if code parses successfully and has statements, False otherwise
-        """
-        try:
-            # Import here to avoid circular dependency
-            from playbooks.compilation.expression_engine import preprocess_program
-
-            # Preprocess to handle $variable syntax
-            preprocessed = preprocess_program(code)
-
-            # Try to parse
-            parsed = ast.parse(preprocessed)
-
-            # Only return True if there's at least one actual statement
-            # (not just comments which result in an empty body)
-            return len(parsed.body) > 0
-        except SyntaxError:
-            return False
+        lines = self._ready + self._pending + self._trivia
+        buffer = "\n".join(lines) + "\n" if lines else ""
+        return buffer + "".join(self._partial)
+
+    def _add_line(self, line: str) -> None:
+        """Scan one complete line and update the statement boundaries."""
+        if self._logical_line_ended():
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                self._trivia.append(line)
+                return
+            if _FENCE.match(stripped):
+                return
+            if line[0] not in " \t":
+                self._start_statement(stripped)
+            self._pending.extend(self._trivia)
+            self._trivia = []
+
+        self._pending.append(line)
+        self._scan(line)
+
+        if self._in_header and self._logical_line_ended():
+            self._in_header = False
+            if not (self._opens_block or self._last_char == ":"):
+                self._complete_pending()
+
+    def _start_statement(self, stripped: str) -> None:
+        """Handle a logical line starting at column zero."""
+        match = _FIRST_WORD.match(stripped)
+        word = match.group() if match else ""
+        if (
+            self._pending
+            and not self._after_decorator
+            and word not in _CONTINUATION_KEYWORDS
+        ):
+            self._complete_pending()
+        self._in_header = True
+        self._after_decorator = stripped.startswith("@")
+        self._opens_block = self._after_decorator or word in _CLAUSE_OPENERS
+
+    def _complete_pending(self) -> None:
+        self._ready.extend(self._pending)
+        self._pending = []
+        self._opens_block = False
+        self._after_decorator = False
+
+    def _logical_line_ended(self) -> bool:
+        return not (self._depth or self._string or self._continued)
+
+    def _scan(self, line: str) -> None:
+        """Update bracket depth, string and continuation state for one line."""
+        pos = 0
+        if self._string:
+            pos = self._string_end(line, 0, self._string)
+            if pos < 0:
+                # Single-quoted strings only continue across escaped newlines
+                if len(self._string) == 1 and not line.endswith("\\"):
+                    self._string = None
+                return
+            self._string = None
+            self._last_char = line[pos - 1]
+
+        self._continued = False
+        length = len(line)
+        while True:
+            match = _SCAN.search(line, pos)
+            end = match.start() if match else length
+            segment = line[pos:end].rstrip()
+            if segment:
+                self._last_char = segment[-1]
+            if not match:
+                break
+            token = match.group()
+            pos = match.end()
+            if token == "#":
+                return
+            if token in "([{":
+                self._depth += 1
+            elif token in ")]}":
+                self._depth = max(0, self._depth - 1)
+            else:
+                pos = self._string_end(line, pos, token)
+                if pos < 0:
+                    if len(token) == 3 or line.endswith("\\"):
+                        self._string = token
+                    return
+            self._last_char = line[pos - 1]
+
+        self._continued = line.endswith("\\")
+
+    @staticmethod
+    def _string_end(line: str, pos: int, quote: str) -> int:
+        """Return the index just past the closing quote, or -1 if not on this line."""
+        start = pos
+        while True:
+            index = line.find(quote, pos)
+            if index < 0:
+                return -1
+            escapes = index
+            while escapes > start and line[escapes - 1] == "\\":
+                escapes -= 1
+            if (index - escapes) % 2 == 0:
+                return index + len(quote)
+            pos = index + 1
@@ -5,17 +5,24 @@ interpretation, including context management, agent information, and
 execution state formatting.
 """
 
+import bisect
+import itertools
 import json
 import types
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from playbooks.core.enums import LLMMessageStability
+from playbooks.execution.prompt_sections import PromptSectionCache
 from playbooks.llm.llm_context_compactor import LLMContextCompactor
 from playbooks.llm.messages import (
     AgentInfoLLMMessage,
+    LLMMessage,
     OtherAgentInfoLLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.llm.prompt_cache import apply_cache_breakpoints, plan_cache_breakpoints
 from playbooks.playbook import Playbook
+from playbooks.utils.versioned_namespace import VersionedNamespace
 
 if TYPE_CHECKING:
     from playbooks.agents import AIAgent
@@ -49,6 +56,45 @@ class SetEncoder(json.JSONEncoder):
             return f"<{type(obj).__name__}: {str(obj)[:50]}>"
 
 
+def _namespace_imports(namespace: Dict[str, Any]) -> List[str]:
+    """Render the modules in an agent namespace as sorted import statements."""
+    imports = []
+
+    # Always include Box as it's used for meeting shared state
+    imports.append("from box import Box")
+
+    # Always include asyncio as it's available in the execution namespace
+    imports.append("import asyncio")
+
+    for name, value in namespace.items():
+        if isinstance(value, types.ModuleType) and not name.startswith("_"):
+            # Skip asyncio since we already added it
+            if name == "asyncio":
+                continue
+            # Get the actual module name
+            module_name = getattr(value, "__name__", name)
+            if module_name != name:
+                # Was imported with alias
+                imports.append(f"import {module_name} as {name}")
+            else:
+                imports.append(f"import {name}")
+    return sorted(imports)
+
+
+def _render_json_member(name: Any, value: Any) -> str:
+    """Render one member of an object as json.dumps(..., indent=2) would."""
+    rendered = json.dumps({name: value}, indent=2, cls=SetEncoder, ensure_ascii=False)
+    # Strip the enclosing "{\n" and "\n}"
+    return rendered[2:-2]
+
+
+def _render_json_object(members: List[str]) -> str:
+    """Join members rendered by _render_json_member into an indented object."""
+    if not members:
+        return "{}"
+    return "{\n" + ",\n".join(members) + "\n}"
+
+
 class InterpreterPrompt:
     """Generates the prompt for the interpreter LLM based on the current state."""
 
@@ -87,7 +133,20 @@ class InterpreterPrompt:
         self.agent_information = agent_information
         self.other_agent_klasses_information = other_agent_klasses_information
         self.execution_id = execution_id  # NEW: Store execution_id
-        self.compactor = LLMContextCompactor()
+        compactor = getattr(agent, "context_compactor", None)
+        self.compactor = (
+            compactor
+            if isinstance(compactor, LLMContextCompactor)
+            else LLMContextCompactor()
+        )
+        # Renderings kept by the agent between calls; a throwaway cache for
+        # agents without one renders everything
+        sections = getattr(agent, "prompt_sections", None)
+        self.sections = (
+            sections
+            if isinstance(sections, PromptSectionCache)
+            else PromptSectionCache()
+        )
         self._user_message: Optional[UserInputLLMMessage] = None
 
     def create_user_message(self) -> None:
@@ -235,9 +294,12 @@ class InterpreterPrompt:
                 lines.append("")
 
                 # Show shared_state as Box with full content
-                shared_state_dict = dict(meeting_obj.shared_state.items())
-                shared_state_json = json.dumps(
-                    shared_state_dict, indent=2, cls=SetEncoder, ensure_ascii=False
+                shared_state_json = _render_json_object(
+                    self.sections.render_entries(
+                        f"shared_state:{active_meeting_id}",
+                        meeting_obj.shared_state.items(),
+                        _render_json_member,
+                    )
                 )
                 lines.append(
                     f"self.current_meeting.shared_state: Box = Box({shared_state_json})"
@@ -248,13 +310,16 @@ class InterpreterPrompt:
             lines.append("")
 
         # self.state as Box
-        state_dict = {}
-        for name, value in self.agent.state.items():
-            if name not in ["_busy"]:
-                state_dict[name] = value
-
-        state_json = json.dumps(
-            state_dict, indent=2, cls=SetEncoder, ensure_ascii=False
+        state_json = _render_json_object(
+            self.sections.render_entries(
+                "state",
+                (
+                    (name, value)
+                    for name, value in self.agent.state.items()
+                    if name not in ["_busy"]
+                ),
+                _render_json_member,
+            )
         )
         lines.append(f"self.state: Box = Box({state_json})")
         lines.append("")
@@ -276,8 +341,15 @@ class InterpreterPrompt:
         current_frame = self.agent.call_stack.peek()
         if current_frame and current_frame.locals:
             lines.append("# Local variables")
-            for name, value in sorted(current_frame.locals.items()):
-                lines.append(self._format_variable(name, value, include_type=True))
+            lines.extend(
+                self.sections.render_entries(
+                    "locals",
+                    sorted(current_frame.locals.items()),
+                    lambda name, value: self._format_variable(
+                        name, value, include_type=True
+                    ),
+                )
+            )
             lines.append("")  # blank line after locals
 
         lines.append("```")
@@ -331,8 +403,10 @@ class InterpreterPrompt:
             return f"{r[:preview_len]}...{r[-preview_len:]} (length: {len(value)})"
 
         if isinstance(value, (list, tuple)):
-            full_repr = repr(value)
-            if len(full_repr) <= max_length:
+            # Every item takes at least 3 characters ("x, "), so long
+            # sequences are compacted without building their full repr
+            full_repr = repr(value) if len(value) * 3 <= max_length else ""
+            if full_repr and len(full_repr) <= max_length:
                 return full_repr
 
             # Compact long lists/tuples - show shape and sample
@@ -344,15 +418,16 @@ class InterpreterPrompt:
             # Show first and last few items
             sample_size = 2
             if length <= sample_size * 2:
-                return full_repr
+                return full_repr or repr(value)
 
             first_items = repr(value[:sample_size])[1:-1]  # Remove brackets
             last_items = repr(value[-sample_size:])[1:-1]
             return f"[{first_items}, ..., {last_items}] (length: {length})"
 
         if isinstance(value, dict):
-            full_repr = repr(value)
-            if len(full_repr) <= max_length:
+            # Every item takes at least 6 characters ("k: v, ")
+            full_repr = repr(value) if len(value) * 6 <= max_length else ""
+            if full_repr and len(full_repr) <= max_length:
                 return full_repr
 
             # Compact long dicts - show count and sample keys
@@ -361,11 +436,10 @@ class InterpreterPrompt:
                 return "{}"
 
             sample_size = 2
-            items = list(value.items())
             if length <= sample_size * 2:
-                return full_repr
+                return full_repr or repr(value)
 
-            sample_items = dict(items[:sample_size])
+            sample_items = dict(itertools.islice(value.items(), sample_size))
             return f"{{{repr(sample_items)[1:-1]}, ...}} ({length} keys)"
 
         # For non-literals, use type placeholder
@@ -447,30 +521,13 @@ class InterpreterPrompt:
 
     def _extract_imports(self) -> List[str]:
         """Extract import statements from agent namespace."""
-        imports = []
-
-        # Always include Box as it's used for meeting shared state
-        imports.append("from box import Box")
-
-        # Always include asyncio as it's available in the execution namespace
-        imports.append("import asyncio")
-
-        if hasattr(self.agent, "namespace_manager") and hasattr(
-            self.agent.namespace_manager, "namespace"
-        ):
-            for name, value in self.agent.namespace_manager.namespace.items():
-                if isinstance(value, types.ModuleType) and not name.startswith("_"):
-                    # Skip asyncio since we already added it
-                    if name == "asyncio":
-                        continue
-                    # Get the actual module name
-                    module_name = getattr(value, "__name__", name)
-                    if module_name != name:
-                        # Was imported with alias
-                        imports.append(f"import {module_name} as {name}")
-                    else:
-                        imports.append(f"import {name}")
-        return sorted(imports)
+        agent_namespace = getattr(
+            getattr(self.agent, "namespace_manager", None), "namespace", None
+        )
+        if isinstance(agent_namespace, VersionedNamespace):
+            # Rescanned only when the agent namespace changes
+            return list(agent_namespace.derived("imports", _namespace_imports))
+        return _namespace_imports(agent_namespace or {})
 
     @property
     def messages(self) -> List[Dict[str, str]]:
@@ -481,4 +538,76 @@ class InterpreterPrompt:
         # Apply compaction
         compacted_messages = self.compactor.compact_messages(llm_message_objects)
 
+        # Mark the longest prefixes the next call will resend for provider caching
+        sources = self._compacted_sources(llm_message_objects, compacted_messages)
+        if sources is not None:
+            stability = self._message_stability(llm_message_objects)
+            breakpoints = plan_cache_breakpoints(
+                compacted_messages,
+                [
+                    (
+                        stability[source]
+                        if source < len(stability)
+                        else LLMMessageStability.VOLATILE
+                    )
+                    for source in sources
+                ],
+                [
+                    bisect.bisect_left(sources, end)
+                    for end in self.call_stack.get_llm_message_segment_ends()
+                ],
+            )
+            apply_cache_breakpoints(compacted_messages, breakpoints)
+
         return compacted_messages
+
+    def _compacted_sources(
+        self,
+        llm_message_objects: List[LLMMessage],
+        compacted_messages: List[Dict[str, Any]],
+    ) -> Optional[List[int]]:
+        """Index of the call stack message behind each compacted message.
+
+        The summary standing in for dropped history counts as part of the
+        message that follows it. Returns None when the compactor cannot tell
+        and messages were dropped, in which case no breakpoints are planned.
+        """
+        get_output_sources = getattr(self.compactor, "get_output_sources", None)
+        if get_output_sources is not None:
+            sources = get_output_sources()
+        elif len(compacted_messages) == len(llm_message_objects):
+            return list(range(len(llm_message_objects)))
+        else:
+            return None
+
+        following = len(llm_message_objects)
+        resolved = []
+        for source in reversed(sources):
+            if source is not None:
+                following = source
+            resolved.append(following)
+        resolved.reverse()
+        return resolved
+
+    def _message_stability(
+        self, llm_message_objects: List[LLMMessage]
+    ) -> List[LLMMessageStability]:
+        """Classify each message by how long its rendering stays unchanged."""
+        # Compactors that cannot predict their next rendering only get the
+        # static prefix cached
+        get_stable_prefix_length = getattr(
+            self.compactor, "get_stable_prefix_length", None
+        )
+        stable_prefix = (
+            get_stable_prefix_length(llm_message_objects)
+            if get_stable_prefix_length is not None
+            else 0
+        )
+        return [
+            (
+                msg.stability
+                if i < stable_prefix or msg.stability == LLMMessageStability.STATIC
+                else LLMMessageStability.VOLATILE
+            )
+            for i, msg in enumerate(llm_message_objects)
+        ]
@@ -12,12 +12,14 @@ from playbooks.compilation.expression_engine import (
 from playbooks.config import config
 from playbooks.core.argument_types import LiteralValue, VariableReference
 from playbooks.core.constants import EXECUTION_FINISHED
+from playbooks.core.enums import LLMCallPriority
 from playbooks.core.events import PlaybookEndEvent, PlaybookStartEvent
 from playbooks.core.exceptions import ExecutionFinished, InteractiveInputRequired
 from playbooks.debug.debug_handler import DebugHandler, NoOpDebugHandler
 from playbooks.execution.call import PlaybookCall
 from playbooks.execution.interpreter_prompt import InterpreterPrompt
 from playbooks.execution.llm_response import LLMResponse, _strip_code_block_markers
+from playbooks.execution.response_scanner import ResponseScanner
 from playbooks.execution.streaming_python_executor import (
     StreamingExecutionError,
     StreamingPythonExecutor,
@@ -277,6 +279,17 @@ class PlaybookLLMExecution(LLMExecution):
 
         return return_value
 
+    def _llm_call_priority(self) -> LLMCallPriority:
+        """Schedule turns of agents conversing with a human ahead of other calls.
+
+        Returns:
+            INTERACTIVE if the agent's conversation includes a human, else AGENT
+        """
+        is_conversing_with_human = getattr(self.agent, "is_conversing_with_human", None)
+        if callable(is_conversing_with_human) and is_conversing_with_human():
+            return LLMCallPriority.INTERACTIVE
+        return LLMCallPriority.AGENT
+
     async def make_llm_call(
         self,
         instruction: str,
@@ -381,24 +394,24 @@ class PlaybookLLMExecution(LLMExecution):
         )
         self.streaming_execution_result = None  # Will be set after execution
 
-        buffer = ""
-        in_say_call = False
-        current_say_content = ""
-        say_start_pos = 0
-        say_recipient = ""
+        enable_agent_streaming = (
+            self.agent.program.enable_agent_streaming if self.agent.program else False
+        )
+        scanner = ResponseScanner(
+            accept=lambda recipient: enable_agent_streaming
+            or recipient.lower() in ["user", "human"]
+        )
         say_stream_id = None  # Track stream ID for channel-based streaming
-        processed_up_to = 0  # Track how much of buffer we've already processed
-        say_has_placeholders = False  # Track if current Say has {$var} placeholders
-        say_end_pattern = '")'  # Tracks closing pattern for Say content
-        say_quote_type: Optional[str] = None  # "single" or "triple"
-        indented_code_detected = False  # Track if indented code has been detected
+        say_streamed_length = 0  # Length of Say content streamed so far
 
         # Get LLM messages
         messages = prompt.messages
 
         # Create an placeholder AssistantResponseLLMMessage so that it
-        # appears before any messages from the execution results
+        # appears before any messages from the execution results. Its content
+        # follows the scanner's chunks, joined only when the message is read.
         self.llm_response_msg = AssistantResponseLLMMessage("Thinking...")
+        self.llm_response_msg.stream_content(scanner.chunks)
         self.agent.call_stack.add_llm_message(self.llm_response_msg)
 
         # Create LLM config for the call
@@ -425,21 +438,11 @@ class PlaybookLLMExecution(LLMExecution):
                     agent_id=self.agent.id,
                     session_id=self.agent.program.event_bus.session_id,
                     response_validator=_validate_interpreter_response,
+                    priority=self._llm_call_priority(),
                 )
             ):
-                buffer += chunk
-
-                # Check if buffer contains any indented line (line starting with whitespace)
-                if not indented_code_detected and "\n" in buffer:
-                    # Look through all complete lines for indentation
-                    lines = buffer.split("\n")
-                    for line in lines[:-1]:  # Exclude last line (might be incomplete)
-                        if line and line[0] in (" ", "\t"):
-                            indented_code_detected = True
-                            break
-
-                # Update the AssistantResponseLLMMessage with the actual response
-                self.llm_response_msg.set_content(buffer)
+                # Scan only the new text for indentation and Say() calls
+                say_events = scanner.add_chunk(chunk)
 
                 # Feed chunk to streaming executor for incremental execution
                 try:
@@ -462,105 +465,39 @@ class PlaybookLLMExecution(LLMExecution):
                     # The error details are already captured in streaming_executor.result
                     logger.error(f"Streaming execution error: {e}")
                     self.streaming_execution_result = streaming_executor.result
-                    return buffer
+                    return scanner.text
 
                 # Pattern-based Say() streaming provides real-time feedback as tokens arrive.
                 # The _currently_streaming flag prevents duplicates when code later executes.
                 # StreamingPythonExecutor will skip streaming for already-streamed Say() calls.
-                if not in_say_call:
-                    # Updated pattern: no backticks (Python code format)
-                    say_pattern = 'Say("'
-                    say_match_pos = buffer.find(say_pattern, processed_up_to)
-                    if say_match_pos != -1:
-                        # Found potential Say call - now we need to extract the recipient
-                        recipient_start = say_match_pos + len(say_pattern)
-
-                        # Look for the end of the recipient (first argument)
-                        recipient_end_pattern = '", "'
-                        recipient_end_pos = buffer.find(
-                            recipient_end_pattern, recipient_start
+                for event in say_events:
+                    if event.kind == "start":
+                        # Use channel-based streaming infrastructure
+                        stream_result = (
+                            await self.agent.start_streaming_say_via_channel(
+                                event.recipient
+                            )
                         )
-
-                        if recipient_end_pos != -1:
-                            # Extract the recipient
-                            say_recipient = buffer[recipient_start:recipient_end_pos]
-
-                            # Determine if we should stream this Say() call
-                            is_human_recipient = say_recipient.lower() in [
-                                "user",
-                                "human",
-                            ]
-                            enable_agent_streaming = (
-                                self.agent.program.enable_agent_streaming
-                                if self.agent.program
-                                else False
+                        say_stream_id = (
+                            stream_result.stream_id
+                            if stream_result.should_stream
+                            else None
+                        )
+                        say_streamed_length = 0
+                        # Set flag indicating we're actively streaming Say() calls
+                        # This prevents double-processing when the generated code executes
+                        # Only set if streaming is actually happening
+                        if say_stream_id:
+                            self.agent._currently_streaming = True
+                    elif event.kind == "delta":
+                        if say_stream_id:
+                            say_streamed_length += len(event.text)
+                            await self.agent.stream_say_update_via_channel(
+                                say_stream_id, event.recipient, event.text
                             )
-                            should_attempt_streaming = (
-                                is_human_recipient or enable_agent_streaming
-                            ) and not indented_code_detected
-
-                            if should_attempt_streaming:
-                                in_say_call = True
-                                say_start_pos = recipient_end_pos + len(
-                                    recipient_end_pattern
-                                )  # Position after recipient and ", "
-                                say_end_pattern = '")'  # Default; may switch to triple
-                                say_quote_type = None  # Determine once content arrives
-                                current_say_content = ""
-                                say_has_placeholders = False  # Reset for new Say call
-                                processed_up_to = say_start_pos
-                                # Use channel-based streaming infrastructure
-                                stream_result = (
-                                    await self.agent.start_streaming_say_via_channel(
-                                        say_recipient
-                                    )
-                                )
-                                say_stream_id = (
-                                    stream_result.stream_id
-                                    if stream_result.should_stream
-                                    else None
-                                )
-                                # Set flag indicating we're actively streaming Say() calls
-                                # This prevents double-processing when the generated code executes
-                                # Only set if streaming is actually happening
-                                if say_stream_id:
-                                    self.agent._currently_streaming = True
-                            else:
-                                # Not streaming this Say call
-                                processed_up_to = recipient_end_pos + len(
-                                    recipient_end_pattern
-                                )
-                        else:
-                            # Haven't found the end of recipient yet, continue processing
-                            pass
-
-                # Stream Say content if we're in a call
-                if in_say_call:
-                    # Determine quote style lazily to support triple-quoted strings
-                    if say_quote_type is None:
-                        # Need at least three characters to confirm triple quotes
-                        if len(buffer) >= say_start_pos + 3 and buffer.startswith(
-                            '""', say_start_pos
-                        ):
-                            say_quote_type = "triple"
-                            say_end_pattern = '""")'
-                            say_start_pos += 2  # Skip the extra two quotes
-                            processed_up_to = say_start_pos
-                        elif len(buffer) >= say_start_pos + 3:
-                            say_quote_type = "single"
-                            say_end_pattern = '")'
-                        else:
-                            # Not enough content yet to decide quote style
-                            continue
-
-                    # Look for the end of the Say call
-                    # Updated pattern: no backticks (Python code format)
-                    end_pos = buffer.find(say_end_pattern, say_start_pos)
-                    if end_pos != -1:
-                        # Found end - extract final content and complete
-                        final_content = buffer[say_start_pos:end_pos]
-
+                    else:
                         # Resolve any {$var} placeholders in the message before streaming
+                        final_content = event.text
                         if "{" in final_content:
                             final_content = await self._resolve_string_placeholders(
                                 final_content
@@ -569,85 +506,24 @@ class PlaybookLLMExecution(LLMExecution):
                         # If we deferred streaming due to placeholders, stream entire resolved content
                         # Otherwise, only stream the delta
                         if say_stream_id:
-                            if say_has_placeholders:
-                                # Stream entire resolved content
-                                if final_content:
-                                    await self.agent.stream_say_update_via_channel(
-                                        say_stream_id, say_recipient, final_content
-                                    )
+                            if event.has_placeholders:
+                                new_content = final_content
                             else:
-                                # Stream only new content since last update
-                                if len(final_content) > len(current_say_content):
-                                    new_content = final_content[
-                                        len(current_say_content) :
-                                    ]
-                                    if new_content:
-                                        await self.agent.stream_say_update_via_channel(
-                                            say_stream_id, say_recipient, new_content
-                                        )
+                                new_content = final_content[say_streamed_length:]
+                            if new_content:
+                                await self.agent.stream_say_update_via_channel(
+                                    say_stream_id, event.recipient, new_content
+                                )
 
                             await self.agent.complete_streaming_say_via_channel(
-                                say_stream_id, say_recipient, final_content
+                                say_stream_id, event.recipient, final_content
                             )
-                        in_say_call = False
-                        current_say_content = ""
-                        say_recipient = ""
                         say_stream_id = None
-                        say_has_placeholders = False
-                        processed_up_to = end_pos + len(say_end_pattern)
-                        say_quote_type = None
-                        say_end_pattern = '")'
-                    else:
-                        # Still streaming - extract new content since last update
-                        # Only look at content between say_start_pos and end of buffer
-                        # but make sure we don't include the closing quote if it's there
-                        available_content = buffer[say_start_pos:]
-
-                        # Check if content has placeholders - if so, defer streaming until complete
-                        if "{" in available_content and not say_has_placeholders:
-                            say_has_placeholders = True
-
-                        # If we see the closing quote, don't include it in streaming
-                        if available_content.endswith('")'):
-                            available_content = available_content[:-2]  # Remove ")
-                        elif available_content.endswith('"'):
-                            available_content = available_content[:-1]  # Remove just "
-
-                        # Don't stream incrementally if there are placeholders to resolve
-                        # Wait until message is complete to resolve and stream
-                        if not say_has_placeholders and say_stream_id:
-                            # Don't stream if it ends with escape character (incomplete)
-                            if not available_content.endswith("\\"):
-                                # Trim trailing quotes that are part of triple-quoted closing
-                                if available_content.endswith(say_end_pattern):
-                                    available_content = available_content[
-                                        : -len(say_end_pattern)
-                                    ]
-                                elif say_quote_type == "triple":
-                                    if available_content.endswith('"""'):
-                                        available_content = available_content[:-3]
-                                    elif available_content.endswith('""'):
-                                        available_content = available_content[:-2]
-                                    elif available_content.endswith('"'):
-                                        available_content = available_content[:-1]
-                                else:
-                                    if available_content.endswith('"'):
-                                        available_content = available_content[:-1]
-                                if len(available_content) > len(current_say_content):
-                                    new_content = available_content[
-                                        len(current_say_content) :
-                                    ]
-                                    current_say_content = available_content
-
-                                    if new_content:
-                                        await self.agent.stream_say_update_via_channel(
-                                            say_stream_id, say_recipient, new_content
-                                        )
 
             # If we ended while still in a Say call, complete it
-            if in_say_call and say_stream_id:
+            if scanner.in_say_call and say_stream_id:
                 await self.agent.complete_streaming_say_via_channel(
-                    say_stream_id, say_recipient, current_say_content
+                    say_stream_id, scanner.recipient, scanner.sent_message
                 )
 
             # Finalize streaming execution - execute any remaining buffered code
@@ -655,7 +531,7 @@ class PlaybookLLMExecution(LLMExecution):
 
             # Update generation with output and close context
             if generation:
-                generation.update(output=buffer)
+                generation.update(output=scanner.text)
                 generation.end()
 
         except ExecutionFinished as e:
@@ -675,13 +551,13 @@ class PlaybookLLMExecution(LLMExecution):
             # Update generation with error and close context
             try:
                 if generation:
-                    generation.update(output=buffer, status_message=str(e))
+                    generation.update(output=scanner.text, status_message=str(e))
                     generation.end()
             except Exception:
                 pass
             raise
 
-        return buffer
+        return scanner.text
 
     async def _resolve_string_placeholders(self, message: str) -> str:
         """Resolve {$var} placeholders in a message string during streaming.
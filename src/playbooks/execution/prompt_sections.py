@@ -0,0 +1,69 @@
+"""Reusable renderings of interpreter prompt context.
+
+The Python code context sent with every LLM call shows the agent's state,
+the current meeting's shared state and the current frame's locals. Between
+two calls most of these values are unchanged, so their renderings are kept
+and reused instead of being serialized again.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Values that cannot change in place; the same object always renders the same
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+class PromptSectionCache:
+    """Renderings of prompt sections reused across an agent's LLM calls.
+
+    A section is rendered entry by entry (one variable, one state key). Each
+    section remembers the value and text of the entries it rendered last
+    time; an entry whose value is the same immutable object reuses its text,
+    so the cost of a call tracks what changed since the previous call rather
+    than the total size of the state. Mutable containers are always rendered
+    again because they can change in place without their owner noticing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._sections: Dict[str, Dict[Any, Tuple[Any, str]]] = {}
+
+    def render_entries(
+        self,
+        section: str,
+        entries: Iterable[Tuple[Any, Any]],
+        render: Callable[[Any, Any], str],
+    ) -> List[str]:
+        """Render the entries of a section, reusing unchanged renderings.
+
+        Only the entries rendered by this call are remembered, so entries
+        that disappear from the source are dropped from the cache.
+
+        Args:
+            section: Name of the section, e.g. "state" or "locals"
+            entries: (key, value) pairs in display order
+            render: Renders one entry from its key and value
+
+        Returns:
+            Rendered text of each entry, in the order given
+        """
+        previous = self._sections.get(section, {})
+        current: Dict[Any, Tuple[Any, str]] = {}
+        rendered = []
+        for key, value in entries:
+            cached = previous.get(key)
+            if (
+                cached is not None
+                and cached[0] is value
+                and isinstance(value, _IMMUTABLE_TYPES)
+            ):
+                text = cached[1]
+            else:
+                text = render(key, value)
+            current[key] = (value, text)
+            rendered.append(text)
+        self._sections[section] = current
+        return rendered
+
+    def clear(self) -> None:
+        """Forget all renderings."""
+        self._sections.clear()
@@ -6,9 +6,11 @@ instances, with 'self' naturally referring to the agent.
 
 import ast
 import asyncio
+import builtins
 import logging
 import traceback
 import types
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from box import Box
@@ -20,6 +22,7 @@ from playbooks.execution.call import PlaybookCall
 from playbooks.execution.step import PlaybookStep
 from playbooks.state.call_stack import InstructionPointer
 from playbooks.state.variables import Artifact
+from playbooks.utils.versioned_namespace import VersionedNamespace
 
 if TYPE_CHECKING:
     from playbooks.agents import LocalAIAgent
@@ -28,6 +31,62 @@ logger = logging.getLogger(__name__)
 
 # Constants for namespace building
 EXCLUDED_NAMESPACE_KEYS = ["agent", "self"]
+BLOCKED_BUILTINS = frozenset(
+    {
+        "eval",
+        "exec",
+        "compile",
+        "__import__",
+        "open",
+        "input",
+        "breakpoint",
+        "exit",
+        "quit",
+        "help",
+        "license",
+        "copyright",
+        "credits",
+    }
+)
+
+# Builtins with dangerous ones removed, plus asyncio for await syntax and Box
+# for meeting shared state; shared by every execution in the process
+BASE_NAMESPACE = MappingProxyType(
+    {
+        **{
+            name: getattr(builtins, name)
+            for name in dir(builtins)
+            if not name.startswith("_") and name not in BLOCKED_BUILTINS
+        },
+        "asyncio": asyncio,
+        "Box": Box,
+    }
+)
+
+
+def _layer_agent_namespace(agent_namespace: Any) -> Dict[str, Any]:
+    """Layer an agent's namespace items over the base namespace.
+
+    Args:
+        agent_namespace: The agent's namespace (imports, playbook wrappers, etc.)
+
+    Returns:
+        New dict with the base namespace and non-conflicting agent items
+    """
+    namespace = dict(BASE_NAMESPACE)
+
+    # Check if namespace is actually iterable (not a Mock)
+    if hasattr(agent_namespace, "items") and callable(agent_namespace.items):
+        try:
+            # Only add non-conflicting items
+            for key, value in agent_namespace.items():
+                if key not in namespace and key not in EXCLUDED_NAMESPACE_KEYS:
+                    namespace[key] = value
+        except TypeError:
+            # Skip if namespace is not iterable (e.g., Mock in tests)
+            pass
+
+    return namespace
 
 
 class ExecutionResult:
@@ -103,52 +162,16 @@ class PythonExecutor:
             Dict containing necessary functions and variables
         """
         # Minimal namespace - most things accessed via self
-        namespace = {}
-
-        # Add builtins with dangerous ones removed
-        import builtins
-
-        blocked_builtins = {
-            "eval",
-            "exec",
-            "compile",
-            "__import__",
-            "open",
-            "input",
-            "breakpoint",
-            "exit",
-            "quit",
-            "help",
-            "license",
-            "copyright",
-            "credits",
-        }
-
-        for name in dir(builtins):
-            if not name.startswith("_") and name not in blocked_builtins:
-                namespace[name] = getattr(builtins, name)
-
-        # Add asyncio for await syntax
-        namespace["asyncio"] = asyncio
-
-        # Add Box for meeting shared state and general use
-        namespace["Box"] = Box
-
-        # Add agent's namespace items (imports, playbook wrappers, etc.)
-        if hasattr(self.agent, "namespace_manager") and hasattr(
-            self.agent.namespace_manager, "namespace"
-        ):
-            agent_namespace = self.agent.namespace_manager.namespace
-            # Check if namespace is actually iterable (not a Mock)
-            if hasattr(agent_namespace, "items") and callable(agent_namespace.items):
-                try:
-                    # Only add non-conflicting items
-                    for key, value in agent_namespace.items():
-                        if key not in namespace and key not in EXCLUDED_NAMESPACE_KEYS:
-                            namespace[key] = value
-                except TypeError:
-                    # Skip if namespace is not iterable (e.g., Mock in tests)
-                    pass
+        agent_namespace = getattr(
+            getattr(self.agent, "namespace_manager", None), "namespace", None
+        )
+        if isinstance(agent_namespace, VersionedNamespace):
+            # Rebuilt only when the agent namespace changes
+            namespace = dict(
+                agent_namespace.derived("execution", _layer_agent_namespace)
+            )
+        else:
+            namespace = _layer_agent_namespace(agent_namespace)
 
         # Add meeting object if agent is in a meeting context
         # Use the most proximal meeting (closest to top of call stack)
@@ -1,8 +1,10 @@
 """React execution that loops until exit conditions are met."""
 
+import copy
+import functools
+import os
 from typing import TYPE_CHECKING, Any
 
-from playbooks.compilation.compiler import Compiler
 from playbooks.compilation.markdown_to_ast import markdown_to_ast
 from playbooks.execution.step import PlaybookStep, PlaybookStepCollection
 
@@ -11,6 +13,11 @@ from .playbook import PlaybookLLMExecution
 if TYPE_CHECKING:
     pass
 
+# ReactAgent playbook whose ReactSteps are added to playbooks without steps
+REACT_AGENT_PBASM_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "prompts", "react_agent.pbasm"
+)
+
 
 class ReActLLMExecution(PlaybookLLMExecution):
     """React execution that loops until exit conditions are met.
@@ -53,135 +60,88 @@ class ReActLLMExecution(PlaybookLLMExecution):
 
     async def _add_react_steps(self) -> None:
         """Add react loop steps to the playbook."""
-        # Create a ReactAgent playbook for compilation
-        react_playbook = """# ReactAgent
-
-## ReactSteps
-### Steps
-- Think deeply about the $task to understand requirements
-- Write down $exit_conditions for the task
-- While $exit_conditions are not met:
-  - Analyze current state and progress
-  - Decide what action to take next
-  - Execute the action (tool call, user interaction, computation)
-  - Evaluate results against exit conditions
-- Return final results
-"""
-
-        # Compile the playbook to get proper step structure
-        compiled_steps = await self._compile_and_extract_steps(react_playbook)
-
-        # Set the compiled step collection on the playbook
-        self.playbook.step_collection = compiled_steps
-
-    async def _compile_and_extract_steps(
-        self, playbook_content: str
-    ) -> PlaybookStepCollection:
-        """Compile the playbook content and extract step collection.
-
-        Args:
-            playbook_content: The markdown playbook content to compile
-
-        Returns:
-            PlaybookStepCollection: The compiled step collection
-        """
-        try:
-            compiler = Compiler()
-
-            # Compile the playbook content
-            _, compiled_content, _ = await compiler.compile(content=playbook_content)
+        self.playbook.step_collection = copy.deepcopy(_react_steps_template())
 
-            # Parse the compiled content to extract steps
-            ast = markdown_to_ast(compiled_content)
 
-            # Find the ReactAgent H1 section
-            react_agent_h1 = None
-            for child in ast.get("children", []):
-                if child.get("type") == "h1" and "ReactAgent" in child.get("text", ""):
-                    react_agent_h1 = child
-                    break
+@functools.lru_cache(maxsize=1)
+def _react_steps_template() -> PlaybookStepCollection:
+    """Load the precompiled ReAct loop steps, once per process.
 
-            if not react_agent_h1:
-                # Fallback to original behavior if compilation failed
-                return self._create_fallback_steps()
+    The ReactAgent playbook ships compiled (prompts/react_agent.pbasm), so
+    adding the steps needs neither the compiler nor the working directory's
+    .pbasm_cache. The returned collection is shared; callers add a deep copy
+    of it to their playbook.
 
-            # Find the ReactSteps H2 section within the ReactAgent
-            react_steps_h2 = None
-            for child in react_agent_h1.get("children", []):
-                if child.get("type") == "h2" and "ReactSteps" in child.get("text", ""):
-                    react_steps_h2 = child
-                    break
-
-            if not react_steps_h2:
-                # Fallback to original behavior if H2 not found
-                return self._create_fallback_steps()
+    Returns:
+        PlaybookStepCollection: The steps of ReactAgent's ReactSteps playbook
+    """
+    with open(REACT_AGENT_PBASM_PATH, "r", encoding="utf-8") as f:
+        ast = markdown_to_ast(f.read(), source_file_path=REACT_AGENT_PBASM_PATH)
 
-            # Extract steps from the compiled H2 section
-            return self._extract_steps_from_h2(react_steps_h2)
+    for h1 in ast.get("children", []):
+        if h1.get("type") == "h1" and "ReactAgent" in h1.get("text", ""):
+            for h2 in h1.get("children", []):
+                if h2.get("type") == "h2" and "ReactSteps" in h2.get("text", ""):
+                    return _extract_steps_from_h2(h2)
+    raise ValueError(f"ReactSteps playbook not found in {REACT_AGENT_PBASM_PATH}")
 
-        except Exception as e:
-            # If any error occurs during compilation or parsing,
-            # fall back to the original implementation
-            raise Exception(f"Error creating react steps: {e}") from e
 
-    def _extract_steps_from_h2(self, h2_node: dict) -> PlaybookStepCollection:
-        """Extract steps from a compiled H2 node.
+def _extract_steps_from_h2(h2_node: dict) -> PlaybookStepCollection:
+    """Extract steps from a compiled H2 node.
 
-        Args:
-            h2_node: The H2 AST node containing steps
+    Args:
+        h2_node: The H2 AST node containing steps
 
-        Returns:
-            PlaybookStepCollection: The extracted step collection
-        """
+    Returns:
+        PlaybookStepCollection: The extracted step collection
+    """
 
-        def parse_node(
-            node: dict, step_collection: PlaybookStepCollection
-        ) -> PlaybookStep:
-            step = None
-            if node.get("type") == "list-item":
-                text = node.get("text", "").strip()
-                item_line_number = node.get("line_number")
-                source_file_path = node.get("source_file_path")
-                step = PlaybookStep.from_text(text)
-                if step:
-                    step.source_line_number = item_line_number
-                    step.source_file_path = source_file_path
-                    step_collection.add_step(step)
-
-                    if node.get("children"):
-                        if len(node.get("children")) > 1:
-                            raise ValueError(
-                                f"Expected 1 child for list-item, got {len(node.get('children'))}"
-                            )
-
-                        list_node = node.get("children")[0]
-                        if list_node.get("type") != "list":
-                            raise ValueError(
-                                f"Expected a single list under list-item, got a {list_node.get('type')}"
-                            )
-
-                        child_steps = []
-                        for child in list_node.get("children", []):
-                            child_step = parse_node(child, step_collection)
-                            if child_step:
-                                child_steps.append(child_step)
-
-                        step.children = child_steps
-            else:
-                raise ValueError(f"Expected a list-item, got a {node.get('type')}")
-            return step
-
-        # Find the Steps H3 section
-        for child in h2_node.get("children", []):
-            if (
-                child.get("type") == "h3"
-                and child.get("text", "").strip().lower() == "steps"
-            ):
-                step_collection = PlaybookStepCollection()
-                if child["children"] and "children" in child["children"][0]:
-                    for list_item in child["children"][0]["children"]:
-                        parse_node(list_item, step_collection)
-                return step_collection
-
-        # No steps found, return empty collection
-        return PlaybookStepCollection()
+    def parse_node(node: dict, step_collection: PlaybookStepCollection) -> PlaybookStep:
+        step = None
+        if node.get("type") == "list-item":
+            text = node.get("text", "").strip()
+            item_line_number = node.get("line_number")
+            source_file_path = node.get("source_file_path")
+            step = PlaybookStep.from_text(text)
+            if step:
+                step.source_line_number = item_line_number
+                step.source_file_path = source_file_path
+                step_collection.add_step(step)
+
+                if node.get("children"):
+                    if len(node.get("children")) > 1:
+                        raise ValueError(
+                            f"Expected 1 child for list-item, got {len(node.get('children'))}"
+                        )
+
+                    list_node = node.get("children")[0]
+                    if list_node.get("type") != "list":
+                        raise ValueError(
+                            f"Expected a single list under list-item, got a {list_node.get('type')}"
+                        )
+
+                    child_steps = []
+                    for child in list_node.get("children", []):
+                        child_step = parse_node(child, step_collection)
+                        if child_step:
+                            child_steps.append(child_step)
+
+                    step.children = child_steps
+        else:
+            raise ValueError(f"Expected a list-item, got a {node.get('type')}")
+        return step
+
+    # Find the Steps H3 section
+    for child in h2_node.get("children", []):
+        if (
+            child.get("type") == "h3"
+            and child.get("text", "").strip().lower() == "steps"
+        ):
+            step_collection = PlaybookStepCollection()
+            if child["children"] and "children" in child["children"][0]:
+                for list_item in child["children"][0]["children"]:
+                    parse_node(list_item, step_collection)
+            return step_collection
+
+    # No steps found, return empty collection
+    return PlaybookStepCollection()
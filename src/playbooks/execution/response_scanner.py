@@ -0,0 +1,248 @@
+"""Incremental scanner for streamed interpreter responses.
+
+This module accumulates LLM response chunks and detects Say("recipient",
+"message") calls as they stream in, looking only at the text each chunk adds
+so that the work per chunk is proportional to the chunk size.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+_SAY_START = 'Say("'
+_RECIPIENT_END = '", "'
+
+# Scanner states
+_SEARCH = "search"  # Looking for the next Say("
+_RECIPIENT = "recipient"  # Reading the recipient up to ", "
+_QUOTE = "quote"  # Deciding whether the message is a triple-quoted string
+_MESSAGE = "message"  # Reading the message up to its closing quote
+
+# Enough trailing message characters to strip a closing quote and paren
+_TAIL_SIZE = 8
+
+
+@dataclass(frozen=True)
+class SayEvent:
+    """Progress of a streamed Say() call.
+
+    Attributes:
+        kind: "start" when the message begins, "delta" for newly streamable
+            message text, "end" when the closing quote arrives
+        recipient: Recipient of the Say() call
+        text: The new text for "delta", the complete raw message for "end"
+        has_placeholders: Whether a {$var} placeholder arrived before the
+            chunk that completed the message; no deltas follow one
+    """
+
+    kind: str
+    recipient: str
+    text: str = ""
+    has_placeholders: bool = False
+
+
+class ResponseScanner:
+    """Accumulates response chunks and tracks streamed Say() calls.
+
+    The response is kept as a list of chunks and only joined on request.
+    Each chunk is scanned once: a line tracker notes whether any complete
+    line is indented (code inside a block, whose Say() calls may not run),
+    and a small state machine follows Say() calls, carrying over only the
+    few characters a pattern could span between chunks.
+    """
+
+    def __init__(self, accept: Callable[[str], bool]):
+        """Initialize an empty scanner.
+
+        Args:
+            accept: Decides whether the Say() call to a recipient is streamed
+        """
+        self._accept = accept
+        self.chunks: List[str] = []
+        self._text = ""
+        self._joined_chunks = 0
+
+        # Whether a complete line starting with whitespace has been seen
+        self.indented_code_detected = False
+        self._line_start = ""
+
+        self._state = _SEARCH
+        # Characters of the current pattern that may continue in the next chunk
+        self._carry = ""
+        # Recipient or message text received so far in the current call
+        self._parts: List[str] = []
+        self._recipient = ""
+        self._end = '")'
+        self._triple = False
+        self._has_placeholders = False
+        # Message text received but not yet emitted, and the message's end
+        self._unsent: List[str] = []
+        self._tail = ""
+        self._sent: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """The response received so far."""
+        if self._joined_chunks < len(self.chunks):
+            self._text += "".join(self.chunks[self._joined_chunks :])
+            self._joined_chunks = len(self.chunks)
+        return self._text
+
+    @property
+    def in_say_call(self) -> bool:
+        """Whether a streamed Say() message is still being received."""
+        return self._state in (_QUOTE, _MESSAGE)
+
+    @property
+    def recipient(self) -> str:
+        """Recipient of the Say() call being streamed."""
+        return self._recipient
+
+    @property
+    def sent_message(self) -> str:
+        """Message text emitted as deltas for the current Say() call."""
+        return "".join(self._sent)
+
+    def add_chunk(self, chunk: str) -> List[SayEvent]:
+        """Add a response chunk and report Say() progress.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            Events for Say() calls started, continued or completed by the chunk
+        """
+        self.chunks.append(chunk)
+        if not self.indented_code_detected:
+            self._track_lines(chunk)
+
+        events: List[SayEvent] = []
+        text: Optional[str] = chunk
+        while text is not None:
+            if self._state == _SEARCH:
+                text = self._search(text)
+            elif self._state == _RECIPIENT:
+                text = self._read_recipient(text, events)
+            elif self._state == _QUOTE:
+                text = self._read_quote(text)
+            else:
+                text = self._read_message(text, events)
+
+        if self._state == _MESSAGE and not self._has_placeholders:
+            delta = self._take_streamable()
+            if delta:
+                events.append(SayEvent("delta", self._recipient, delta))
+        return events
+
+    def _track_lines(self, chunk: str) -> None:
+        lines = chunk.split("\n")
+        if len(lines) == 1:
+            self._line_start = self._line_start or chunk[:1]
+            return
+        completed = [self._line_start or lines[0][:1]]
+        completed.extend(line[:1] for line in lines[1:-1])
+        if " " in completed or "\t" in completed:
+            self.indented_code_detected = True
+        self._line_start = lines[-1][:1]
+
+    def _search(self, text: str) -> Optional[str]:
+        window = self._carry + text
+        pos = window.find(_SAY_START)
+        if pos == -1:
+            self._carry = window[-(len(_SAY_START) - 1) :]
+            return None
+        self._carry = ""
+        self._parts = []
+        self._state = _RECIPIENT
+        return window[pos + len(_SAY_START) :]
+
+    def _read_recipient(self, text: str, events: List[SayEvent]) -> Optional[str]:
+        window = self._carry + text
+        pos = window.find(_RECIPIENT_END)
+        if pos == -1:
+            keep = len(_RECIPIENT_END) - 1
+            self._parts.append(window[:-keep])
+            self._carry = window[-keep:]
+            return None
+
+        self._parts.append(window[:pos])
+        recipient = "".join(self._parts)
+        self._carry = ""
+        self._parts = []
+        rest = window[pos + len(_RECIPIENT_END) :]
+        if self.indented_code_detected or not self._accept(recipient):
+            self._state = _SEARCH
+            return rest
+
+        self._recipient = recipient
+        self._state = _QUOTE
+        self._has_placeholders = False
+        self._unsent = []
+        self._tail = ""
+        self._sent = []
+        events.append(SayEvent("start", recipient))
+        return rest
+
+    def _read_quote(self, text: str) -> Optional[str]:
+        # Need three characters to tell a triple-quoted message apart
+        window = self._carry + text
+        if len(window) < 3:
+            self._carry = window
+            return None
+        self._carry = ""
+        self._triple = window.startswith('""')
+        self._end = '""")' if self._triple else '")'
+        self._state = _MESSAGE
+        return window[2:] if self._triple else window
+
+    def _read_message(self, text: str, events: List[SayEvent]) -> Optional[str]:
+        window = self._carry + text
+        pos = window.find(self._end)
+        if pos == -1:
+            keep = min(len(self._end) - 1, len(window))
+            received = window[len(self._carry) :]
+            self._parts.append(received)
+            self._unsent.append(received)
+            self._tail = (self._tail + received)[-_TAIL_SIZE:]
+            self._has_placeholders = self._has_placeholders or "{" in received
+            self._carry = window[len(window) - keep :]
+            return None
+
+        # The closing quote may start inside the carried-over characters,
+        # which were already added to the message
+        message = "".join(self._parts) + window[len(self._carry) :]
+        message = message[: len(message) - len(window) + pos]
+        events.append(SayEvent("end", self._recipient, message, self._has_placeholders))
+        self._state = _SEARCH
+        self._carry = ""
+        self._parts = []
+        self._unsent = []
+        self._sent = []
+        return window[pos + len(self._end) :]
+
+    def _take_streamable(self) -> str:
+        """Remove and return unsent message text that cannot be a closing quote."""
+        tail = self._tail
+        if tail.endswith('")'):
+            tail = tail[:-2]
+        elif tail.endswith('"'):
+            tail = tail[:-1]
+        # An escape character may change the meaning of what follows
+        if tail.endswith("\\"):
+            return ""
+        if tail.endswith(self._end):
+            tail = tail[: -len(self._end)]
+        elif self._triple:
+            for quotes in ('"""', '""', '"'):
+                if tail.endswith(quotes):
+                    tail = tail[: -len(quotes)]
+                    break
+        elif tail.endswith('"'):
+            tail = tail[:-1]
+
+        held = len(self._tail) - len(tail)
+        unsent = "".join(self._unsent)
+        delta = unsent[: max(0, len(unsent) - held)]
+        self._unsent = [unsent[len(delta) :]] if held else []
+        if delta:
+            self._sent.append(delta)
+        return delta
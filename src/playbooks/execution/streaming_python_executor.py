@@ -8,9 +8,12 @@ import ast
 import asyncio
 import logging
 import traceback
-import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from types import CodeType
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from playbooks.config import config
 from playbooks.core.exceptions import ExecutionFinished
 from playbooks.execution.incremental_code_buffer import CodeBuffer
 from playbooks.execution.python_executor import (
@@ -24,6 +27,164 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Agent attributes that LLM-generated code must not read or modify
+PROTECTED_AGENT_ATTRIBUTES = frozenset(
+    {
+        # Runtime wiring / infrastructure
+        "program",
+        "event_bus",
+        "call_stack",
+        "session_log",
+        "namespace_manager",
+        "meeting_manager",
+        # Meeting runtime state (not playbook state)
+        "owned_meetings",
+        "joined_meetings",
+    }
+)
+
+if config.await_mode not in ("top_level", "wrapper"):
+    raise ValueError(f"Invalid await mode: {config.await_mode}")
+top_level_await = config.await_mode == "top_level"
+
+# Nested scopes cannot see frame locals when code runs with separate globals
+# and locals, so statements containing them keep the wrapper's combined namespace
+_NESTED_SCOPES = (
+    ast.Lambda,
+    ast.GeneratorExp,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+)
+
+_AWAIT_WRAPPER_NAME = "__stmt__"
+
+# Wraps a statement containing await so it can run as a coroutine; the
+# statement replaces the `pass` and its locals are copied out even if it raises
+_AWAIT_WRAPPER_SOURCE = f"""
+async def {_AWAIT_WRAPPER_NAME}():
+    try:
+        pass
+    finally:
+        __combined_ns.update({{k: v for k, v in locals().items() if not k.startswith('_')}})
+"""
+
+
+@dataclass(frozen=True)
+class CompiledStatement:
+    """A top-level statement of LLM-generated code, checked and compiled.
+
+    Attributes:
+        source: Source text of the statement
+        code: Code object; evaluating an async statement returns a coroutine,
+            or defines the wrapper function if the statement is wrapped
+        is_async: Whether the statement contains await
+        wrapped: Whether the statement runs through the async wrapper function
+        skip_reason: Why the statement is not executed, if it is skipped
+    """
+
+    source: str
+    code: Optional[CodeType]
+    is_async: bool = False
+    wrapped: bool = False
+    skip_reason: Optional[str] = None
+
+
+@lru_cache(maxsize=1024)
+def compile_statement(source: str, top_level_await: bool = True) -> CompiledStatement:
+    """Check and compile one top-level statement.
+
+    LLM responses repeat the same statements (Step markers, Yld, Return)
+    across turns and agents, so results are cached by source text.
+
+    Args:
+        source: Source text of a single top-level statement
+        top_level_await: Compile await statements with PyCF_ALLOW_TOP_LEVEL_AWAIT
+            so they run directly on the frame locals, rather than in a wrapper
+            function executed against a copy of the namespace
+
+    Returns:
+        The compiled statement, or a skipped one if a safety filter applies
+    """
+    stmt = ast.parse(source).body[0]
+
+    # Safety filters for streamed LLM output:
+    # - Some models occasionally leak markdown/code-fence artifacts that parse as
+    #   bare identifiers (e.g. a standalone `python` line). Those are no-ops and
+    #   should not crash execution with NameError.
+    # - Prevent LLM-generated code from reading or mutating agent runtime
+    #   internals that are not part of the playbook state API (e.g. joined_meetings).
+    if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Name):
+        return CompiledStatement(
+            source, None, skip_reason="no-op bare identifier expression"
+        )
+
+    has_await = False
+    has_nested_scope = False
+    for node in ast.walk(stmt):
+        if isinstance(node, ast.Await):
+            has_await = True
+        elif isinstance(node, _NESTED_SCOPES) and node is not stmt:
+            has_nested_scope = True
+        elif (
+            isinstance(node, ast.Attribute)
+            and node.attr in PROTECTED_AGENT_ATTRIBUTES
+            and isinstance(node.value, ast.Name)
+            and node.value.id in {"self", "agent"}
+        ):
+            targets = getattr(stmt, "targets", None) or [getattr(stmt, "target", None)]
+            if any(node in ast.walk(target) for target in targets if target):
+                reason = "assignment to protected agent attribute"
+            else:
+                reason = f"statement that reads protected agent attribute {node.attr}"
+            return CompiledStatement(source, None, skip_reason=reason)
+
+    # Function/class definitions don't need wrapping and execute directly
+    is_definition = isinstance(
+        stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    )
+    if is_definition or not has_await:
+        module = ast.Module(body=[stmt], type_ignores=[])
+        return CompiledStatement(source, compile(module, "<llm>", "exec"))
+
+    if top_level_await and not has_nested_scope:
+        module = ast.Module(body=[stmt], type_ignores=[])
+        code = compile(module, "<llm>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+        return CompiledStatement(source, code, is_async=True)
+
+    wrapper = ast.parse(_AWAIT_WRAPPER_SOURCE)
+    wrapper.body[0].body[0].body = [stmt]
+    return CompiledStatement(
+        source, compile(wrapper, "<llm>", "exec"), is_async=True, wrapped=True
+    )
+
+
+def _statement_sources(source: str, statements: List[ast.stmt]) -> List[str]:
+    """Return the source text of each parsed top-level statement.
+
+    Equivalent to ast.get_source_segment for each statement, but splits and
+    encodes the source only once (AST column offsets are UTF-8 byte offsets).
+    """
+    lines = [line.encode("utf-8") for line in source.split("\n")]
+    sources = []
+    for stmt in statements:
+        # A decorated definition starts at its first decorator, not at def/class
+        decorators = getattr(stmt, "decorator_list", [])
+        first = min([stmt.lineno] + [d.lineno for d in decorators]) - 1
+        last = stmt.end_lineno - 1
+        if first == last:
+            segment = lines[first][stmt.col_offset : stmt.end_col_offset]
+        else:
+            segment = b"\n".join(
+                [
+                    lines[first][stmt.col_offset :],
+                    *lines[first + 1 : last],
+                    lines[last][: stmt.end_col_offset],
+                ]
+            )
+        sources.append(segment.decode("utf-8"))
+    return sources
+
 
 class StreamingExecutionError(Exception):
     """Exception raised when streaming execution encounters an error."""
@@ -48,7 +209,7 @@ class StreamingPythonExecutor:
     complete statements as they arrive, with proper globals/locals separation.
 
     Key features:
-    - Uses CodeBuffer for indentation-aware executable prefix detection
+    - Uses CodeBuffer for incremental statement boundary detection
     - Executes statements as soon as they're complete
     - Uses separate globals/locals dicts for proper variable scoping
     - Stops on errors and provides executed code for LLM retry
@@ -155,8 +316,10 @@ class StreamingPythonExecutor:
             parsed = ast.parse(executable)
 
             # Execute each statement
-            for stmt in parsed.body:
-                await self._execute_statement(stmt)
+            for source in _statement_sources(executable, parsed.body):
+                await self._execute_statement(
+                    compile_statement(source, top_level_await)
+                )
                 await asyncio.sleep(0)  # Yield to event loop for other events
 
             # Success - remove executed code from buffer and track it
@@ -191,20 +354,21 @@ class StreamingPythonExecutor:
                 f"Execution failed: {type(e).__name__}: {e}", e, executed_code
             )
 
-    async def _execute_statement(self, stmt: ast.stmt) -> None:
-        """Execute a single AST statement with tracing.
+    async def _execute_statement(self, statement: "CompiledStatement") -> None:
+        """Execute a single compiled statement with tracing.
 
-        Uses exec() with proper namespace handling. For async statements containing
-        await, wraps them in a temporary async function.
+        Uses exec() with proper namespace handling. Statements containing await
+        are evaluated to a coroutine over the same namespaces, or run through
+        the async wrapper function when compiled with one.
 
         Args:
-            stmt: AST statement to execute
+            statement: Statement compiled by compile_statement
         """
         if self.agent.program and getattr(
             self.agent.program, "execution_finished", False
         ):
             debug(
-                f"Skipping execution of statement: {stmt} because program execution is finished"
+                f"Skipping execution of statement: {statement.source} because program execution is finished"
             )
             raise ExecutionFinished("Program execution finished")
 
@@ -219,171 +383,44 @@ class StreamingPythonExecutor:
 
         frame_locals = current_frame.locals
 
-        # Convert the statement back to source code
-        statement_code = ast.unparse(stmt)
-
-        # Safety filters for streamed LLM output:
-        # - Some models occasionally leak markdown/code-fence artifacts that parse as
-        #   bare identifiers (e.g. a standalone `python` line). Those are no-ops and
-        #   should not crash execution with NameError.
-        # - Prevent LLM-generated code from mutating agent runtime internals that are
-        #   not part of the playbook state API (e.g. joined_meetings).
-        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Name):
-            debug(f"Skipping no-op bare identifier expression: {stmt.value.id}")
+        if statement.skip_reason:
+            debug(f"Skipping {statement.skip_reason}: {statement.source}")
             return
 
-        def _is_rooted_at_state(n: ast.AST) -> bool:
-            """Return True if `n` is an Attribute chain whose base is `self.state`/`agent.state`."""
-            if not isinstance(n, ast.Attribute):
-                return False
-            cur: ast.AST = n
-            # Walk left through `.value` until we hit a non-Attribute node.
-            while isinstance(cur, ast.Attribute):
-                if (
-                    cur.attr == "state"
-                    and isinstance(cur.value, ast.Name)
-                    and cur.value.id in {"self", "agent"}
-                ):
-                    return True
-                cur = cur.value
-            return False
-
-        protected_self_attrs = {
-            # Runtime wiring / infrastructure
-            "program",
-            "event_bus",
-            "call_stack",
-            "session_log",
-            "namespace_manager",
-            "meeting_manager",
-            # Meeting runtime state (not playbook state)
-            "owned_meetings",
-            "joined_meetings",
-        }
-
-        def _is_protected_target(t: ast.AST) -> bool:
-            # self.<protected>
-            if (
-                isinstance(t, ast.Attribute)
-                and isinstance(t.value, ast.Name)
-                and t.value.id in {"self", "agent"}
-                and t.attr in protected_self_attrs
-            ):
-                return True
-            # self.<protected>[...]
-            if isinstance(t, ast.Subscript):
-                base = t.value
-                if (
-                    isinstance(base, ast.Attribute)
-                    and isinstance(base.value, ast.Name)
-                    and base.value.id in {"self", "agent"}
-                    and base.attr in protected_self_attrs
-                ):
-                    return True
-            return False
-
-        if isinstance(stmt, ast.Assign):
-            if any(_is_protected_target(t) for t in stmt.targets):
-                debug(
-                    f"Skipping assignment to protected agent attribute: {statement_code}"
-                )
-                return
-        elif isinstance(stmt, ast.AnnAssign):
-            if _is_protected_target(stmt.target):
-                debug(
-                    f"Skipping annotated assignment to protected agent attribute: {statement_code}"
-                )
-                return
-        elif isinstance(stmt, ast.AugAssign):
-            if _is_protected_target(stmt.target):
-                debug(
-                    f"Skipping augmented assignment to protected agent attribute: {statement_code}"
-                )
-                return
-
-        # Also block *reads* of protected attributes: LLM code occasionally introspects
-        # runtime internals (e.g. iterating self.joined_meetings as if it were a list),
-        # which is brittle and can crash streaming execution.
-        for node in ast.walk(stmt):
-            if (
-                isinstance(node, ast.Attribute)
-                and isinstance(node.value, ast.Name)
-                and node.value.id in {"self", "agent"}
-                and node.attr in protected_self_attrs
-            ):
-                debug(
-                    f"Skipping statement that reads protected agent attribute {node.attr}: {statement_code}"
-                )
-                return
+        debug(f"Executing: {statement.source}", agent=self.agent)
 
-        debug(f"Executing: {statement_code}", agent=self.agent)
+        if not statement.is_async:
+            # Function/class definitions or synchronous statements - use frame locals
+            exec(statement.code, self.namespace, frame_locals)
+            return
 
-        # Check if this is a function/class definition
-        # These don't need wrapping and should execute directly
-        is_definition = isinstance(
-            stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
-        )
+        if not statement.wrapped:
+            # Top-level await: the coroutine stores names directly in frame locals
+            await eval(statement.code, self.namespace, frame_locals)
+            return
 
-        # Check if statement contains await
-        has_await = any(isinstance(node, ast.Await) for node in ast.walk(stmt))
+        # Async statement with await - run the wrapper, which updates the
+        # combined namespace with its locals
+        combined_ns = self.namespace.copy()
+        combined_ns.update(frame_locals)
+        combined_ns["__combined_ns"] = combined_ns
+        exec(statement.code, combined_ns)
 
         try:
-            if is_definition or not has_await:
-                # Function/class definitions or synchronous statements - use frame locals
-                exec(
-                    compile(statement_code, "<llm>", "exec"),
-                    self.namespace,
-                    frame_locals,
-                )
-            else:
-                # Async statement with await - create wrapper that updates frame locals
-                # Merge globals and frame locals into a single dict for execution
-                combined_ns = self.namespace.copy()
-                combined_ns.update(frame_locals)
-
-                fn_name = f"__stmt_{uuid.uuid4().hex[:8]}__"
-
-                # Create wrapper that executes the statement and captures local variables
-                # Use try-finally to ensure locals are captured even if statement throws
-                wrapped_code = f"async def {fn_name}():\n"
-                wrapped_code += "    try:\n"
-                for line in statement_code.split("\n"):
-                    wrapped_code += f"        {line}\n"
-                wrapped_code += "    finally:\n"
-                wrapped_code += (
-                    "        # Update combined namespace with local variables\n"
-                )
-                wrapped_code += "        __combined_ns.update({k: v for k, v in locals().items() if not k.startswith('_')})\n"
-
-                # Make combined_ns available in the wrapper's closure
-                combined_ns["__combined_ns"] = combined_ns
-
-                # Execute wrapper definition
-                exec(compile(wrapped_code, "<llm>", "exec"), combined_ns)
-
-                # Get and execute the async function
-                fn = combined_ns[fn_name]
-
-                try:
-                    await fn()
-                finally:
-                    # Clean up
-                    del combined_ns[fn_name]
-                    if "__combined_ns" in combined_ns:
-                        del combined_ns["__combined_ns"]
-
-                    # Extract any NEW variables to frame locals
-                    for key, value in combined_ns.items():
-                        if (
-                            key not in self.namespace
-                            and not callable(value)
-                            and not key.startswith("_")
-                            and key not in ["asyncio", "self"]
-                        ):
-                            frame_locals[key] = value
-        except Exception:
-            # Mark statement as failed
-            raise
+            await combined_ns[_AWAIT_WRAPPER_NAME]()
+        finally:
+            del combined_ns[_AWAIT_WRAPPER_NAME]
+            del combined_ns["__combined_ns"]
+
+            # Extract any NEW variables to frame locals
+            for key, value in combined_ns.items():
+                if (
+                    key not in self.namespace
+                    and not callable(value)
+                    and not key.startswith("_")
+                    and key not in ["asyncio", "self"]
+                ):
+                    frame_locals[key] = value
 
     def get_executed_code(self, include_error_line: bool = False) -> str:
         """Get the code that has been successfully executed.
@@ -405,13 +442,10 @@ class StreamingPythonExecutor:
         Returns:
             ExecutionResult containing all captured directives and any errors
         """
-        remaining_buffer = self.code_buffer.get_buffer().strip()
-
-        # Try to execute any remaining buffered code
-        if not self.has_error and remaining_buffer:
-            # Ensure the buffer ends with a newline so get_executable_prefix() will consider it
-            if not self.code_buffer.get_buffer().endswith("\n"):
-                self.code_buffer.add_chunk("\n")
+        # Try to execute any remaining buffered code, including a block left
+        # open at the end of the response
+        if not self.has_error:
+            self.code_buffer.close()
             await self._try_execute()
 
         # No cleanup needed - executor is tied to call stack frame lifecycle
@@ -1,13 +1,47 @@
 """LLM context compaction for managing conversation history size."""
 
+import asyncio
+import bisect
+import hashlib
+import logging
+import operator
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+from playbooks.config import config as playbooks_config
+from playbooks.core.enums import LLMCallPriority, LLMMessageStability
 from playbooks.llm.messages import (
+    ArtifactLLMMessage,
     AssistantResponseLLMMessage,
     LLMMessage,
+    PlaybookImplementationLLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.utils.llm_config import LLMConfig
+from playbooks.utils.llm_helper import ensure_async_iterable, get_completion
+from playbooks.utils.token_counter import approximate_token_count
+
+logger = logging.getLogger(__name__)
+
+# Chat format overhead, as estimated by get_messages_token_count
+_MESSAGE_OVERHEAD_TOKENS = 4
+_CONVERSATION_OVERHEAD_TOKENS = 2
+
+# Characters of a message kept when the token budget requires truncating it
+_TRUNCATED_LENGTH = 400
+
+# Messages that are never compacted: the instructions being followed and
+# artifacts the agent explicitly loaded
+_PINNED_TYPES = (PlaybookImplementationLLMMessage, ArtifactLLMMessage)
+
+SUMMARY_PROMPT = """You maintain a running summary of an AI agent's earlier activity, \
+which no longer fits in its context window.
+
+Update the summary so far with the new activity. Keep facts the agent may \
+need later: decisions made, results obtained, values computed, messages \
+exchanged with users and other agents, and tasks still pending. Drop \
+reasoning and details that no longer matter. Reply with the updated summary \
+only, as concise bullet points."""
 
 
 @dataclass
@@ -17,18 +51,68 @@ class CompactionConfig:
     Attributes:
         enabled: Whether compaction is enabled
         keep_last_n_assistant_messages: Number of most recent assistant messages to keep in full
+        token_budget: Estimated input tokens (characters / 4) the compacted
+            messages must fit in; older history is compacted further, then
+            dropped, to meet it. None applies only the keep-last-N rule
+        summarize: Whether dropped history is replaced by a running summary
+        summary_span_messages: Number of messages dropped, and summarized,
+            together, so each span is summarized once
+        summary_max_tokens: Completion token limit for each summary
     """
 
     enabled: bool = True
     min_preserved_assistant_messages: int = (
         2  # Alias for keep_last_n_assistant_messages
     )
+    token_budget: Optional[int] = None
+    summarize: bool = False
+    summary_span_messages: int = 20
+    summary_max_tokens: int = 400
 
     @property
     def keep_last_n_assistant_messages(self) -> int:
         """Alias for min_preserved_assistant_messages for backward compatibility."""
         return self.min_preserved_assistant_messages
 
+    @classmethod
+    def from_settings(cls, model: Optional[str] = None) -> "CompactionConfig":
+        """Create a configuration from the [llm_compaction] settings.
+
+        Args:
+            model: Model the compacted messages are sent to, which selects its
+                token budget; defaults to the execution model
+
+        Returns:
+            Compaction configuration
+        """
+        settings = playbooks_config.llm_compaction
+        model = model or playbooks_config.model.execution.name
+        return cls(
+            token_budget=settings.models.get(model, settings.token_budget),
+            summarize=settings.summarize,
+            summary_span_messages=settings.summary_span_messages,
+            summary_max_tokens=settings.summary_max_tokens,
+        )
+
+
+def _rendered_size(message: Dict[str, Any]) -> int:
+    """Estimate the tokens a rendered message adds to the prompt."""
+    content = message.get("content")
+    size = approximate_token_count(content) if isinstance(content, str) else 0
+    return size + _MESSAGE_OVERHEAD_TOKENS
+
+
+def _truncate(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Shorten a rendered message to its first _TRUNCATED_LENGTH characters."""
+    content = message.get("content")
+    if not isinstance(content, str) or len(content) <= _TRUNCATED_LENGTH:
+        return message
+    omitted = len(content) - _TRUNCATED_LENGTH
+    return {
+        "role": message["role"],
+        "content": f"{content[:_TRUNCATED_LENGTH]}\n... ({omitted} more characters)",
+    }
+
 
 class LLMContextCompactor:
     """Manages compaction of LLM conversation history to reduce token usage.
@@ -36,6 +120,23 @@ class LLMContextCompactor:
     The compactor preserves the most recent N assistant message cycles in full
     while compacting older messages to summaries. This maintains context while
     reducing token consumption for long conversations.
+
+    Messages older than the preserved cycles never change their rendering
+    again, so the compactor keeps the compacted prefix between calls and only
+    extends it when the boundary moves; each call renders just the messages
+    added since the previous one. Renderings are memoized on the messages
+    (see LLMMessage.rendered) and shared, so callers must not modify them.
+    The prefix is cut back to the first message that differs when the
+    history is rewritten, e.g. when a call stack frame is popped.
+
+    With a token budget, history older than the preserved cycles is shortened
+    until the messages fit: each message is compacted and truncated, oldest
+    first, and then dropped in spans of summary_span_messages. Shortening is
+    kept for as long as the prefix lasts, so later calls continue from where
+    the previous one stopped. Dropped spans can be replaced by a running
+    summary produced in the background by the summarization model; each span
+    is summarized once, and the summary is used from the first call after it
+    is ready, so summarization never delays an LLM call.
     """
 
     def __init__(self, config: Optional[CompactionConfig] = None):
@@ -45,6 +146,33 @@ class LLMContextCompactor:
             config: Compaction configuration, uses defaults if None
         """
         self.config = config or CompactionConfig()
+        # Running summaries keyed by the chain of spans they cover
+        self._summaries: Dict[bytes, str] = {}
+        self._summary_task: Optional[asyncio.Task] = None
+        # Input index of each message the last compaction returned
+        self._sources: List[Optional[int]] = []
+        self._reset_prefix()
+
+    def _reset_prefix(self) -> None:
+        """Forget the compacted prefix."""
+        # Messages before the oldest fully kept message, their renderings
+        # (shortened as the token budget required) and estimated sizes
+        self._prefix_messages: List[LLMMessage] = []
+        self._prefix: List[Optional[Dict[str, Any]]] = []
+        self._sizes: List[int] = []
+        # Estimated tokens of the prefix renderings that are not dropped
+        self._prefix_tokens = 0
+        # Prefix indices the token budget may shorten or drop, and how many
+        # of them (oldest first) are shortened and dropped so far
+        self._candidates: List[int] = []
+        self._shortened = 0
+        self._dropped = 0
+        # Prefix indices of pinned messages between dropped candidates, still sent
+        self._pinned_dropped: List[int] = []
+        # Key of each complete span of candidates, chained from the first
+        self._span_keys: List[bytes] = []
+        # First message the token budget may change in the next compaction
+        self._budget_changed_from: Optional[int] = None
 
     def compact_messages(self, messages: List[LLMMessage]) -> List[Dict[str, Any]]:
         """Compact a list of LLM messages based on configuration.
@@ -53,6 +181,9 @@ class LLMContextCompactor:
         All other assistant and user messages are compacted. Other message types
         (System, AgentInfo, etc.) are always kept full.
 
+        If a token budget is configured and the result exceeds it, older
+        messages are compacted further or dropped (see class docstring).
+
         Args:
             messages: List of LLMMessage objects to potentially compact
 
@@ -60,38 +191,339 @@ class LLMContextCompactor:
             List of message dictionaries in LLM API format (with compacted older messages)
         """
         if not self.config.enabled or not messages:
-            return [msg.to_full_message() for msg in messages]
+            self._sources = list(range(len(messages)))
+            return [msg.rendered() for msg in messages]
 
-        # Identify indices of assistant and user messages
-        assistant_indices = [
-            i
-            for i, msg in enumerate(messages)
-            if isinstance(msg, AssistantResponseLLMMessage)
-        ]
-        user_indices = [
-            i for i, msg in enumerate(messages) if isinstance(msg, UserInputLLMMessage)
+        keep_full, _, _ = self._recent_messages(messages)
+        boundary = min(keep_full)
+        self._advance_prefix(messages, boundary)
+        tail = [
+            self._render(messages[i], i in keep_full)
+            for i in range(boundary, len(messages))
         ]
 
-        # Determine which indices to keep full
-        keep_full = set(
-            assistant_indices[-self.config.keep_last_n_assistant_messages :]
+        if self.config.token_budget is not None:
+            self._fit_token_budget(tail)
+        result = self._prefix_output()
+        result.extend(tail)
+        self._sources = self._prefix_sources()
+        self._sources.extend(range(boundary, len(messages)))
+        return result
+
+    def get_output_sources(self) -> List[Optional[int]]:
+        """Map the messages of the last compaction back to the input messages.
+
+        Returns:
+            For each message compact_messages returned, the index of the input
+            message it renders, or None for the summary of dropped history
+        """
+        return self._sources
+
+    def _recent_messages(
+        self, messages: Sequence[LLMMessage]
+    ) -> Tuple[Set[int], Optional[int], List[int]]:
+        """Find the messages kept in full, scanning back from the newest.
+
+        Returns:
+            Indices of the last N assistant messages and the last user
+            message (or {len(messages)} when there are none, as everything
+            then counts as recent), the index of the last user message, and
+            the indices of the kept assistant messages, newest first
+        """
+        keep = self.config.keep_last_n_assistant_messages
+        # Keeping none of them has always meant keeping all of them
+        limit = keep if keep > 0 else len(messages)
+        assistants: List[int] = []
+        last_user: Optional[int] = None
+        for i in range(len(messages) - 1, -1, -1):
+            msg = messages[i]
+            if isinstance(msg, AssistantResponseLLMMessage):
+                if len(assistants) < limit:
+                    assistants.append(i)
+            elif isinstance(msg, UserInputLLMMessage) and last_user is None:
+                last_user = i
+            if last_user is not None and len(assistants) >= limit:
+                break
+
+        keep_full = set(assistants)
+        if last_user is not None:
+            keep_full.add(last_user)
+        return keep_full or {len(messages)}, last_user, assistants
+
+    def _render(self, msg: LLMMessage, full: bool) -> Optional[Dict[str, Any]]:
+        """Render a message, compacting user and assistant messages unless full."""
+        if not full and isinstance(
+            msg, (AssistantResponseLLMMessage, UserInputLLMMessage)
+        ):
+            return msg.rendered(compact=True)
+        # Other messages (System, AgentInfo, etc.) are always full
+        return msg.rendered()
+
+    def _advance_prefix(self, messages: List[LLMMessage], boundary: int) -> None:
+        """Make the compacted prefix cover exactly messages[:boundary]."""
+        prefix_messages = self._prefix_messages
+        if all(map(operator.is_, prefix_messages, messages)):
+            valid = len(prefix_messages)
+        else:
+            valid = next(
+                i
+                for i, (kept, msg) in enumerate(zip(prefix_messages, messages))
+                if kept is not msg
+            )
+        valid = min(valid, boundary)
+        if valid < len(prefix_messages):
+            self._cut_prefix(valid)
+
+        pinned = _PINNED_TYPES
+        static = LLMMessageStability.STATIC
+        for i in range(len(prefix_messages), boundary):
+            msg = messages[i]
+            rendering = self._render(msg, full=False)
+            size = _rendered_size(rendering) if rendering is not None else 0
+            prefix_messages.append(msg)
+            self._prefix.append(rendering)
+            self._sizes.append(size)
+            self._prefix_tokens += size
+            if msg.stability != static and not isinstance(msg, pinned):
+                self._candidates.append(i)
+                self._extend_span_keys()
+
+    def _cut_prefix(self, length: int) -> None:
+        """Shorten the compacted prefix to its first length messages."""
+        if length < self._drop_end():
+            # The dropped history changed; start over
+            self._reset_prefix()
+            return
+        self._prefix_tokens -= sum(self._sizes[length:])
+        del self._prefix_messages[length:]
+        del self._prefix[length:]
+        del self._sizes[length:]
+        kept = bisect.bisect_left(self._candidates, length)
+        del self._candidates[kept:]
+        del self._span_keys[kept // self.config.summary_span_messages :]
+        self._shortened = min(self._shortened, kept)
+
+    def _extend_span_keys(self) -> None:
+        """Key the newest span of candidates once it is complete."""
+        span = self.config.summary_span_messages
+        if not self.config.summarize or len(self._candidates) % span:
+            return
+        digest = hashlib.sha256(self._span_keys[-1] if self._span_keys else b"")
+        for i in self._candidates[-span:]:
+            digest.update(self._prefix_messages[i].content_digest)
+        self._span_keys.append(digest.digest())
+
+    def _drop_end(self) -> int:
+        """Index just past the newest dropped candidate (0 if none)."""
+        return self._candidates[self._dropped - 1] + 1 if self._dropped else 0
+
+    def _prefix_output(self) -> List[Dict[str, Any]]:
+        """Renderings of the prefix to send, with dropped spans summarized."""
+        drop_end = self._drop_end()
+        if not drop_end:
+            return list(self._prefix)
+        first = self._candidates[0]
+        output = self._prefix[:first]
+        summary = self._summary_rendering()
+        if summary is not None:
+            output.append(summary)
+        output.extend(self._prefix[i] for i in self._pinned_dropped)
+        output.extend(self._prefix[drop_end:])
+        return output
+
+    def _prefix_sources(self) -> List[Optional[int]]:
+        """Prefix index of each rendering _prefix_output returns."""
+        drop_end = self._drop_end()
+        if not drop_end:
+            return list(range(len(self._prefix)))
+        first = self._candidates[0]
+        sources: List[Optional[int]] = list(range(first))
+        if self._summary_rendering() is not None:
+            sources.append(None)
+        sources.extend(self._pinned_dropped)
+        sources.extend(range(drop_end, len(self._prefix)))
+        return sources
+
+    def _summarized_spans(self) -> int:
+        """Number of dropped spans covered by the latest available summary."""
+        dropped_spans = self._dropped // self.config.summary_span_messages
+        for n in range(min(dropped_spans, len(self._span_keys)), 0, -1):
+            if self._span_keys[n - 1] in self._summaries:
+                return n
+        return 0
+
+    def _summary_rendering(self) -> Optional[Dict[str, Any]]:
+        """The message standing in for dropped history, if summarized yet."""
+        summarized_spans = self._summarized_spans()
+        if not summarized_spans:
+            return None
+        return {
+            "role": "user",
+            "content": "*Summary of earlier activity*\n"
+            + self._summaries[self._span_keys[summarized_spans - 1]],
+        }
+
+    def _fit_token_budget(self, tail: List[Optional[Dict[str, Any]]]) -> None:
+        """Shorten and drop older messages until the budget is met.
+
+        Continues from the shortening kept in the prefix, so only history
+        added since the previous call is considered unless the budget is
+        still exceeded. The recent (tail) and pinned messages stay verbatim.
+
+        Args:
+            tail: Renderings of the messages from the oldest fully kept one on
+        """
+        budget = self.config.token_budget
+        tail_tokens = sum(_rendered_size(m) for m in tail if m is not None)
+        tail_tokens += _CONVERSATION_OVERHEAD_TOKENS
+
+        def total() -> int:
+            summary = self._summary_rendering() if self._dropped else None
+            summary_tokens = _rendered_size(summary) if summary is not None else 0
+            return self._prefix_tokens + tail_tokens + summary_tokens
+
+        candidates = self._candidates
+        remaining = total() - budget
+        # Compact, then truncate, the oldest messages not shortened yet
+        while remaining > 0 and self._shortened < len(candidates):
+            i = candidates[self._shortened]
+            self._shortened += 1
+            rendering = self._prefix[i]
+            compact = self._prefix_messages[i].rendered(compact=True)
+            if compact is not None:
+                rendering = compact
+            if rendering is None:
+                continue
+            shorter = _truncate(rendering)
+            size = _rendered_size(shorter)
+            if size < self._sizes[i]:
+                self._prefix[i] = shorter
+                self._prefix_tokens -= self._sizes[i] - size
+                remaining -= self._sizes[i] - size
+                self._sizes[i] = size
+
+        while total() > budget and self._dropped < len(candidates):
+            self._drop_span()
+
+        span = self.config.summary_span_messages
+        if self.config.summarize and self._summarized_spans() < self._dropped // span:
+            self._request_summaries()
+
+        # Once the budget binds, the next call shortens the next candidate
+        if not self._shortened:
+            self._budget_changed_from = None
+        elif self._shortened < len(candidates):
+            self._budget_changed_from = candidates[self._shortened]
+        else:
+            self._budget_changed_from = candidates[-1] + 1
+
+    def _drop_span(self) -> None:
+        """Drop the oldest span of candidates still sent."""
+        candidates = self._candidates
+        start = self._dropped
+        end = min(start + self.config.summary_span_messages, len(candidates))
+        for k in range(start, end):
+            i = candidates[k]
+            self._prefix_tokens -= self._sizes[i]
+            # Pinned messages between this candidate and the next stay
+            following = candidates[k + 1] if k + 1 < end else i + 1
+            self._pinned_dropped.extend(range(i + 1, following))
+        self._dropped = end
+        self._shortened = max(self._shortened, end)
+
+    def _request_summaries(self) -> None:
+        """Start summarizing dropped spans in the background, if not already."""
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        span = self.config.summary_span_messages
+        summarized_spans = self._summarized_spans()
+        spans = [
+            (
+                self._span_keys[n],
+                "\n\n".join(
+                    f"[{msg.role.value}]\n{msg.content}"
+                    for msg in (
+                        self._prefix_messages[i]
+                        for i in self._candidates[n * span : (n + 1) * span]
+                    )
+                ),
+            )
+            for n in range(summarized_spans, self._dropped // span)
+        ]
+        previous = (
+            self._summaries[self._span_keys[summarized_spans - 1]]
+            if summarized_spans
+            else ""
         )
-        if user_indices:
-            keep_full.add(user_indices[-1])
-
-        result = []
-        for i, msg in enumerate(messages):
-            # If it's a message type that supports compaction and not in keep_full, compact it
-            if isinstance(msg, (AssistantResponseLLMMessage, UserInputLLMMessage)):
-                if i in keep_full:
-                    result.append(msg.to_full_message())
-                else:
-                    result.append(msg.to_compact_message())
-            else:
-                # Other messages (System, AgentInfo, etc.) are always full
-                result.append(msg.to_full_message())
+        self._summary_task = loop.create_task(self._summarize_spans(previous, spans))
 
-        return result
+    async def _summarize_spans(
+        self, summary: str, spans: List[Tuple[bytes, str]]
+    ) -> None:
+        """Extend the running summary with each span in turn."""
+        model = playbooks_config.model.summarization
+        try:
+            llm_config = LLMConfig(
+                model=model.name,
+                provider=model.provider,
+                temperature=model.temperature,
+                max_completion_tokens=self.config.summary_max_tokens,
+            )
+            for key, transcript in spans:
+                prompt = [
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {
+                        "role": "user",
+                        "content": f"*Summary so far*\n{summary or '(none)'}\n\n"
+                        f"*New activity*\n{transcript}",
+                    },
+                ]
+                chunks = [
+                    chunk
+                    async for chunk in ensure_async_iterable(
+                        get_completion(
+                            llm_config=llm_config,
+                            messages=prompt,
+                            priority=LLMCallPriority.BACKGROUND,
+                        )
+                    )
+                ]
+                summary = "".join(chunks).strip()
+                self._summaries[key] = summary
+        except Exception as e:
+            # Dropped history stays unsummarized; the next compaction retries
+            logger.warning(f"Context summarization failed: {e}")
+
+    def get_stable_prefix_length(self, messages: List[LLMMessage]) -> int:
+        """Count the leading messages whose rendering survives the next LLM call.
+
+        The next call appends an assistant response and a user message, which
+        pushes the oldest fully kept assistant message and the current user
+        message into compacted form. Once the token budget binds, the next
+        message due to be shortened changes too.
+
+        Args:
+            messages: List of LLMMessage objects, as passed to compact_messages
+
+        Returns:
+            Number of leading messages that will be rendered identically next call
+        """
+        if not self.config.enabled:
+            return len(messages)
+
+        keep = self.config.keep_last_n_assistant_messages
+        _, last_user, assistants = self._recent_messages(messages)
+        changing = [] if last_user is None else [last_user]
+        if keep > 0 and len(assistants) >= keep:
+            changing.append(assistants[-1])
+        if self._budget_changed_from is not None:
+            changing.append(self._budget_changed_from)
+        return min(changing, default=len(messages))
 
 
 # Convenience function for easy integration
@@ -1,9 +1,40 @@
 """Base LLMMessage class for handling LLM messages."""
 
-from typing import Any, Dict, Optional
+import hashlib
+from typing import Any, Dict, Optional, Tuple
 
-from playbooks.core.enums import LLMMessageRole, LLMMessageType
+from playbooks.core.enums import LLMMessageRole, LLMMessageStability, LLMMessageType
 from playbooks.llm.messages.timestamp import get_timestamp
+from playbooks.utils.token_counter import get_token_count
+
+# Digests of recent messages, keyed by (role, type, content length, content
+# hash). Only the str hash (which Python caches on the string) is kept, so the
+# memo never holds on to message contents. Cleared when full.
+_MESSAGE_DIGEST_MEMO: Dict[Tuple[str, Optional[str], int, int], bytes] = {}
+_MESSAGE_DIGEST_MEMO_SIZE = 8192
+
+
+def message_digest(role: str, type: Optional[str], content: str) -> bytes:
+    """Return the sha256 digest of a message's role, type and content.
+
+    Memoized on the content's str hash, so re-digesting an unchanged message
+    costs a dict lookup rather than a pass over its content. Messages
+    rendered from the same LLMMessage share the content string and therefore
+    its cached hash.
+    """
+    memo_key = (role, type, len(content), hash(content))
+    digest = _MESSAGE_DIGEST_MEMO.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for part in (role, type or "", content):
+            encoded = part.encode("utf-8")
+            hasher.update(len(encoded).to_bytes(8, "big"))
+            hasher.update(encoded)
+        digest = hasher.digest()
+        if len(_MESSAGE_DIGEST_MEMO) >= _MESSAGE_DIGEST_MEMO_SIZE:
+            _MESSAGE_DIGEST_MEMO.clear()
+        _MESSAGE_DIGEST_MEMO[memo_key] = digest
+    return digest
 
 
 class LLMMessage:
@@ -18,8 +49,11 @@ class LLMMessage:
         type: The type of message
         timestamp: Relative integer timestamp (elapsed time since program start)
         cached: Whether this message should be cached by the LLM provider
+        stability: How long the rendered message stays unchanged across LLM calls
     """
 
+    stability = LLMMessageStability.SESSION
+
     # Class-level constants for validation
     MAX_CONTENT_SIZE = 100_000  # 100K char limit
     MIN_CONTENT_SIZE = 0  # Allow empty content for some use cases
@@ -63,6 +97,13 @@ class LLMMessage:
         # Cached flag - set later by InterpreterPrompt based on frame position
         self._cached = False
 
+        # Memoized content digest, token counts and renderings, computed on
+        # first use and discarded whenever the content changes
+        self._content_version = 0
+        self._content_digest: Optional[bytes] = None
+        self._token_counts: Dict[Tuple[str, bool], int] = {}
+        self._renderings: Dict[bool, Optional[Dict[str, Any]]] = {}
+
     @staticmethod
     def _validate_content(content: str) -> str:
         """Validate and normalize content.
@@ -192,6 +233,47 @@ class LLMMessage:
         """Get the message timestamp (relative integer)."""
         return self._timestamp
 
+    @property
+    def content_version(self) -> int:
+        """Get a counter that increases whenever the content changes."""
+        self.content  # Subclasses may update the content on access
+        return self._content_version
+
+    def _content_changed(self) -> None:
+        """Discard memos derived from the content after it changed."""
+        self._content_version += 1
+        self._content_digest = None
+        self._token_counts = {}
+        self._renderings = {}
+
+    @property
+    def content_digest(self) -> bytes:
+        """Get the sha256 digest of role, type and content (memoized)."""
+        content = self.content  # Subclasses may invalidate memos on access
+        if self._content_digest is None:
+            self._content_digest = message_digest(
+                self._role.value, self._type.value, content
+            )
+        return self._content_digest
+
+    def token_count(self, model: str = "gpt-4", approximate: bool = False) -> int:
+        """Get the number of tokens in the content (memoized per model).
+
+        Args:
+            model: The model to use for tokenization
+            approximate: Estimate as characters / 4 instead of encoding
+
+        Returns:
+            The number of tokens in the message content
+        """
+        content = self.content
+        key = (model, approximate)
+        count = self._token_counts.get(key)
+        if count is None:
+            count = get_token_count(content, model, approximate)
+            self._token_counts[key] = count
+        return count
+
     @property
     def cached(self) -> bool:
         """Get whether this message should be cached."""
@@ -202,6 +284,8 @@ class LLMMessage:
         """Set whether this message should be cached."""
         if not isinstance(value, bool):
             raise TypeError(f"cached must be a boolean, got {type(value).__name__}")
+        if value != self._cached:
+            self._renderings = {}
         self._cached = value
 
     def to_full_message(self, is_cached: bool = False) -> Dict[str, Any]:
@@ -237,6 +321,26 @@ class LLMMessage:
         # Can be overridden in subclasses for specific compaction strategies
         return self.to_full_message()
 
+    def rendered(self, compact: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the full or compact rendering, memoized until the content changes.
+
+        The rendering is shared by every caller and across LLM calls, so it
+        must not be modified; copy it to add fields such as cache_control.
+
+        Args:
+            compact: Return to_compact_message() instead of to_full_message()
+
+        Returns:
+            The memoized rendering
+        """
+        self.content  # Subclasses may update the content on access
+        try:
+            return self._renderings[compact]
+        except KeyError:
+            rendering = self.to_compact_message() if compact else self.to_full_message()
+            self._renderings[compact] = rendering
+            return rendering
+
     def __repr__(self) -> str:
         """String representation of the message."""
         return f"{self.__class__.__name__}(role={self.role}, type={self.type}, content_length={len(self.content)}, timestamp={self.timestamp})"
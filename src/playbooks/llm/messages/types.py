@@ -1,9 +1,10 @@
 """Clean semantic LLM message types with minimal, maintainable design."""
 
+import functools
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from playbooks.core.enums import LLMMessageRole, LLMMessageType
+from playbooks.core.enums import LLMMessageRole, LLMMessageStability, LLMMessageType
 from playbooks.llm.messages.base import LLMMessage
 from playbooks.state.variables import Artifact
 
@@ -13,27 +14,32 @@ from playbooks.state.variables import Artifact
 class SystemPromptLLMMessage(LLMMessage):
     """System prompts and instructions."""
 
-    def __init__(self) -> None:
-        # Load system prompt from file
-        prompt_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "prompts",
-            "interpreter_run.txt",
-        )
-
-        try:
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                system_prompt = f.read().strip()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"System prompt file not found: {prompt_path}")
+    stability = LLMMessageStability.STATIC
 
+    def __init__(self) -> None:
         super().__init__(
-            content=system_prompt,
+            content=load_system_prompt(),
             role=LLMMessageRole.SYSTEM,
             type=LLMMessageType.SYSTEM_PROMPT,
         )
 
 
+@functools.lru_cache(maxsize=1)
+def load_system_prompt() -> str:
+    """Load the interpreter system prompt, once per process."""
+    prompt_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "prompts",
+        "interpreter_run.txt",
+    )
+
+    try:
+        with open(prompt_path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"System prompt file not found: {prompt_path}")
+
+
 class UserInputLLMMessage(LLMMessage):
     """User inputs and instructions with component-based storage.
 
@@ -123,6 +129,34 @@ class AssistantResponseLLMMessage(LLMMessage):
             role=LLMMessageRole.ASSISTANT,
             type=LLMMessageType.ASSISTANT_RESPONSE,
         )
+        # Chunks of a response still being streamed, joined on first access
+        self._chunks: Optional[List[str]] = None
+        self._joined_chunks = 0
+
+    @property
+    def content(self) -> str:
+        """Get the message content, joining any chunks streamed since last access."""
+        if self._chunks and self._joined_chunks < len(self._chunks):
+            joined = "".join(self._chunks[self._joined_chunks :])
+            # The first chunk replaces the placeholder content
+            self._content = self._content + joined if self._joined_chunks else joined
+            self._joined_chunks = len(self._chunks)
+            self._content_changed()
+        return self._content
+
+    def stream_content(self, chunks: List[str]) -> None:
+        """Take the content from a list of chunks that is still being appended to.
+
+        Streaming a response therefore costs nothing per chunk; the content
+        is only joined when the message is read, and keeps its current
+        (placeholder) value until the first chunk arrives.
+
+        Args:
+            chunks: List the response chunks are appended to
+        """
+        self._chunks = chunks
+        self._joined_chunks = 0
+        self._content_changed()
 
     def to_compact_message(self) -> Dict[str, Any]:
         """Use first two lines (execution_id and recap) for compaction."""
@@ -141,6 +175,8 @@ class AssistantResponseLLMMessage(LLMMessage):
             content: The content to set
         """
         self._content = content
+        self._chunks = None
+        self._content_changed()
 
 
 class PlaybookImplementationLLMMessage(LLMMessage):
@@ -287,6 +323,8 @@ class MeetingLLMMessage(LLMMessage):
 class TriggerInstructionsLLMMessage(LLMMessage):
     """Playbook trigger instructions."""
 
+    stability = LLMMessageStability.STATIC
+
     def __init__(self, content: str) -> None:
         super().__init__(
             content=content,
@@ -298,6 +336,8 @@ class TriggerInstructionsLLMMessage(LLMMessage):
 class AgentInfoLLMMessage(LLMMessage):
     """Current agent information."""
 
+    stability = LLMMessageStability.STATIC
+
     def __init__(self, content: str) -> None:
         super().__init__(
             content=content,
@@ -309,6 +349,8 @@ class AgentInfoLLMMessage(LLMMessage):
 class OtherAgentInfoLLMMessage(LLMMessage):
     """Other available agents information."""
 
+    stability = LLMMessageStability.STATIC
+
     def __init__(self, content: str) -> None:
         super().__init__(
             content=content,
@@ -0,0 +1,132 @@
+"""Placement of provider prompt-cache breakpoints.
+
+Providers with prefix caching (e.g. Anthropic) cache the prompt up to each
+message marked with cache_control, and a later request reuses the longest
+previously written prefix. Breakpoints should therefore sit at the ends of
+the longest prefixes that the next LLM call will send unchanged.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from playbooks.core.enums import LLMMessageStability
+from playbooks.utils.token_counter import approximate_token_count
+
+# Anthropic accepts at most four cache_control markers per request
+MAX_CACHE_BREAKPOINTS = 4
+
+# Prefixes shorter than this are not cached by providers, so marking them is wasted
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def plan_cache_breakpoints(
+    messages: List[Dict[str, Any]],
+    stability: Sequence[LLMMessageStability],
+    segment_ends: Sequence[int] = (),
+    max_breakpoints: int = MAX_CACHE_BREAKPOINTS,
+    min_tokens: int = MIN_CACHEABLE_TOKENS,
+) -> List[int]:
+    """Choose the messages that should carry cache_control markers.
+
+    Breakpoints go, in order of preference, at the end of the static prefix
+    (system prompt and agent information), at the end of the longest stable
+    prefix, and at stable segment ends (call stack frame boundaries) spread
+    evenly in between, so that a growing history still finds a recent
+    cached prefix.
+
+    Args:
+        messages: Rendered messages in LLM API format
+        stability: Stability of each message
+        segment_ends: Message counts at which stable segments end
+        max_breakpoints: Maximum number of markers to place
+        min_tokens: Minimum (approximate) prefix size worth caching
+
+    Returns:
+        Sorted indices of the messages to mark
+    """
+    if not messages or max_breakpoints <= 0:
+        return []
+
+    # Cumulative approximate token counts; prefix_tokens[n] covers messages[:n]
+    prefix_tokens = [0]
+    for message in messages:
+        content = message.get("content")
+        size = approximate_token_count(content) if isinstance(content, str) else 0
+        prefix_tokens.append(prefix_tokens[-1] + size)
+
+    static_end = _leading_run(stability, LLMMessageStability.STATIC)
+    stable_end = _leading_run(stability, LLMMessageStability.SESSION)
+
+    required = [end for end in (static_end, stable_end) if end > 0]
+    optional = [end for end in segment_ends if static_end < end < stable_end]
+
+    chosen: List[int] = []
+    for end in dict.fromkeys(required):
+        if prefix_tokens[end] >= min_tokens and len(chosen) < max_breakpoints:
+            chosen.append(end)
+
+    remaining = max_breakpoints - len(chosen)
+    if remaining > 0 and optional:
+        low, high = prefix_tokens[static_end], prefix_tokens[stable_end]
+        for k in range(1, remaining + 1):
+            target = low + (high - low) * k / (remaining + 1)
+            end = _nearest_segment_end(optional, prefix_tokens, target, chosen)
+            if end is not None and prefix_tokens[end] >= min_tokens:
+                chosen.append(end)
+
+    return sorted(end - 1 for end in chosen)
+
+
+def apply_cache_breakpoints(
+    messages: List[Dict[str, Any]], breakpoints: Sequence[int]
+) -> List[Dict[str, Any]]:
+    """Mark exactly the given messages with cache_control (in place).
+
+    Messages whose marking changes are replaced by marked or unmarked copies
+    rather than modified, since renderings are shared across LLM calls (see
+    LLMMessage.rendered).
+
+    Args:
+        messages: Rendered messages in LLM API format
+        breakpoints: Indices of the messages to mark
+
+    Returns:
+        The same list, for chaining
+    """
+    marked = set(breakpoints)
+    for index, message in enumerate(messages):
+        if index in marked:
+            messages[index] = {**message, "cache_control": {"type": "ephemeral"}}
+        elif "cache_control" in message:
+            messages[index] = {
+                key: value for key, value in message.items() if key != "cache_control"
+            }
+    return messages
+
+
+def _leading_run(
+    stability: Sequence[LLMMessageStability], minimum: LLMMessageStability
+) -> int:
+    """Count leading messages at least as stable as minimum."""
+    count = 0
+    for level in stability:
+        if level < minimum:
+            break
+        count += 1
+    return count
+
+
+def _nearest_segment_end(
+    candidates: List[int],
+    prefix_tokens: List[int],
+    target: float,
+    chosen: List[int],
+) -> Optional[int]:
+    best = None
+    for end in candidates:
+        if end in chosen:
+            continue
+        if best is None or abs(prefix_tokens[end] - target) < abs(
+            prefix_tokens[best] - target
+        ):
+            best = end
+    return best
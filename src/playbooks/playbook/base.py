@@ -1,3 +1,4 @@
+import copy
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional
 
@@ -153,6 +154,27 @@ class Playbook(ABC):
                 instructions.append(trigger.trigger_instruction(namespace))
         return instructions
 
+    def bind(self, agent) -> "Playbook":
+        """Return this playbook bound to an agent instance.
+
+        An agent class holds a single definition of each of its playbooks,
+        shared by all of its instances. Binding makes a shallow copy, so
+        steps, triggers, metadata and code stay shared with the definition
+        by reference. Only attributes the instance assigns afterwards, such
+        as its bound function or ReAct steps added at run time, become its
+        own. Shared attributes must therefore be replaced, never modified in
+        place.
+
+        Args:
+            agent: The agent instance the playbook is bound to
+
+        Returns:
+            Playbook: A copy of this playbook for the agent
+        """
+        bound = copy.copy(self)
+        bound.agent_name = str(agent)
+        return bound
+
     def create_namespace_function(self, agent) -> "Callable":
         """Create a call-through function for cross-playbook calls.
 
@@ -40,7 +40,8 @@ class LLMPlaybook(LocalPlaybook):
 
         for child in h1["children"]:
             if child.get("type") == "h2":
-                playbook = cls.from_h2(child)
+                # Programs loaded from the program cache carry the parsed playbook
+                playbook = child.pop("playbook", None) or cls.from_h2(child)
 
                 # Add call-through wrapper to namespace if agent is available
                 agent = namespace_manager.namespace.get("agent")
@@ -4,12 +4,46 @@ This module provides playbooks that wrap Python functions decorated with
 @playbook, enabling direct execution of Python code as agent actions.
 """
 
+import ast
+import dis
+import functools
 import inspect
+import marshal
+import types
 from typing import Any, Callable, Dict, Optional
 
+from playbooks.utils.versioned_namespace import VersionedNamespace
+
 from .local import LocalPlaybook
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_code_block(code_block: str) -> Dict[str, Any]:
+    functions = {}
+    for item in ast.parse(code_block).body:
+        if isinstance(item, (ast.AsyncFunctionDef, ast.FunctionDef)):
+            functions[item.name] = (ast.unparse(item), item.lineno)
+    return {
+        "code": marshal.dumps(compile(code_block, "<string>", "exec")),
+        "functions": functions,
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def _writes_globals(code: types.CodeType) -> bool:
+    """Whether code, or a function nested in it, assigns or deletes globals."""
+    if any(
+        instruction.opname in ("STORE_GLOBAL", "DELETE_GLOBAL")
+        for instruction in dis.get_instructions(code)
+    ):
+        return True
+    return any(
+        _writes_globals(const)
+        for const in code.co_consts
+        if isinstance(const, types.CodeType)
+    )
+
+
 class PythonPlaybook(LocalPlaybook):
     """Represents a Python playbook created from @playbook decorated functions.
 
@@ -39,11 +73,30 @@ class PythonPlaybook(LocalPlaybook):
                     namespace_manager,
                     child.get("source_file_path"),
                     child.get("line_number"),
+                    # Programs loaded from the program cache carry the compiled block
+                    compiled=child.pop("compiled", None),
                 )
                 playbooks.update(new_playbooks)
 
         return playbooks
 
+    @classmethod
+    def compile_code_block(cls, code_block: str) -> Dict[str, Any]:
+        """Compile a code block once, in a form that can be stored.
+
+        Blocks seen before in this process, such as the built-in playbooks
+        added to every agent class, are not compiled again.
+
+        Args:
+            code_block: Python code containing @playbook decorated functions
+
+        Returns:
+            Dict with the marshaled code object ("code") and, for each function,
+            its source and line number in the block ("functions"). Shared
+            between callers, so not to be modified.
+        """
+        return _compile_code_block(code_block)
+
     @classmethod
     def create_playbooks_from_code_block(
         cls,
@@ -51,17 +104,20 @@ class PythonPlaybook(LocalPlaybook):
         namespace_manager,
         source_file_path: Optional[str] = None,
         source_line_number: Optional[int] = None,
+        compiled: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, "PythonPlaybook"]:
         """Create PythonPlaybook instances from a code block.
 
         Args:
             code_block: Python code containing @playbook decorated functions
             namespace_manager: Namespace manager for execution environment
+            compiled: Result of compile_code_block for code_block, if available
 
         Returns:
             Dict[str, PythonPlaybook]: Dictionary of discovered playbooks
         """
-        import ast
+        if compiled is None:
+            compiled = cls.compile_code_block(code_block)
 
         # Set up the execution environment
         existing_keys = list(namespace_manager.namespace.keys())
@@ -70,32 +126,21 @@ class PythonPlaybook(LocalPlaybook):
 
         # Execute the code block in the isolated namespace
         python_local_namespace = {}
-        exec(code_block, namespace_manager.namespace, python_local_namespace)
+        exec(
+            marshal.loads(compiled["code"]),
+            namespace_manager.namespace,
+            python_local_namespace,
+        )
         namespace_manager.namespace.update(python_local_namespace)
-
-        # Get code for each function
-        function_code = {}
-        items = {}
-        parsed_code = ast.parse(code_block)
-        # debug("Parsed Code: " + str(parsed_code))
-        for item in parsed_code.body:
-            if isinstance(item, ast.AsyncFunctionDef) or isinstance(
-                item, ast.FunctionDef
-            ):
-                function_code[item.name] = ast.unparse(item)
-                items[item.name] = item
+        functions = compiled["functions"]
 
         # Discover all @playbook-decorated functions
         playbooks = cls._discover_playbook_functions(namespace_manager, existing_keys)
         # debug("decorated functions: " + str(playbooks))
         # Add function code to playbooks
         for playbook in playbooks.values():
-            playbook.code = function_code[playbook.name]
+            playbook.code, line_offset = functions[playbook.name]
             playbook.source_file_path = source_file_path
-
-            line_offset = 0
-            if items[playbook.name].lineno is not None:
-                line_offset = items[playbook.name].lineno
             playbook.source_line_number = source_line_number + line_offset
 
         return playbooks
@@ -241,11 +286,27 @@ class PythonPlaybook(LocalPlaybook):
         if not self.func:
             raise ValueError(f"PythonPlaybook {self.name} has no executable function")
 
+        # `global` assignments and imports write to the agent namespace
+        # without going through VersionedNamespace's methods
+        namespace = getattr(self.func, "__globals__", None)
+        if not isinstance(namespace, VersionedNamespace):
+            namespace = None
+        size = len(namespace) if namespace is not None else 0
+        code = getattr(self.func, "__code__", None)
+
         # Execute the function (it may be sync or async)
-        if inspect.iscoroutinefunction(self.func):
-            return await self.func(*args, **kwargs)
-        else:
-            return self.func(*args, **kwargs)
+        try:
+            if inspect.iscoroutinefunction(self.func):
+                return await self.func(*args, **kwargs)
+            else:
+                return self.func(*args, **kwargs)
+        finally:
+            # Most playbooks (Say, SendMessage, ...) never write globals, and
+            # marking them changed would drop the namespace's derived views
+            if namespace is not None and (
+                len(namespace) != size or code is None or _writes_globals(code)
+            ):
+                namespace.mark_changed()
 
     def get_parameters(self) -> Dict[str, Any]:
         """Get the parameters schema for this playbook.
@@ -6,16 +6,20 @@ communication between all system components.
 """
 
 import asyncio
+import functools
+import itertools
 import json
 import logging
 import random
 import re
+from collections import defaultdict, deque
 from pathlib import Path
 
 # Removed threading import - using asyncio only
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Deque, Dict, List, Optional, Set, Type, Union
 
 from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.compilation.program_cache import load_program_ast
 from playbooks.config import config
 from playbooks.core.constants import EXECUTION_FINISHED, HUMAN_AGENT_KLASS
 from playbooks.core.events import (
@@ -24,6 +28,7 @@ from playbooks.core.events import (
     CompiledProgramEvent,
     MessageRoutedEvent,
     MessageSentEvent,
+    ProgramStartupEvent,
     ProgramTerminatedEvent,
 )
 from playbooks.core.exceptions import ExecutionFinished, KlassNotFoundError
@@ -35,6 +40,8 @@ from playbooks.infrastructure.logging.debug_logger import debug
 from playbooks.state.variables import Artifact
 from playbooks.utils.error_utils import log_agent_errors
 from playbooks.utils.langfuse_event_handler import LangfuseEventHandler
+from playbooks.utils.llm_helper import flush_llm_cache
+from playbooks.utils.startup_scheduler import StartupScheduler
 
 from .agents import AIAgent, HumanAgent, RemoteAIAgent
 from .agents.agent_builder import AgentBuilder
@@ -556,6 +563,82 @@ class AgentIdRegistry:
         return str(current_id)
 
 
+class AgentWarmPool:
+    """Agents constructed ahead of use, for classes that opt in.
+
+    An agent class opts in with the ``warm_pool`` metadata key: the number of
+    instances to keep constructed, but not yet registered or started. Taking
+    an agent from the pool schedules its replacement on the event loop, one
+    agent per loop iteration, so bursts of agent creation such as one worker
+    per subtopic skip construction without stalling other tasks.
+
+    Pooled agents hold a provisional ID and get the next agent ID when they
+    are taken, so agent IDs do not depend on when the pool is refilled.
+    """
+
+    def __init__(self, program: "Program") -> None:
+        """Initialize an empty pool.
+
+        Args:
+            program: Program the pooled agents are created for
+        """
+        self.program = program
+        self._agents: Dict[str, Deque[BaseAgent]] = {}
+        self._refilling: Set[str] = set()
+        self._provisional_ids = itertools.count()
+
+    @staticmethod
+    def size(klass: Type[BaseAgent]) -> int:
+        """Number of warm agents to keep for an agent class."""
+        return (getattr(klass, "metadata", None) or {}).get("warm_pool", 0)
+
+    def fill(self, klass: Type[BaseAgent]) -> None:
+        """Construct agents until the pool of klass is full."""
+        agents = self._agents.setdefault(klass.klass, deque())
+        while len(agents) < self.size(klass):
+            agents.append(self._construct(klass))
+
+    def take(self, klass: Type[BaseAgent]) -> Optional[BaseAgent]:
+        """Take a warm agent of klass, if one is available.
+
+        Args:
+            klass: Agent class to take an agent of
+
+        Returns:
+            A constructed agent, or None if the pool of klass is empty
+        """
+        agents = self._agents.get(klass.klass)
+        if not agents:
+            return None
+        agent = agents.popleft()
+        agent.assign_id(self.program.agent_id_registry.get_next_id())
+        if klass.klass not in self._refilling:
+            self._refilling.add(klass.klass)
+            asyncio.get_running_loop().call_soon(self._refill_one, klass)
+        return agent
+
+    def _refill_one(self, klass: Type[BaseAgent]) -> None:
+        agents = self._agents[klass.klass]
+        if self.program.execution_finished:
+            self._refilling.discard(klass.klass)
+            return
+        if len(agents) < self.size(klass):
+            agents.append(self._construct(klass))
+        if len(agents) < self.size(klass):
+            asyncio.get_running_loop().call_soon(self._refill_one, klass)
+        else:
+            self._refilling.discard(klass.klass)
+
+    def _construct(self, klass: Type[BaseAgent]) -> BaseAgent:
+        return self.program.construct_agent(
+            klass, agent_id=f"warm-{next(self._provisional_ids)}"
+        )
+
+    def clear(self) -> None:
+        """Release all pooled agents."""
+        self._agents.clear()
+
+
 class Program(ProgramAgentsCommunicationMixin):
     def __init__(
         self,
@@ -588,6 +671,8 @@ class Program(ProgramAgentsCommunicationMixin):
                 "Either compiled_program_paths or program_content must be provided."
             )
 
+        self._markdown_contents: Optional[List[str]] = None
+
         self._debug_server = None
         self.agent_id_registry = AgentIdRegistry()
         self.meeting_id_registry = MeetingRegistry()
@@ -598,8 +683,9 @@ class Program(ProgramAgentsCommunicationMixin):
         # Agent runtime manages execution with asyncio
         self.runtime = AsyncAgentRuntime(program=self)
 
-        # Lock for agent creation to prevent race conditions
-        self._agent_creation_lock = asyncio.Lock()
+        # Per-class locks for agent creation to prevent race conditions
+        self._agent_creation_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.warm_pool = AgentWarmPool(self)
 
         self.extract_public_json()
         self.parse_metadata()
@@ -626,37 +712,85 @@ class Program(ProgramAgentsCommunicationMixin):
             self._langfuse_handler = LangfuseEventHandler(self.event_bus)
 
     async def initialize(self) -> None:
+        """Create the agent classes and agents, then discover and initialize them.
+
+        Startup runs as a dependency graph: program files are parsed
+        concurrently, and agents discover their playbooks (MCP and remote
+        agents connect here) and initialize concurrently with each other.
+        Startup takes as long as its critical path, which is published with
+        the timeline of every step in a ProgramStartupEvent.
+        """
+        scheduler = StartupScheduler(max_concurrency=config.startup_max_concurrency)
+
         # Create agent classes from AST (requires async for LLM compilation)
+        parse_steps = []
+        for i, markdown_content in enumerate(self.markdown_contents):
+            parse_steps.append(f"parse:{i}")
+            scheduler.add(
+                parse_steps[-1],
+                functools.partial(
+                    self._create_agent_classes, markdown_content, self._source_path(i)
+                ),
+            )
+
+        async def create_agents() -> None:
+            # Merge in file order so later files override earlier ones as before
+            for step in parse_steps:
+                self.agent_klasses.update(scheduler.tasks[step].result)
+            self.agents = [
+                await self.create_agent(klass)
+                for klass in self.agent_klasses.values()
+                if klass.should_create_instance_at_start()
+            ]
+
+        async def register_agents() -> None:
+            self._setup_start_agents()
+            self._schedule_agent_startup(scheduler, after="register")
+
+        scheduler.add("agents", create_agents, depends_on=parse_steps)
+        scheduler.add("register", register_agents, depends_on=["agents"])
+        await scheduler.run()
+
+        self.initialized = True
+        self.event_bus.publish(
+            ProgramStartupEvent(
+                session_id=self.event_bus.session_id,
+                duration=scheduler.duration,
+                critical_path=scheduler.critical_path(),
+                tasks=[task.to_dict() for task in scheduler.tasks.values()],
+            )
+        )
+        logger.debug(
+            f"Program startup took {scheduler.duration:.3f}s, critical path: "
+            f"{' -> '.join(scheduler.critical_path())}"
+        )
+
+    def _source_path(self, index: int) -> Optional[str]:
+        """Original source path of the index-th compiled file, if known."""
         if self.program_content:
             # Using program content directly (no cache file)
-            ast = markdown_to_ast(self.program_content)
-            self.agent_klasses.update(
-                await AgentBuilder.create_agent_classes_from_ast(ast)
-            )
+            return None
+        # Use original source file path for relative path resolution
+        # (e.g., for memory:// MCP server paths)
+        # source_file_paths has one entry per compiled file and points to the original .pb source
+        if self.source_file_paths and index < len(self.source_file_paths):
+            return str(Path(self.source_file_paths[index]).resolve())
+        if self.program_paths and index < len(self.program_paths):
+            return str(Path(self.program_paths[index]).resolve())
+        return None
+
+    async def _create_agent_classes(
+        self, markdown_content: str, source_path: Optional[str]
+    ) -> Dict[str, Type[BaseAgent]]:
+        if self.program_content or not config.program_cache:
+            ast = markdown_to_ast(markdown_content, source_file_path=source_path)
         else:
-            # Using compiled program paths (cache files)
-            for i, markdown_content in enumerate(self.markdown_contents):
-                # Use original source file path for relative path resolution
-                # (e.g., for memory:// MCP server paths)
-                # source_file_paths has one entry per compiled file and points to the original .pb source
-                if self.source_file_paths and i < len(self.source_file_paths):
-                    source_path = str(Path(self.source_file_paths[i]).resolve())
-                elif self.program_paths and i < len(self.program_paths):
-                    source_path = str(Path(self.program_paths[i]).resolve())
-                else:
-                    source_path = None
-
-                ast = markdown_to_ast(markdown_content, source_file_path=source_path)
-                self.agent_klasses.update(
-                    await AgentBuilder.create_agent_classes_from_ast(ast)
-                )
-
-        self.agents = [
-            await self.create_agent(klass)
-            for klass in self.agent_klasses.values()
-            if klass.should_create_instance_at_start()
-        ]
+            # Compiled files are parsed once, later runs load the parsed form
+            ast = load_program_ast(markdown_content, source_file_path=source_path)
+        return await AgentBuilder.create_agent_classes_from_ast(ast)
 
+    def _setup_start_agents(self) -> None:
+        """Set initial state and public.json, add the default human, register agents."""
         # Set initial state variables on all agents
         if self.initial_state:
             for agent in self.agents:
@@ -763,21 +897,23 @@ class Program(ProgramAgentsCommunicationMixin):
 
         self.event_agents_changed()
 
-        # Pass 1: Discover playbooks for all agents in parallel
-        # This ensures all agents (especially MCP/Remote agents) have their playbooks
-        # populated before any agent initializes its system messages.
-        discovery_tasks = []
-        for agent in self.agents:
-            if isinstance(agent, AIAgent):
-                discovery_tasks.append(agent.discover_playbooks())
-        if discovery_tasks:
+    def _schedule_agent_startup(self, scheduler: StartupScheduler, after: str) -> None:
+        """Add the discovery and initialization of every agent to scheduler.
+
+        Discovery of all agents runs in parallel. Each agent initializes as
+        soon as every discovery is done, since its system messages describe
+        the playbooks of all other agents.
+        """
+
+        async def discover(agent: AIAgent) -> None:
             # Individual agent discovery failures should not crash the entire program initialization.
             # This allows for lazy initialization or manual transport setup in tests.
-            await asyncio.gather(*discovery_tasks, return_exceptions=True)
+            try:
+                await agent.discover_playbooks()
+            except Exception as e:
+                logger.debug(f"Failed to discover playbooks of {agent.klass}: {e}")
 
-        # Pass 2: Initialize all agents sequentially
-        # This builds system messages and handles BGN playbooks
-        for agent in self.agents:
+        async def initialize(agent: BaseAgent) -> None:
             try:
                 await agent.initialize()
             except Exception as e:
@@ -785,13 +921,41 @@ class Program(ProgramAgentsCommunicationMixin):
                     f"Failed to initialize agent {agent.klass} ({agent.id}): {e}"
                 )
 
-        self.initialized = True
+        async def fill_warm_pools() -> None:
+            # Pre-spawn agents for classes with a warm pool
+            for klass in self.agent_klasses.values():
+                if AgentWarmPool.size(klass):
+                    self.warm_pool.fill(klass)
+
+        discover_steps = []
+        for agent in self.agents:
+            if isinstance(agent, AIAgent):
+                discover_steps.append(f"discover:{agent.id}")
+                scheduler.add(
+                    discover_steps[-1],
+                    functools.partial(discover, agent),
+                    depends_on=[after],
+                )
+        initialize_steps = []
+        for agent in self.agents:
+            initialize_steps.append(f"initialize:{agent.id}")
+            scheduler.add(
+                initialize_steps[-1],
+                functools.partial(initialize, agent),
+                depends_on=discover_steps or [after],
+            )
+        scheduler.add("warm_pool", fill_warm_pools, depends_on=initialize_steps)
 
     @property
     def markdown_contents(self) -> List[str]:
         if self.program_content:
             return [self.program_content]
-        return [file_utils.read_file(path) for path in self.compiled_program_paths]
+        # Compiled files are read once and shared by public.json extraction and parsing
+        if self._markdown_contents is None:
+            self._markdown_contents = [
+                file_utils.read_file(path) for path in self.compiled_program_paths
+            ]
+        return self._markdown_contents
 
     @property
     def name(self) -> str:
@@ -813,9 +977,10 @@ class Program(ProgramAgentsCommunicationMixin):
         return f"Playbooks: {program_name}"
 
     def event_agents_changed(self) -> None:
+        agents_list = [str(agent) for agent in self.agents]
         for agent in self.agents:
             if isinstance(agent, AIAgent):
-                agent.event_agents_changed()
+                agent.event_agents_changed(agents_list)
 
     async def create_agent(
         self, agent_klass: Union[str, Type[BaseAgent]], **kwargs
@@ -827,11 +992,9 @@ class Program(ProgramAgentsCommunicationMixin):
         else:
             klass = agent_klass
 
-        agent = klass(
-            self.event_bus,
-            self.agent_id_registry.get_next_id(),
-            program=self,
-        )
+        agent = self.warm_pool.take(klass)
+        if agent is None:
+            agent = self.construct_agent(klass)
         agent.kwargs = kwargs
 
         # Agent registration (no locking needed in single-threaded asyncio)
@@ -858,6 +1021,24 @@ class Program(ProgramAgentsCommunicationMixin):
 
         return agent
 
+    def construct_agent(
+        self, klass: Type[BaseAgent], agent_id: Optional[str] = None
+    ) -> BaseAgent:
+        """Construct an agent of klass without registering or starting it.
+
+        Args:
+            klass: Agent class to instantiate
+            agent_id: ID to construct the agent with; a fresh agent ID if None
+
+        Returns:
+            The new agent
+        """
+        return klass(
+            self.event_bus,
+            agent_id or self.agent_id_registry.get_next_id(),
+            program=self,
+        )
+
     async def get_or_create_agent(self, agent_klass: str, **create_kwargs) -> BaseAgent:
         """Get an available agent or create a new one.
 
@@ -882,8 +1063,9 @@ class Program(ProgramAgentsCommunicationMixin):
                 f"Available classes: {list(self.agent_klasses.keys())}"
             )
 
-        # Use lock to prevent race conditions in async context
-        async with self._agent_creation_lock:
+        # Use a per-class lock to prevent race conditions in async context
+        # without serializing the creation of agents of other classes
+        async with self._agent_creation_locks[agent_klass]:
             # Get all agents of this type
             agents = self.agents_by_klass.get(agent_klass, [])
 
@@ -1122,6 +1304,7 @@ class Program(ProgramAgentsCommunicationMixin):
 
         # Stop all agent tasks via runtime
         await self.runtime.stop_all_agents()
+        self.warm_pool.clear()
 
         # Shutdown telemetry handler
         if self._langfuse_handler:
@@ -1130,6 +1313,9 @@ class Program(ProgramAgentsCommunicationMixin):
         # Shutdown debug server if running
         await self.shutdown_debug_server()
 
+        # Persist LLM responses still queued for write-behind cache tiers
+        await flush_llm_cache()
+
     async def start_debug_server(
         self, host: str = "127.0.0.1", port: int = 7529, stop_on_entry: bool = False
     ) -> None:
@@ -5,7 +5,8 @@ state, instruction pointers, and function call nesting during playbook
 execution and debugging.
 """
 
-from typing import Any, Dict, List, Optional
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
 
 from playbooks.core.events import (
     CallStackPopEvent,
@@ -16,6 +17,13 @@ from playbooks.execution.step import PlaybookStep
 from playbooks.infrastructure.event_bus import EventBus
 from playbooks.llm.messages import LLMMessage
 
+T = TypeVar("T")
+
+# Per-task frame lists of call stacks forked for concurrent playbook calls
+_forked_frames: ContextVar[Optional[Dict["CallStack", List["CallStackFrame"]]]] = (
+    ContextVar("forked_call_stack_frames", default=None)
+)
+
 
 class InstructionPointer:
     """Represents a position in a playbook.
@@ -209,13 +217,47 @@ class CallStack:
             event_bus: Event bus for publishing call stack events
             agent_id: ID of the agent owning this call stack
         """
-        self.frames: List[CallStackFrame] = []
+        self._frames: List[CallStackFrame] = []
         self.event_bus = event_bus
         self.agent_id = agent_id
         # Messages that occur outside of playbook execution (top-level)
         # These are included in LLM context when call stack is empty
         self.top_level_llm_messages: List[LLMMessage] = []
 
+    @property
+    def frames(self) -> List[CallStackFrame]:
+        """Frames visible to the current task, innermost last."""
+        forks = _forked_frames.get()
+        if forks is not None and self in forks:
+            return forks[self]
+        return self._frames
+
+    @frames.setter
+    def frames(self, frames: List[CallStackFrame]) -> None:
+        self._frames = frames
+
+    async def run_forked(self, awaitable: Awaitable[T]) -> T:
+        """Await a call on a private fork of this call stack.
+
+        Frames pushed while the call runs are visible only to it, so calls
+        running concurrently in separate tasks never pop or observe each
+        other's frames. Frames already on the stack are shared, so messages
+        the call adds to its caller's frame reach the caller.
+
+        Args:
+            awaitable: The call to run, typically an unawaited playbook call
+
+        Returns:
+            The result of the call
+        """
+        token = _forked_frames.set(
+            {**(_forked_frames.get() or {}), self: list(self.frames)}
+        )
+        try:
+            return await awaitable
+        finally:
+            _forked_frames.reset(token)
+
     def is_empty(self) -> bool:
         """Check if the call stack is empty.
 
@@ -317,6 +359,18 @@ class CallStack:
 
         return messages
 
+    def get_llm_message_segment_ends(self) -> List[int]:
+        """Get the message counts at which top-level and frame messages end.
+
+        Aligned with get_llm_message_objects. A prefix ending at a frame
+        boundary stays unchanged while that frame is on the stack, since new
+        messages are only appended to the frames above it.
+        """
+        ends = [len(self.top_level_llm_messages)]
+        for frame in self.frames:
+            ends.append(ends[-1] + len(frame.llm_messages))
+        return ends
+
     def add_llm_message(self, message: LLMMessage) -> None:
         """Add an LLM message to the top frame, or to top_level_llm_messages if stack is empty.
 
@@ -0,0 +1,311 @@
+"""Offline LLM provider and traffic recorder for load and regression testing.
+
+FakeLLMProvider is registered with litellm as the "playbooks-fake" custom
+provider, so requests to it go through the same litellm and get_completion
+code paths as real providers, without any network access:
+
+- ``playbooks-fake/synthetic`` streams a generated response with configurable
+  time-to-first-token, tokens per second, error rate and 429 bursts.
+- ``playbooks-fake/replay`` plays back a session captured by LLMSessionRecorder,
+  reproducing the recorded chunks and their timing.
+
+Select it like any other model, e.g. in playbooks.toml::
+
+    [model.execution]
+    provider = "playbooks-fake"
+    name = "playbooks-fake/synthetic"
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import litellm
+from litellm import CustomLLM, ModelResponse
+from litellm.types.utils import GenericStreamingChunk
+
+from playbooks.infrastructure.logging.debug_logger import debug
+
+FAKE_LLM_PROVIDER = "playbooks-fake"
+
+# Splits text into whitespace-terminated pieces of roughly one token each
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def recording_key(messages: List[Dict[str, Any]]) -> str:
+    """Key a request by its messages only, so recordings replay under any model."""
+    from playbooks.utils.llm_helper import custom_get_cache_key
+
+    return custom_get_cache_key(model="", messages=messages, temperature=None)
+
+
+class LLMSessionRecorder:
+    """Appends completed LLM calls, with chunk timing, to a JSON Lines file.
+
+    Each line holds the request key, the model, and the response chunks as
+    [seconds since the request was sent, text] pairs. Lines are written in
+    the order calls are recorded.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: List[str] = []
+
+    def record(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        chunks: List[Tuple[float, str]],
+    ) -> None:
+        """Append one call to the recording.
+
+        Args:
+            messages: Messages sent to the provider
+            model: Model that produced the response
+            chunks: (seconds since the request was sent, text) per chunk
+        """
+        self._queue(messages, model, chunks)
+        self._write_pending()
+
+    async def arecord(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        chunks: List[Tuple[float, str]],
+    ) -> None:
+        """Append one call to the recording, writing the file in a worker thread.
+
+        Args:
+            messages: Messages sent to the provider
+            model: Model that produced the response
+            chunks: (seconds since the request was sent, text) per chunk
+        """
+        self._queue(messages, model, chunks)
+        await asyncio.to_thread(self._write_pending)
+
+    def _queue(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        chunks: List[Tuple[float, str]],
+    ) -> None:
+        entry = {
+            "key": recording_key(messages),
+            "model": model,
+            "chunks": [[round(offset, 4), text] for offset, text in chunks],
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._pending.append(line)
+
+    def _write_pending(self) -> None:
+        # Whichever writer runs first writes every queued line, in order
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if lines:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.writelines(lines)
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Load the calls captured by LLMSessionRecorder, in recorded order."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class FakeLLMProvider(CustomLLM):
+    """litellm custom provider serving synthetic or replayed responses."""
+
+    def __init__(
+        self,
+        ttft_s: float = 0.3,
+        tokens_per_s: float = 100.0,
+        response: Optional[str] = None,
+        response_tokens: int = 200,
+        error_rate: float = 0.0,
+        rate_limit_every_s: Optional[float] = None,
+        rate_limit_burst_s: float = 0.0,
+        recording: Optional[List[Dict[str, Any]]] = None,
+        replay_speed: float = 1.0,
+        seed: Optional[int] = None,
+        clock=time.monotonic,
+    ):
+        """Initialize the provider.
+
+        Args:
+            ttft_s: Synthetic time to first token in seconds
+            tokens_per_s: Synthetic generation speed after the first token
+            response: Synthetic response text; generated filler if None
+            response_tokens: Length of the generated filler response
+            error_rate: Probability that a call fails with a server error
+            rate_limit_every_s: Start a burst of 429 errors this often
+            rate_limit_burst_s: Duration of each 429 burst
+            recording: Calls loaded with load_recording, for replay mode
+            replay_speed: Replay time scale; 2.0 replays twice as fast
+            seed: Seed for error injection, for reproducible runs
+            clock: Monotonic clock used to place 429 bursts and pace replays
+        """
+        super().__init__()
+        self.ttft_s = ttft_s
+        self.tokens_per_s = tokens_per_s
+        self.response = response or " ".join(
+            f"token{i % 100}" for i in range(response_tokens)
+        )
+        self.error_rate = error_rate
+        self.rate_limit_every_s = rate_limit_every_s
+        self.rate_limit_burst_s = rate_limit_burst_s
+        self.replay_speed = replay_speed
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._started_at = clock()
+
+        # Replay: exact matches by key, in recorded order, then any unplayed call
+        self._recording = recording or []
+        self._replay_by_key: Dict[str, List[int]] = {}
+        for index, entry in enumerate(self._recording):
+            self._replay_by_key.setdefault(entry["key"], []).append(index)
+        self._replayed: set = set()
+
+    @classmethod
+    def from_config(cls, fake_llm_config: Any) -> "FakeLLMProvider":
+        """Create the provider from the [fake_llm] config section."""
+        recording = (
+            load_recording(fake_llm_config.replay_path)
+            if fake_llm_config.replay_path
+            else None
+        )
+        return cls(
+            ttft_s=fake_llm_config.ttft_s,
+            tokens_per_s=fake_llm_config.tokens_per_s,
+            response=fake_llm_config.response,
+            response_tokens=fake_llm_config.response_tokens,
+            error_rate=fake_llm_config.error_rate,
+            rate_limit_every_s=fake_llm_config.rate_limit_every_s,
+            rate_limit_burst_s=fake_llm_config.rate_limit_burst_s,
+            recording=recording,
+            replay_speed=fake_llm_config.replay_speed,
+            seed=fake_llm_config.seed,
+        )
+
+    async def acompletion(self, model: str, messages: list, *args, **kwargs) -> Any:
+        text = "".join([chunk async for chunk in self._generate(model, messages)])
+        return ModelResponse(
+            model=model,
+            choices=[
+                {
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            usage=self._usage(messages, text),
+        )
+
+    async def astreaming(
+        self, model: str, messages: list, *args, **kwargs
+    ) -> AsyncIterator[GenericStreamingChunk]:
+        chunks = []
+        async for text in self._generate(model, messages):
+            chunks.append(text)
+            yield GenericStreamingChunk(
+                text=text, is_finished=False, finish_reason="", usage=None, index=0
+            )
+        yield GenericStreamingChunk(
+            text="",
+            is_finished=True,
+            finish_reason="stop",
+            usage=self._usage(messages, "".join(chunks)),
+            index=0,
+        )
+
+    async def _generate(self, model: str, messages: list) -> AsyncIterator[str]:
+        self.calls += 1
+        self._maybe_fail(model)
+        if model.endswith("replay"):
+            async for text in self._replay(messages):
+                yield text
+        else:
+            async for text in self._synthesize():
+                yield text
+
+    def _maybe_fail(self, model: str) -> None:
+        if self.rate_limit_every_s and self.rate_limit_burst_s:
+            elapsed = self._clock() - self._started_at
+            if elapsed % self.rate_limit_every_s < self.rate_limit_burst_s:
+                raise litellm.RateLimitError(
+                    message="Synthetic 429 burst",
+                    llm_provider=FAKE_LLM_PROVIDER,
+                    model=model,
+                )
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise litellm.InternalServerError(
+                message="Synthetic server error",
+                llm_provider=FAKE_LLM_PROVIDER,
+                model=model,
+            )
+
+    async def _synthesize(self) -> AsyncIterator[str]:
+        await asyncio.sleep(self.ttft_s)
+        interval = 1.0 / self.tokens_per_s
+        for index, token in enumerate(_TOKEN_PATTERN.findall(self.response)):
+            if index:
+                await asyncio.sleep(interval)
+            yield token
+
+    async def _replay(self, messages: list) -> AsyncIterator[str]:
+        entry = self._next_recorded_call(recording_key(messages))
+        started = self._clock()
+        for offset, text in entry["chunks"]:
+            delay = offset / self.replay_speed - (self._clock() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield text
+
+    def _next_recorded_call(self, key: str) -> Dict[str, Any]:
+        for index in self._replay_by_key.get(key, []):
+            if index not in self._replayed:
+                break
+        else:
+            # Prompts differ from the recording (e.g. timestamps); keep the order
+            index = next(
+                (i for i in range(len(self._recording)) if i not in self._replayed),
+                None,
+            )
+            if index is None:
+                raise litellm.BadRequestError(
+                    message="Replay recording exhausted",
+                    llm_provider=FAKE_LLM_PROVIDER,
+                    model="replay",
+                )
+            debug("Replaying recorded LLM call out of order", key=key, index=index)
+        self._replayed.add(index)
+        return self._recording[index]
+
+    @staticmethod
+    def _usage(messages: list, text: str) -> Dict[str, int]:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        prompt_tokens = (prompt_chars + 3) // 4
+        completion_tokens = (len(text) + 3) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+def register_fake_llm_provider(provider: FakeLLMProvider) -> None:
+    """Route "playbooks-fake/..." models to provider, replacing any previous one."""
+    litellm.custom_provider_map = [
+        entry
+        for entry in litellm.custom_provider_map
+        if entry.get("provider") != FAKE_LLM_PROVIDER
+    ] + [{"provider": FAKE_LLM_PROVIDER, "custom_handler": provider}]
@@ -0,0 +1,415 @@
+"""Tiered cache for LLM responses.
+
+A bounded in-process LRU tier sits in front of a persistent tier (diskcache
+or async Redis), so repeated lookups are served from memory without
+disk/network I/O. Both tiers honor a per-entry TTL, the memory tier is capped in bytes,
+and persisted responses can optionally be zstd-compressed.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+try:
+    from redis.asyncio import Redis as AsyncRedis
+except ImportError:
+    AsyncRedis = None
+
+from playbooks.infrastructure.logging.debug_logger import debug
+
+# Frame header written by every zstd compressor
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@dataclass
+class LLMCacheStats:
+    """Cumulative counters and current size of an LLM response cache."""
+
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    memory_entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.persistent_hits
+
+
+class MemoryLRUCache:
+    """Thread-safe LRU of strings, bounded by approximate size in bytes."""
+
+    def __init__(self, max_bytes: int, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float], int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value for key and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_s: Optional[float] = None) -> None:
+        """Store value, evicting least recently used entries to stay in budget."""
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = self._clock() + ttl_s if ttl_s else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+
+class LLMCacheTier:
+    """Async interface of a persistent LLM cache tier.
+
+    Values are strings or bytes (when compressed). Implementations may batch
+    or defer I/O, but a value passed to aset must be visible to later agets.
+    """
+
+    async def aget(self, key: str) -> Any:
+        """Return the stored value for key, or None."""
+        raise NotImplementedError
+
+    async def aget_many(self, keys: List[str]) -> List[Any]:
+        """Return stored values for keys, None where missing."""
+        return [await self.aget(key) for key in keys]
+
+    async def aset(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        """Store value under key, expiring after ttl_s seconds if given."""
+        raise NotImplementedError
+
+    async def flush(self) -> None:
+        """Wait until deferred writes have been persisted."""
+
+    async def aclose(self) -> None:
+        """Flush deferred writes and release connections."""
+        await self.flush()
+
+
+class DiskCacheTier(LLMCacheTier):
+    """Persistent tier backed by a diskcache FanoutCache.
+
+    diskcache is a blocking SQLite store, so operations run in a worker
+    thread to keep file I/O off the event loop.
+    """
+
+    def __init__(self, fanout_cache: Any):
+        self.cache = fanout_cache
+
+    async def aget(self, key: str) -> Any:
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def aget_many(self, keys: List[str]) -> List[Any]:
+        return await asyncio.to_thread(lambda: [self.cache.get(key) for key in keys])
+
+    async def aset(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.cache.set, key, value, expire=ttl_s)
+
+
+class AsyncRedisCacheTier(LLMCacheTier):
+    """Persistent tier backed by redis.asyncio with batched reads and write-behind.
+
+    Lookups issued in the same event loop iteration (e.g. several agents
+    starting at once) are sent as a single MGET. Writes are queued and
+    flushed in pipelines by a background task, so storing a response never
+    waits on the network.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 16,
+        client_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """Initialize the tier.
+
+        Args:
+            url: Redis connection URL
+            max_connections: Size of the connection pool
+            client_factory: Creates the async client; defaults to redis.asyncio
+        """
+        self.url = url
+        self.max_connections = max_connections
+        self._client_factory = client_factory or self._create_client
+        self._client: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_gets: Dict[str, List[asyncio.Future]] = {}
+        self._pending_sets: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._writing: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._get_task: Optional[asyncio.Task] = None
+        self._set_task: Optional[asyncio.Task] = None
+
+    def _create_client(self) -> Any:
+        if AsyncRedis is None:
+            raise ValueError("LLM cache type 'redis' requires the redis package")
+        return AsyncRedis.from_url(self.url, max_connections=self.max_connections)
+
+    @property
+    def client(self) -> Any:
+        """Client bound to the running event loop (connections are per-loop)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = self._client_factory()
+            self._loop = loop
+        return self._client
+
+    def _buffered_write(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        return self._pending_sets.get(key) or self._writing.get(key)
+
+    async def aget(self, key: str) -> Any:
+        buffered = self._buffered_write(key)
+        if buffered is not None:
+            return buffered[0]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_gets.setdefault(key, []).append(future)
+        if self._get_task is None:
+            # Runs after the current loop iteration, collecting concurrent gets
+            self._get_task = asyncio.create_task(self._flush_gets())
+        return await future
+
+    async def aget_many(self, keys: List[str]) -> List[Any]:
+        return list(await asyncio.gather(*(self.aget(key) for key in keys)))
+
+    async def _flush_gets(self) -> None:
+        pending, self._pending_gets = self._pending_gets, {}
+        self._get_task = None
+        keys = list(pending)
+        try:
+            values = await self.client.mget(keys)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, value in zip(keys, values):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(value)
+
+    async def aset(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        self._pending_sets[key] = (value, ttl_s)
+        if self._set_task is None or self._set_task.done():
+            self._set_task = asyncio.create_task(self._flush_sets())
+
+    async def _flush_sets(self) -> None:
+        while self._pending_sets:
+            self._writing, self._pending_sets = self._pending_sets, {}
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for key, (value, ttl_s) in self._writing.items():
+                        # EX would round sub-second TTLs to 0, which Redis rejects
+                        pipe.set(
+                            key,
+                            value,
+                            px=max(1, int(ttl_s * 1000)) if ttl_s else None,
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                # Losing a cache write is harmless; never fail the LLM call
+                debug(
+                    "Failed to write LLM cache entries to Redis",
+                    error=str(e),
+                    count=len(self._writing),
+                )
+            finally:
+                self._writing = {}
+
+    async def flush(self) -> None:
+        if self._set_task is not None:
+            await self._set_task
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class TieredLLMCache:
+    """LLM response cache with an in-memory LRU tier over a persistent tier.
+
+    Memory hits are served without awaiting I/O; misses fall through to the
+    persistent tier's async interface.
+    """
+
+    def __init__(
+        self,
+        persistent: Optional[Any],
+        memory_max_bytes: int = 0,
+        ttl_s: Optional[float] = None,
+        compression: str = "none",
+    ):
+        """Initialize the cache.
+
+        Args:
+            persistent: Persistent LLMCacheTier, or None for memory only
+            memory_max_bytes: Budget for the in-memory tier; 0 disables it
+            ttl_s: Time-to-live of entries in seconds; None keeps them forever
+            compression: "none" or "zstd" for responses written to the persistent tier
+
+        Raises:
+            ValueError: If compression is unknown or zstd is unavailable
+        """
+        if compression not in ("none", "zstd"):
+            raise ValueError(f"Invalid LLM cache compression: {compression}")
+        if compression == "zstd" and zstd is None:
+            raise ValueError(
+                "LLM cache compression 'zstd' requires the zstandard package "
+                "(pip install zstandard) or Python 3.14+"
+            )
+
+        self.persistent = persistent
+        self.memory = MemoryLRUCache(memory_max_bytes) if memory_max_bytes else None
+        self.ttl_s = ttl_s
+        self.compression = compression
+        self._memory_hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Return the cached response for key, checking memory first."""
+        return (await self.aget_many([key]))[0]
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Return cached responses for keys, fetching memory misses in one batch."""
+        values: List[Optional[str]] = [None] * len(keys)
+        missing = []
+        for index, key in enumerate(keys):
+            value = self.memory.get(key) if self.memory is not None else None
+            if value is not None:
+                self._memory_hits += 1
+                values[index] = value
+            else:
+                missing.append(index)
+
+        if missing and self.persistent is not None:
+            stored_values = await self.persistent.aget_many(
+                [keys[index] for index in missing]
+            )
+            decoded = await self._decode_many(stored_values)
+            for index, value in zip(missing, decoded):
+                if value is None:
+                    continue
+                self._persistent_hits += 1
+                if self.memory is not None:
+                    self.memory.set(keys[index], value, self.ttl_s)
+                values[index] = value
+
+        self._misses += sum(1 for value in values if value is None)
+        return values
+
+    async def aget_longest_prefix(
+        self, prefix_keys: List[str]
+    ) -> Tuple[int, Optional[str]]:
+        """Find the longest prefix of a request that has a cached value.
+
+        Args:
+            prefix_keys: Keys of successively longer prefixes, as returned by
+                get_cache_key_prefixes
+
+        Returns:
+            (index into prefix_keys, value), or (-1, None) if nothing is cached
+        """
+        values = await self.aget_many(prefix_keys)
+        for index in range(len(values) - 1, -1, -1):
+            if values[index] is not None:
+                return index, values[index]
+        return -1, None
+
+    async def aset(self, key: str, value: str) -> None:
+        """Store a response in both tiers."""
+        if self.memory is not None:
+            self.memory.set(key, value, self.ttl_s)
+        if self.persistent is not None:
+            if self.compression == "zstd":
+                # Compression is CPU work; keep it off the event loop
+                stored = await asyncio.to_thread(self._encode, value)
+            else:
+                stored = value
+            await self.persistent.aset(key, stored, self.ttl_s)
+
+    async def flush(self) -> None:
+        """Wait until deferred writes to the persistent tier have completed."""
+        if self.persistent is not None:
+            await self.persistent.flush()
+
+    def _encode(self, value: str) -> Any:
+        if self.compression == "zstd":
+            return zstd.compress(value.encode("utf-8"))
+        return value
+
+    @classmethod
+    async def _decode_many(cls, stored_values: List[Any]) -> List[Optional[str]]:
+        """Decode persisted values, decompressing in a worker thread if needed."""
+        if any(isinstance(stored, (bytes, bytearray)) for stored in stored_values):
+            return await asyncio.to_thread(
+                lambda: [
+                    cls._decode(stored) if stored is not None else None
+                    for stored in stored_values
+                ]
+            )
+        return list(stored_values)
+
+    @staticmethod
+    def _decode(stored: Any) -> str:
+        """Decode a persisted value, whichever compression it was written with."""
+        if isinstance(stored, (bytes, bytearray)):
+            if stored.startswith(ZSTD_MAGIC) and zstd is not None:
+                stored = zstd.decompress(stored)
+            return stored.decode("utf-8")
+        return stored
+
+    def stats(self) -> LLMCacheStats:
+        """Return a snapshot of hit/miss/eviction counters and memory usage."""
+        return LLMCacheStats(
+            memory_hits=self._memory_hits,
+            persistent_hits=self._persistent_hits,
+            misses=self._misses,
+            evictions=self.memory.evictions if self.memory else 0,
+            memory_entries=len(self.memory) if self.memory else 0,
+            memory_bytes=self.memory.size_bytes if self.memory else 0,
+        )
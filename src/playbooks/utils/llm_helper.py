@@ -3,7 +3,9 @@
 This module provides a unified interface for LLM interactions, including:
 - Streaming and non-streaming completion requests
 - Automatic retry logic for rate limits and overloads
-- LLM response caching (disk or Redis)
+- Process-wide scheduling with RPM/TPM limits and priority lanes
+- Tiered LLM response caching (in-memory LRU over disk or Redis)
+- Coalescing of identical in-flight requests into one provider call
 - Event-based telemetry integration
 - Message preprocessing and consolidation
 """
@@ -13,42 +15,58 @@ import hashlib
 import json
 import logging
 import os
-import queue
+import random
 import tempfile
-import threading
 import time
+from contextlib import aclosing, nullcontext
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Iterator, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 import litellm
-from litellm import completion, get_supported_openai_params
+from litellm import acompletion, completion, get_supported_openai_params
 
 try:
     from diskcache import FanoutCache
 except ImportError:
     FanoutCache = None
 
-try:
-    from redis import Redis
-except ImportError:
-    Redis = None
 
 from playbooks.config import config
 from playbooks.core.constants import SYSTEM_PROMPT_DELIMITER
-from playbooks.core.enums import LLMMessageRole
-from playbooks.core.events import LLMCallEndedEvent, LLMCallStartedEvent
+from playbooks.core.enums import LLMCallPriority, LLMMessageRole
+from playbooks.core.events import (
+    LLMCacheStatsEvent,
+    LLMCallEndedEvent,
+    LLMCallStartedEvent,
+)
 from playbooks.core.exceptions import (
     CompilationError,
     VendorAPIOverloadedError,
     VendorAPIRateLimitError,
 )
 from playbooks.infrastructure.logging.debug_logger import debug
+from playbooks.llm.prompt_cache import MAX_CACHE_BREAKPOINTS
 from playbooks.llm.messages import (
     LLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.llm.messages.base import message_digest
 
+from .llm_cache import AsyncRedisCacheTier, DiskCacheTier, TieredLLMCache
+from .fake_llm import FakeLLMProvider, LLMSessionRecorder, register_fake_llm_provider
 from .llm_config import LLMConfig
+from .llm_scheduler import LLMScheduler
 from .playbooks_lm_handler import PlaybooksLMHandler
 from .token_counter import get_messages_token_count, get_token_count
 
@@ -67,8 +85,9 @@ litellm.drop_params = True
 # Initialize the Playbooks-LM handler
 playbooks_handler = PlaybooksLMHandler()
 
-# Store the original completion function
+# Store the original completion functions
 _original_completion = completion
+_original_acompletion = acompletion
 
 
 def ensure_async_iterable(obj: Any):
@@ -92,6 +111,30 @@ def ensure_async_iterable(obj: Any):
     raise TypeError(f"Expected async iterable or iterable, got {type(obj).__name__}")
 
 
+def _log_llm_call(kwargs: dict) -> None:
+    """Log an outgoing LLM call when verbose mode is enabled.
+
+    Helps diagnose auth issues without leaking the full API key.
+
+    Args:
+        kwargs: Keyword arguments about to be passed to litellm
+    """
+    if os.getenv("LLM_SET_VERBOSE", "False").lower() != "true":
+        return
+
+    api_key_preview = kwargs.get("api_key", "MISSING")
+    if api_key_preview and api_key_preview != "MISSING":
+        api_key_preview = (
+            api_key_preview[:8] + "..." if len(api_key_preview) > 8 else "short"
+        )
+    debug(
+        "LLM Call",
+        model=kwargs.get("model", ""),
+        api_base=kwargs.get("api_base", "default"),
+        api_key_preview=api_key_preview,
+    )
+
+
 def completion_with_preprocessing(*args: Any, **kwargs: Any) -> Any:
     """Wrapper for litellm.completion that applies preprocessing for playbooks-lm models.
 
@@ -105,32 +148,35 @@ def completion_with_preprocessing(*args: Any, **kwargs: Any) -> Any:
     Returns:
         Response from litellm.completion
     """
-    model = kwargs.get("model", "")
-
-    # Debug: log the call to help diagnose auth issues when verbose mode is enabled
-    if os.getenv("LLM_SET_VERBOSE", "False").lower() == "true":
-        api_key_preview = kwargs.get("api_key", "MISSING")
-        if api_key_preview and api_key_preview != "MISSING":
-            api_key_preview = (
-                api_key_preview[:8] + "..." if len(api_key_preview) > 8 else "short"
-            )
-        debug(
-            "LLM Call",
-            model=model,
-            api_base=kwargs.get("api_base", "default"),
-            api_key_preview=api_key_preview,
-        )
+    _log_llm_call(kwargs)
 
     # Call the original completion function
     return _original_completion(*args, **kwargs)
 
 
+async def acompletion_with_preprocessing(*args: Any, **kwargs: Any) -> Any:
+    """Async counterpart of completion_with_preprocessing for litellm.acompletion.
+
+    Args:
+        *args: Positional arguments passed to litellm.acompletion
+        **kwargs: Keyword arguments passed to litellm.acompletion
+
+    Returns:
+        Response from litellm.acompletion (an async chunk stream when stream=True)
+    """
+    _log_llm_call(kwargs)
+
+    return await _original_acompletion(*args, **kwargs)
+
+
 # Replace litellm's completion function with our wrapper
 litellm.completion = completion_with_preprocessing
 completion = completion_with_preprocessing
+litellm.acompletion = acompletion_with_preprocessing
+acompletion = acompletion_with_preprocessing
 
 # Initialize cache if enabled
-cache = None
+cache: Optional[TieredLLMCache] = None
 
 # Load cache configuration from config system with environment fallback
 llm_cache_enabled = config.llm_cache.enabled
@@ -142,16 +188,112 @@ if llm_cache_enabled:
         cache_dir = (
             llm_cache_path or tempfile.TemporaryDirectory(prefix="llm_cache_").name
         )
-        cache = FanoutCache(directory=cache_dir, timeout=60)
+        disk_cache_settings = (
+            {"size_limit": config.llm_cache.max_bytes}
+            if config.llm_cache.max_bytes
+            else {}
+        )
+        persistent_cache = DiskCacheTier(
+            FanoutCache(directory=cache_dir, timeout=60, **disk_cache_settings)
+        )
 
     elif llm_cache_type == "redis":
         redis_url = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
-        cache = Redis.from_url(redis_url)
+        persistent_cache = AsyncRedisCacheTier(
+            redis_url, max_connections=config.llm_cache.redis_max_connections
+        )
         debug("Using LLM cache", redis_url=redis_url)
 
     else:
         raise ValueError(f"Invalid LLM cache type: {llm_cache_type}")
 
+    cache = TieredLLMCache(
+        persistent_cache,
+        memory_max_bytes=config.llm_cache.memory_max_bytes,
+        ttl_s=config.llm_cache.ttl_s,
+        compression=config.llm_cache.compression,
+    )
+
+# Process-wide admission control for provider calls (rate limits and priorities)
+llm_scheduler: Optional[LLMScheduler] = (
+    LLMScheduler(config.llm_scheduler) if config.llm_scheduler.enabled else None
+)
+
+# Offline stand-in provider for "playbooks-fake/..." models, and an optional
+# recorder capturing real traffic for it to replay
+register_fake_llm_provider(FakeLLMProvider.from_config(config.fake_llm))
+llm_recorder: Optional[LLMSessionRecorder] = (
+    LLMSessionRecorder(config.fake_llm.record_path)
+    if config.fake_llm.record_path
+    else None
+)
+
+# Token counts only feed telemetry and rate limiting, so they may be estimated
+if config.token_count_mode not in ("exact", "approximate"):
+    raise ValueError(f"Invalid token count mode: {config.token_count_mode}")
+approximate_token_counts = config.token_count_mode == "approximate"
+
+
+# Message keys that do not change the model's response and are left out of cache keys
+_CACHE_NEUTRAL_MESSAGE_KEYS = frozenset({"cache_control"})
+
+
+def _cache_key_message_digest(message: Any) -> bytes:
+    """Return the digest of one message for cache keying.
+
+    LLMMessage objects use their memoized digest. Dicts with only role, type
+    and content use the shared message_digest memo; anything else (tool calls,
+    names, multi-part content) is digested from its canonical JSON.
+    """
+    if isinstance(message, LLMMessage):
+        return message.content_digest
+
+    content = message.get("content")
+    extra_keys = message.keys() - {"role", "type", "content"}
+    if isinstance(content, str) and extra_keys <= _CACHE_NEUTRAL_MESSAGE_KEYS:
+        return message_digest(message.get("role", ""), message.get("type"), content)
+
+    canonical = {
+        k: v for k, v in message.items() if k not in _CACHE_NEUTRAL_MESSAGE_KEYS
+    }
+    return hashlib.sha256(
+        json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).digest()
+
+
+def _cache_key_params_digest(kwargs: Dict[str, Any]) -> bytes:
+    """Return the digest of the request parameters that affect the response."""
+    params = {
+        "model": kwargs.get("model", ""),
+        "temperature": kwargs.get("temperature", 0.2),
+        "logit_bias": kwargs.get("logit_bias", {}),
+    }
+    return hashlib.sha256(
+        json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).digest()
+
+
+def get_cache_key_prefixes(**kwargs) -> List[str]:
+    """Return the cache key of every message prefix of a request.
+
+    Keys are a rolling hash: the request parameters are hashed once and each
+    message's memoized digest is folded in, so keying a long conversation
+    costs one small hash per message instead of re-serializing every message.
+    prefixes[i] keys the request truncated to its first i + 1 messages.
+
+    Args:
+        **kwargs: The completion request parameters
+
+    Returns:
+        One key per message; empty if there are no messages
+    """
+    rolling = _cache_key_params_digest(kwargs)
+    prefixes = []
+    for message in kwargs.get("messages", []):
+        rolling = hashlib.sha256(rolling + _cache_key_message_digest(message)).digest()
+        prefixes.append(rolling.hex()[:32])
+    return prefixes
+
 
 def custom_get_cache_key(**kwargs) -> str:
     """Generate a deterministic cache key based on request parameters.
@@ -162,27 +304,87 @@ def custom_get_cache_key(**kwargs) -> str:
     Returns:
         A unique hash string to use as cache key
     """
-    # Create a deterministic representation of the cache key components
-    cache_components = {
-        "model": kwargs.get("model", ""),
-        "messages": kwargs.get("messages", []),
-        "temperature": kwargs.get("temperature", 0.2),
-        "logit_bias": kwargs.get("logit_bias", {}),
-    }
+    prefixes = get_cache_key_prefixes(**kwargs)
+    if prefixes:
+        return prefixes[-1]
+    return _cache_key_params_digest(kwargs).hex()[:32]
+
+
+# Request arguments that do not change the response text
+_COALESCING_NEUTRAL_KWARGS = frozenset(
+    {"api_key", "messages", "metadata", "stream", "stream_options"}
+)
 
-    # Use json.dumps with sort_keys=True for deterministic serialization
-    key_str = json.dumps(cache_components, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(key_str.encode("utf-8")).hexdigest()[:32]
+
+def get_coalescing_key(cache_key: str, completion_kwargs: Dict[str, Any]) -> str:
+    """Key identifying requests that can share one in-flight provider call.
+
+    The cache key only covers the messages, model, temperature and logit_bias.
+    Any other argument (max_completion_tokens, reasoning_effort, tools,
+    response_format, stop, ...) can change the response, so all of them are
+    folded in.
+
+    Args:
+        cache_key: Key computed by custom_get_cache_key
+        completion_kwargs: Dictionary of arguments for litellm.acompletion
+
+    Returns:
+        A hash string; equal only for requests that get the same response
+    """
+    params = {
+        k: v
+        for k, v in completion_kwargs.items()
+        if k not in _COALESCING_NEUTRAL_KWARGS
+    }
+    digest = hashlib.sha256(cache_key.encode("utf-8"))
+    digest.update(
+        json.dumps(params, sort_keys=True, separators=(",", ":"), default=repr).encode(
+            "utf-8"
+        )
+    )
+    return digest.hexdigest()[:32]
 
 
 T = TypeVar("T")
 
+# Errors that indicate a transient provider problem worth retrying
+RETRYABLE_LLM_ERRORS = (
+    VendorAPIOverloadedError,
+    VendorAPIRateLimitError,
+    litellm.RateLimitError,
+    litellm.InternalServerError,
+    litellm.ServiceUnavailableError,
+    litellm.APIConnectionError,
+    litellm.Timeout,
+)
+
+
+def _backoff_delay(attempt: int, base_delay: float) -> float:
+    """Compute an exponential backoff delay with jitter.
+
+    Uses "equal jitter": half of the exponential delay is fixed and the other
+    half is random, so concurrent callers that were throttled together do not
+    all retry at the same instant.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        base_delay: Initial delay between retries in seconds
+
+    Returns:
+        Delay in seconds before the next attempt
+    """
+    delay = base_delay * (2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
 
 def retry_on_overload(
     max_retries: int = 3, base_delay: float = 1.0
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator that retries a function on API overload or rate limit errors with exponential backoff.
 
+    Works with both regular and async functions. Async functions back off with
+    asyncio.sleep so that a throttled call never blocks the event loop.
+
     Args:
         max_retries: Maximum number of retry attempts
         base_delay: Initial delay between retries in seconds
@@ -192,26 +394,33 @@ def retry_on_overload(
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+                for attempt in range(max_retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except RETRYABLE_LLM_ERRORS:
+                        if attempt == max_retries - 1:
+                            # Last attempt, re-raise the exception
+                            raise
+
+                        await asyncio.sleep(_backoff_delay(attempt, base_delay))
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except (
-                    VendorAPIOverloadedError,
-                    VendorAPIRateLimitError,
-                    litellm.RateLimitError,
-                    litellm.InternalServerError,
-                    litellm.ServiceUnavailableError,
-                    litellm.APIConnectionError,
-                    litellm.Timeout,
-                ):
+                except RETRYABLE_LLM_ERRORS:
                     if attempt == max_retries - 1:
                         # Last attempt, re-raise the exception
                         raise
 
-                    delay = base_delay * (2**attempt)
-                    time.sleep(delay)
+                    time.sleep(_backoff_delay(attempt, base_delay))
                     continue
             return func(*args, **kwargs)  # This line should never be reached
 
@@ -220,23 +429,18 @@ def retry_on_overload(
     return decorator
 
 
-@retry_on_overload()
-def _make_completion_request(completion_kwargs: dict) -> str:
-    """Make a non-streaming completion request to the LLM with automatic retries on overload.
+def _extract_completion_content(response: Any) -> str:
+    """Extract and validate the text of a non-streaming completion response.
 
     Args:
-        completion_kwargs: Dictionary of arguments for litellm.completion
+        response: Response object returned by litellm.completion/acompletion
 
     Returns:
         Full response text from the LLM
 
     Raises:
         CompilationError: If response is truncated due to token limit or content is empty
-        VendorAPIOverloadedError: If API is overloaded after retries
-        VendorAPIRateLimitError: If rate limit exceeded after retries
-        litellm exceptions: Various litellm exceptions if request fails
     """
-    response = completion(**completion_kwargs)
     choice = response["choices"][0]
     finish_reason = choice.get("finish_reason")
     content = choice["message"]["content"]
@@ -260,112 +464,378 @@ def _make_completion_request(completion_kwargs: dict) -> str:
     return content
 
 
-def _make_completion_request_stream_sync(completion_kwargs: dict) -> Iterator[str]:
-    """Synchronous helper that performs the actual streaming.
+@retry_on_overload()
+def _make_completion_request(completion_kwargs: dict) -> str:
+    """Make a non-streaming completion request to the LLM with automatic retries on overload.
+
+    Blocks the calling thread; async code should use _amake_completion_request.
+
+    Args:
+        completion_kwargs: Dictionary of arguments for litellm.completion
+
+    Returns:
+        Full response text from the LLM
+
+    Raises:
+        CompilationError: If response is truncated due to token limit or content is empty
+        VendorAPIOverloadedError: If API is overloaded after retries
+        VendorAPIRateLimitError: If rate limit exceeded after retries
+        litellm exceptions: Various litellm exceptions if request fails
+    """
+    return _extract_completion_content(completion(**completion_kwargs))
+
+
+@dataclass
+class PromptCacheUsage:
+    """Prompt-cache token counts reported by the provider for one LLM call."""
+
+    read_tokens: int = 0
+    write_tokens: int = 0
+
+    def record(self, usage: Any) -> None:
+        """Add the cache counters of a litellm usage object or dict, if present."""
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+
+        # Anthropic reports reads and writes; OpenAI-style providers only reads
+        read = usage.get("cache_read_input_tokens")
+        if read is None:
+            read = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        self.read_tokens += read or 0
+        self.write_tokens += usage.get("cache_creation_input_tokens") or 0
+
+
+def _response_usage(response: Any) -> Any:
+    if isinstance(response, dict):
+        return response.get("usage")
+    return getattr(response, "usage", None)
+
+
+@retry_on_overload()
+async def _amake_completion_request(
+    completion_kwargs: dict, cache_usage: Optional[PromptCacheUsage] = None
+) -> str:
+    """Make a non-streaming completion request without blocking the event loop.
+
+    Args:
+        completion_kwargs: Dictionary of arguments for litellm.acompletion
+        cache_usage: Receives the provider's prompt-cache token counts, if given
+
+    Returns:
+        Full response text from the LLM
+
+    Raises:
+        CompilationError: If response is truncated due to token limit or content is empty
+        VendorAPIOverloadedError: If API is overloaded after retries
+        VendorAPIRateLimitError: If rate limit exceeded after retries
+        litellm exceptions: Various litellm exceptions if request fails
+    """
+    response = await acompletion(**completion_kwargs)
+    content = _extract_completion_content(response)
+    if cache_usage is not None:
+        cache_usage.record(_response_usage(response))
+    return content
+
+
+async def _make_completion_request_stream(
+    completion_kwargs: dict, cache_usage: Optional[PromptCacheUsage] = None
+) -> AsyncIterator[str]:
+    """Make a streaming completion request to the LLM without blocking the event loop.
+
+    Streams through litellm's native async client, so each chunk is delivered
+    as soon as the provider sends it and no thread is held per stream.
+
+    Retries with exponential backoff on overload/rate-limit errors raised
+    before the first chunk arrives. Errors after output has been yielded are
+    re-raised, since retrying would duplicate already-consumed chunks.
+
+    Args:
+        completion_kwargs: Dictionary of arguments for litellm.acompletion
+        cache_usage: Receives the provider's prompt-cache token counts, if given
 
-    This runs in a thread pool to avoid blocking the event loop.
+    Yields:
+        Response text chunks as they arrive from the LLM
+
+    Raises:
+        VendorAPIOverloadedError: If API is overloaded after retries
+        VendorAPIRateLimitError: If rate limit exceeded after retries
+        litellm exceptions: Various litellm exceptions if request fails
     """
     max_retries = 5
     base_delay = 1.0
 
     for attempt in range(max_retries):
+        yielded_any = False
         try:
-            response = completion(**completion_kwargs)
-
-            # Try to get the first chunk to trigger any immediate exceptions
-            first_chunk = None
-            response_iter = iter(response)
-            try:
-                first_chunk = next(response_iter)
-            except StopIteration:
-                # Empty response
-                return
-
-            # Yield the first chunk
-            content = first_chunk.choices[0].delta.content
-            if content is not None:
-                yield content
-
-            # Stream the rest
-            for chunk in response_iter:
+            response = await acompletion(**completion_kwargs)
+
+            async for chunk in response:
+                # The usage-only chunk at the end of a stream has no choices
+                if cache_usage is not None:
+                    cache_usage.record(getattr(chunk, "usage", None))
+                if not chunk.choices:
+                    continue
                 content = chunk.choices[0].delta.content
                 if content is not None:
+                    yielded_any = True
                     yield content
 
             return  # Success, exit retry loop
 
-        except (
-            VendorAPIOverloadedError,
-            VendorAPIRateLimitError,
-            litellm.RateLimitError,
-            litellm.InternalServerError,
-            litellm.ServiceUnavailableError,
-            litellm.APIConnectionError,
-            litellm.Timeout,
-        ):
-            if attempt == max_retries - 1:
-                # Last attempt, re-raise the exception
+        except RETRYABLE_LLM_ERRORS:
+            if yielded_any or attempt == max_retries - 1:
                 raise
 
-            delay = base_delay * (2**attempt)
-            time.sleep(delay)
+            await asyncio.sleep(_backoff_delay(attempt, base_delay))
             continue
 
 
-async def _make_completion_request_stream(completion_kwargs: dict):
-    """Make a streaming completion request to the LLM without blocking the event loop.
+def _reserve_llm_slot(
+    model: str, provider: str, tokens: int, priority: LLMCallPriority
+) -> AsyncContextManager:
+    """Reserve a slot in the process-wide LLM scheduler, if it is enabled."""
+    if llm_scheduler is None:
+        return nullcontext()
+    return llm_scheduler.reserve(model, provider, tokens, priority)
+
 
-    Runs the synchronous streaming in a thread pool to keep the event loop responsive.
+async def _completion_chunks(
+    completion_kwargs: dict,
+    stream: bool,
+    provider: str = "",
+    input_tokens: int = 0,
+    priority: LLMCallPriority = LLMCallPriority.AGENT,
+    cache_usage: Optional[PromptCacheUsage] = None,
+    chunk_offsets: Optional[List[float]] = None,
+) -> AsyncIterator[str]:
+    """Yield the provider response as chunks (a single chunk when not streaming).
+
+    The call waits for a scheduler slot before it is sent and holds the slot
+    until the response is complete.
 
     Args:
-        completion_kwargs: Dictionary of arguments for litellm.completion
+        completion_kwargs: Dictionary of arguments for litellm.acompletion
+        stream: Whether to stream the response
+        provider: Provider of the model, for provider-wide rate limits
+        input_tokens: Estimated input tokens, for tokens-per-minute limits
+        priority: Scheduler lane for the call
+        cache_usage: Receives the provider's prompt-cache token counts, if given
+        chunk_offsets: Receives the seconds from sending the request to
+            receiving each chunk, if given
 
     Yields:
-        Response text chunks as they arrive from the LLM
+        Response text chunks
+    """
+    async with _reserve_llm_slot(
+        completion_kwargs["model"], provider, input_tokens, priority
+    ):
+        sent = time.perf_counter()
+        if stream:
+            async for chunk in _make_completion_request_stream(
+                completion_kwargs, cache_usage
+            ):
+                if chunk_offsets is not None:
+                    chunk_offsets.append(time.perf_counter() - sent)
+                yield chunk
+        else:
+            response = await _amake_completion_request(completion_kwargs, cache_usage)
+            if chunk_offsets is not None:
+                chunk_offsets.append(time.perf_counter() - sent)
+            yield response
 
-    Raises:
-        VendorAPIOverloadedError: If API is overloaded after retries
-        VendorAPIRateLimitError: If rate limit exceeded after retries
-        litellm exceptions: Various litellm exceptions if request fails
+
+async def _store_in_cache(
+    cache_key: str,
+    response: str,
+    response_validator: Optional[Callable[[str], bool]] = None,
+) -> None:
+    """Store a completed LLM response in the cache, if caching is enabled.
+
+    Only non-empty responses that pass the optional validator are stored.
+    Cache failures are logged and otherwise ignored.
+
+    Args:
+        cache_key: Key computed by custom_get_cache_key
+        response: Full response text
+        response_validator: Optional function returning True for cacheable responses
     """
-    # Create a queue to transfer chunks from thread to async code
-    chunk_queue = queue.Queue()
-    exception_holder = []
+    if not llm_cache_enabled or cache is None or not response:
+        return
 
-    def _stream_in_thread():
-        """Run the synchronous streaming in a background thread."""
+    # Validate response before caching if validator provided
+    if response_validator is not None and not response_validator(response):
+        debug(
+            "Response validation failed - not caching invalid response",
+            cache_key=cache_key,
+        )
+        return
+
+    try:
+        await cache.aset(cache_key, response)
+    except Exception as cache_error:
+        # Log cache error but don't fail the LLM call
+        debug(
+            "Failed to cache LLM response - continuing without caching",
+            error=str(cache_error),
+            cache_key=cache_key,
+        )
+
+
+async def flush_llm_cache() -> None:
+    """Wait for write-behind cache writes (e.g. to Redis) to be persisted."""
+    if cache is not None:
         try:
-            for chunk in _make_completion_request_stream_sync(completion_kwargs):
-                chunk_queue.put(("chunk", chunk))
-            chunk_queue.put(("done", None))
-        except Exception as e:
-            exception_holder.append(e)
-            chunk_queue.put(("error", e))
-
-    # Start streaming in background thread
-    stream_thread = threading.Thread(target=_stream_in_thread, daemon=True)
-    stream_thread.start()
-
-    # Yield chunks as they arrive, without blocking the event loop
-    while True:
-        # Check queue in thread pool to avoid blocking
+            await cache.flush()
+        except Exception as cache_error:
+            debug("Failed to flush LLM cache", error=str(cache_error))
+
+
+def _publish_cache_stats(event_bus: Any, session_id: str, agent_id: str) -> None:
+    """Publish the LLM cache's hit/miss/eviction counters to the event bus."""
+    stats = cache.stats()
+    event_bus.publish(
+        LLMCacheStatsEvent(
+            session_id=session_id,
+            agent_id=agent_id,
+            memory_hits=stats.memory_hits,
+            persistent_hits=stats.persistent_hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            memory_entries=stats.memory_entries,
+            memory_bytes=stats.memory_bytes,
+        )
+    )
+
+
+class SharedCompletion:
+    """A single provider call whose output is fanned out to identical requests.
+
+    The provider call runs in its own task and records every chunk. Each
+    subscriber replays the chunks received so far and then tails the live
+    stream, so late joiners see the complete response. Cancelling a
+    subscriber only detaches it; the provider call is cancelled only when
+    no subscribers remain. The response is cached once, when the call
+    completes successfully.
+    """
+
+    def __init__(
+        self,
+        cache_key: str,
+        coalescing_key: str,
+        stream: bool,
+        source: AsyncIterator[str],
+        response_validator: Optional[Callable[[str], bool]] = None,
+    ):
+        self.cache_key = cache_key
+        self.coalescing_key = coalescing_key
+        self.stream = stream
+        self.chunks: List[str] = []
+        self.done = False
+        self.cancelling = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.loop = asyncio.get_running_loop()
+        self._updated = asyncio.Event()
+        self._task = asyncio.create_task(self._run(source, response_validator))
+
+    async def _run(
+        self,
+        source: AsyncIterator[str],
+        response_validator: Optional[Callable[[str], bool]],
+    ) -> None:
         try:
-            item_type, item_value = await asyncio.to_thread(
-                chunk_queue.get, timeout=0.1
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+            await _store_in_cache(
+                self.cache_key, "".join(self.chunks), response_validator
             )
-        except queue.Empty:
-            # No chunk yet, yield control and try again
-            await asyncio.sleep(0.01)
-            continue
+        except (asyncio.CancelledError, Exception) as e:
+            self.error = e
+        finally:
+            self.done = True
+            if _in_flight_completions.get(self.key) is self:
+                del _in_flight_completions[self.key]
+            self._notify()
+
+    @property
+    def key(self) -> tuple:
+        """Registry key; streaming and non-streaming calls are never mixed."""
+        return (self.coalescing_key, self.stream)
+
+    def _notify(self) -> None:
+        # Wake current waiters and arm a fresh event for the next update
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """Yield all chunks of the shared response, replaying any already received.
+
+        Yields:
+            Response text chunks
+
+        Raises:
+            Exception: Whatever error the shared provider call failed with
+        """
+        self.subscribers += 1
+        try:
+            position = 0
+            while True:
+                while position < len(self.chunks):
+                    yield self.chunks[position]
+                    position += 1
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._updated.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                # New identical requests start a fresh call from now on
+                self.cancelling = True
+                self._task.cancel()
+
+
+# In-flight provider calls keyed by (coalescing key, stream)
+_in_flight_completions: Dict[tuple, SharedCompletion] = {}
+
+
+def _get_or_start_shared_completion(
+    cache_key: str,
+    coalescing_key: str,
+    stream: bool,
+    make_source: Callable[[], AsyncIterator[str]],
+    response_validator: Optional[Callable[[str], bool]] = None,
+) -> Tuple[SharedCompletion, bool]:
+    """Attach to an identical in-flight request, or start a new shared one.
 
-        if item_type == "chunk":
-            yield item_value
-            # Yield control after each chunk
-            await asyncio.sleep(0)
-        elif item_type == "error":
-            raise item_value
-        elif item_type == "done":
-            break
+    Args:
+        cache_key: Key computed by custom_get_cache_key, for storing the response
+        coalescing_key: Key computed by get_coalescing_key
+        stream: Whether to stream the response
+        make_source: Creates the provider chunk stream when a new call is needed
+        response_validator: Optional function returning True for cacheable responses
+
+    Returns:
+        Tuple of (shared completion, True if attached to an existing call)
+    """
+    shared = _in_flight_completions.get((coalescing_key, stream))
+    if (
+        shared is not None
+        and not shared.done
+        and not shared.cancelling
+        and shared.loop is asyncio.get_running_loop()
+    ):
+        return shared, True
+
+    shared = SharedCompletion(
+        cache_key, coalescing_key, stream, make_source(), response_validator
+    )
+    _in_flight_completions[shared.key] = shared
+    return shared, False
 
 
 def _check_llm_calls_allowed() -> bool:
@@ -398,21 +868,28 @@ async def get_completion(
     event_bus: Optional[Any] = None,
     agent_id: Optional[str] = None,
     response_validator: Optional[Callable[[str], bool]] = None,
+    priority: LLMCallPriority = LLMCallPriority.AGENT,
     **kwargs,
 ):
     """Get completion from LLM with optional streaming and caching support.
 
+    When use_cache is True, a request identical to one already in flight
+    (same arguments and stream mode, see get_coalescing_key) attaches to that call instead of
+    issuing another provider request.
+
     Args:
         llm_config: LLM configuration containing model and API key
         messages: List of message dictionaries to send to the LLM
         stream: If True, returns an iterator of response chunks
-        use_cache: If True and caching is enabled, will try to use cached responses
+        use_cache: If True, will try to use cached responses (when caching is
+                   enabled) and coalesce with identical in-flight requests
         json_mode: If True, instructs the model to return a JSON response
         session_id: Optional session ID to associate with the generation
         execution_id: Optional counter identifying this LLM call for tracing
         event_bus: Optional event bus for telemetry events
         response_validator: Optional function to validate responses before caching.
                           Should return True if response is valid, False otherwise.
+        priority: Scheduler lane; human-facing turns should use INTERACTIVE
         **kwargs: Additional arguments passed to litellm.completion
 
     Returns:
@@ -429,7 +906,9 @@ async def get_completion(
         )
 
     # Count input tokens
-    input_token_count = get_messages_token_count(messages, llm_config.model)
+    input_token_count = get_messages_token_count(
+        messages, llm_config.model, approximate=approximate_token_counts
+    )
 
     # Publish LLM call started event
     if event_bus and agent_id and session_id:
@@ -469,10 +948,21 @@ async def get_completion(
         if "reasoning_effort" in params:
             completion_kwargs["reasoning_effort"] = "low"
 
+    # Ask for the final usage chunk so prompt-cache token counts can be reported
+    if stream and "stream_options" in (
+        get_supported_openai_params(model=llm_config.model) or []
+    ):
+        completion_kwargs["stream_options"] = {"include_usage": True}
+
+    # Identical requests share a cache key, which also seeds the coalescing key
+    if use_cache:
+        cache_key = custom_get_cache_key(**completion_kwargs)
+
     # Try to get response from cache if enabled
     if llm_cache_enabled and use_cache and cache is not None:
-        cache_key = custom_get_cache_key(**completion_kwargs)
-        cache_value = cache.get(cache_key)
+        cache_value = await cache.aget(cache_key)
+        if event_bus and agent_id and session_id:
+            _publish_cache_stats(event_bus, session_id, agent_id)
 
         if cache_value is not None:
             debug(f"cache_hit: {True}", cache_key=cache_key)
@@ -486,7 +976,9 @@ async def get_completion(
             # Publish LLM call ended event for cache hit
             if event_bus and agent_id and session_id:
                 output_value = str(cache_value)
-                output_token_count = get_token_count(output_value, llm_config.model)
+                output_token_count = get_token_count(
+                    output_value, llm_config.model, approximate_token_counts
+                )
 
                 event_bus.publish(
                     LLMCallEndedEvent(
@@ -502,64 +994,66 @@ async def get_completion(
 
             return
 
-    # Get response from LLM
-    full_response: Union[str, List[str]] = [] if stream else ""
-    error_occurred = False
+    # Get response from LLM, attaching to an identical in-flight call if any
+    full_response: Optional[str] = None
+    chunks: List[str] = []
+    chunk_offsets: List[float] = []
+    coalesced = False
+    # Stays zero for coalesced calls, which send nothing to the provider
+    cache_usage = PromptCacheUsage()
     error_msg = None
     try:
         debug(f"cache_hit: {False}", cache_key=cache_key)
 
-        if stream:
-            async for chunk in _make_completion_request_stream(completion_kwargs):
-                full_response.append(chunk)  # type: ignore
-                yield chunk
-            full_response = "".join(full_response)  # type: ignore
+        def make_source() -> AsyncIterator[str]:
+            return _completion_chunks(
+                completion_kwargs,
+                stream,
+                provider=llm_config.provider or "",
+                input_tokens=input_token_count,
+                priority=priority,
+                cache_usage=cache_usage,
+                # Timed where chunks arrive, not where they are consumed
+                chunk_offsets=chunk_offsets if llm_recorder is not None else None,
+            )
+
+        if use_cache:
+            shared, coalesced = _get_or_start_shared_completion(
+                cache_key,
+                get_coalescing_key(cache_key, completion_kwargs),
+                stream,
+                make_source,
+                response_validator,
+            )
+            response_chunks = shared.subscribe()
         else:
-            full_response = _make_completion_request(completion_kwargs)
-            yield full_response
+            response_chunks = make_source()
+
+        async with aclosing(response_chunks):
+            async for chunk in response_chunks:
+                chunks.append(chunk)
+                yield chunk
+        full_response = "".join(chunks)
+
+        # Coalesced calls would record the same provider call twice
+        if llm_recorder is not None and not coalesced:
+            await llm_recorder.arecord(
+                messages, llm_config.model, list(zip(chunk_offsets, chunks))
+            )
     except Exception as e:
-        error_occurred = True
         error_msg = str(e)
         raise e  # Re-raise the exception to be caught by the decorator if applicable
     finally:
-        # Update cache - only store valid responses
-        if (
-            not error_occurred
-            and llm_cache_enabled
-            and use_cache
-            and cache is not None
-            and full_response is not None
-            and len(full_response) > 0
-        ):
-            if isinstance(full_response, list):
-                full_response = "".join(full_response)
-            full_response = str(full_response)
-
-            # Validate response before caching if validator provided
-            if response_validator is None or response_validator(full_response):
-                try:
-                    cache.set(cache_key, full_response)
-                except Exception as cache_error:
-                    # Log cache error but don't fail the LLM call
-                    debug(
-                        "Failed to cache LLM response - continuing without caching",
-                        error=str(cache_error),
-                        cache_key=cache_key,
-                    )
-            else:
-                debug(
-                    "Response validation failed - not caching invalid response",
-                    cache_key=cache_key,
-                )
-
         # Publish LLM call ended event
         if event_bus and agent_id and session_id:
+            output_value = full_response if error_msg is None else None
             output_token_count = (
-                get_token_count(str(full_response), llm_config.model)
-                if full_response
+                get_token_count(
+                    output_value, llm_config.model, approximate_token_counts
+                )
+                if output_value
                 else 0
             )
-            output_value = full_response if not error_occurred else None
 
             event_bus.publish(
                 LLMCallEndedEvent(
@@ -569,11 +1063,10 @@ async def get_completion(
                     output_tokens=output_token_count,
                     output=output_value,
                     error=error_msg,
-                    cache_hit=(
-                        cache_key is not None and cache_value is not None
-                        if "cache_value" in locals()
-                        else False
-                    ),
+                    cache_hit=False,
+                    coalesced=coalesced,
+                    cache_read_tokens=cache_usage.read_tokens,
+                    cache_write_tokens=cache_usage.write_tokens,
                 )
             )
 
@@ -687,7 +1180,8 @@ def ensure_upto_N_cached_messages(messages: List[dict]) -> List[dict]:
 
     Scans messages in reverse order and removes cache_control markers from
     messages beyond the limit. System messages are always preserved regardless
-    of cache status.
+    of cache status and count against the limit only when they are cached, so
+    breakpoints placed by plan_cache_breakpoints are kept as they are.
 
     Args:
         messages: List of message dictionaries (modified in-place)
@@ -696,7 +1190,12 @@ def ensure_upto_N_cached_messages(messages: List[dict]) -> List[dict]:
         Modified message list with cache_control markers removed from excess messages
     """
 
-    max_cached_messages = 4 - 1  # Keep one for the System message
+    # Cached System messages are always kept, the rest share what is left
+    max_cached_messages = MAX_CACHE_BREAKPOINTS - sum(
+        1
+        for message in messages
+        if message["role"] == LLMMessageRole.SYSTEM and "cache_control" in message
+    )
     count_cached_messages = 0
 
     # Cached messages are those with a cache_control field set
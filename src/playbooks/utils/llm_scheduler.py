@@ -0,0 +1,285 @@
+"""Process-wide scheduling of LLM calls.
+
+Limits how fast the runtime sends requests to LLM providers so that a large
+multi-agent program degrades by queueing instead of by provider 429s:
+
+- Per-model and per-provider token buckets for requests per minute (RPM)
+  and tokens per minute (TPM)
+- An optional cap on concurrent in-flight calls
+- Priority lanes, so human-facing turns are dispatched ahead of background
+  agents and compilation
+- Queue depth and wait-time metrics
+"""
+
+import asyncio
+import bisect
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from playbooks.config import LLMRateLimitConfig, LLMSchedulerConfig
+from playbooks.core.enums import LLMCallPriority
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate.
+
+    The bucket starts full, so short bursts up to the per-minute limit are
+    allowed before requests start waiting.
+    """
+
+    def __init__(self, per_minute: int, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def clamp(self, amount: float) -> float:
+        """Limit a request to the bucket capacity so it can eventually proceed."""
+        return min(amount, self.capacity)
+
+    def time_until_available(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = self.clamp(amount)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Remove tokens; callers check availability first."""
+        self._refill()
+        self.tokens -= self.clamp(amount)
+
+
+@dataclass
+class _Waiter:
+    priority: LLMCallPriority
+    sequence: int
+    model: str
+    provider: str
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+@dataclass
+class LLMSchedulerMetrics:
+    """Snapshot of scheduler state and cumulative wait statistics."""
+
+    queue_depth: int = 0
+    queue_depth_by_priority: Dict[str, int] = field(default_factory=dict)
+    in_flight: int = 0
+    dispatched: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def avg_wait_s(self) -> float:
+        return self.total_wait_s / self.dispatched if self.dispatched else 0.0
+
+
+class LLMScheduler:
+    """Admission control for LLM calls across the whole process.
+
+    Waiters are dispatched in priority order (FIFO within a priority). A
+    waiter blocked on a rate limit only holds back lower-priority waiters
+    that need the same bucket; calls to other models and providers keep
+    flowing.
+    """
+
+    def __init__(self, scheduler_config: LLMSchedulerConfig, clock=time.monotonic):
+        self.config = scheduler_config
+        self._clock = clock
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._dispatched = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+
+    def _limits_for(self, model: str, provider: str) -> List[tuple]:
+        """Return (bucket key, limit config) pairs that apply to a call."""
+        limits = []
+        if model in self.config.models:
+            limits.append((("model", model), self.config.models[model]))
+        if provider and provider in self.config.providers:
+            limits.append((("provider", provider), self.config.providers[provider]))
+        return limits
+
+    def _buckets_for(self, waiter: _Waiter) -> List[tuple]:
+        """Return (bucket, amount) pairs a waiter must draw from."""
+        needed = []
+        for key, limit in self._limits_for(waiter.model, waiter.provider):
+            needed.extend(self._limit_buckets(key, limit, waiter.tokens))
+        return needed
+
+    def _limit_buckets(
+        self, key: tuple, limit: LLMRateLimitConfig, tokens: int
+    ) -> List[tuple]:
+        needed = []
+        if limit.rpm:
+            needed.append((self._bucket(key + ("rpm",), limit.rpm), 1))
+        if limit.tpm:
+            needed.append((self._bucket(key + ("tpm",), limit.tpm), tokens))
+        return needed
+
+    def _bucket(self, key: tuple, per_minute: int) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(per_minute, clock=self._clock)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _has_capacity(self) -> bool:
+        max_concurrency = self.config.max_concurrency
+        return max_concurrency is None or self._in_flight < max_concurrency
+
+    def _dispatch(self) -> None:
+        """Grant every waiter that can proceed now, then arm a refill timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        blocked_buckets = set()
+        next_wakeup: Optional[float] = None
+
+        for waiter in list(self._waiters):
+            if not self._has_capacity():
+                break
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+
+            needed = self._buckets_for(waiter)
+            if any(id(bucket) in blocked_buckets for bucket, _ in needed):
+                continue
+
+            wait = max(
+                (bucket.time_until_available(amount) for bucket, amount in needed),
+                default=0.0,
+            )
+            if wait > 0:
+                # Reserve these buckets for this waiter ahead of lower priorities
+                blocked_buckets.update(id(bucket) for bucket, _ in needed)
+                next_wakeup = wait if next_wakeup is None else min(next_wakeup, wait)
+                continue
+
+            for bucket, amount in needed:
+                bucket.consume(amount)
+            self._waiters.remove(waiter)
+            self._in_flight += 1
+            self._record_wait(self._clock() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+        if next_wakeup is not None and self._waiters:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(next_wakeup, self._dispatch)
+
+    def _record_wait(self, wait_s: float) -> None:
+        self._dispatched += 1
+        self._total_wait_s += wait_s
+        self._max_wait_s = max(self._max_wait_s, wait_s)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        if self._waiters:
+            self._dispatch()
+
+    async def acquire(
+        self,
+        model: str,
+        provider: str = "",
+        tokens: int = 0,
+        priority: LLMCallPriority = LLMCallPriority.AGENT,
+    ) -> None:
+        """Wait until a call may be sent to the provider.
+
+        Every successful acquire must be paired with release(); prefer the
+        reserve() context manager.
+
+        Args:
+            model: Model the call is for
+            provider: Provider of the model, for provider-wide limits
+            tokens: Estimated input tokens, drawn from TPM buckets
+            priority: Dispatch lane for the call
+        """
+        waiter = _Waiter(
+            priority=priority,
+            sequence=next(self._sequence),
+            model=model,
+            provider=provider or "",
+            tokens=tokens,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=self._clock(),
+        )
+        bisect.insort(self._waiters, waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before cancellation; hand the slot back
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._dispatch()
+            raise
+
+    def release(self) -> None:
+        """Return an in-flight slot acquired with acquire()."""
+        self._release()
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        model: str,
+        provider: str = "",
+        tokens: int = 0,
+        priority: LLMCallPriority = LLMCallPriority.AGENT,
+    ) -> AsyncIterator[None]:
+        """Hold a scheduler slot for the duration of an LLM call.
+
+        Args:
+            model: Model the call is for
+            provider: Provider of the model, for provider-wide limits
+            tokens: Estimated input tokens, drawn from TPM buckets
+            priority: Dispatch lane for the call
+        """
+        await self.acquire(model, provider, tokens, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_metrics(self) -> LLMSchedulerMetrics:
+        """Return a snapshot of queue depth, in-flight calls and wait times."""
+        by_priority: Dict[str, int] = {}
+        for waiter in self._waiters:
+            name = waiter.priority.name.lower()
+            by_priority[name] = by_priority.get(name, 0) + 1
+
+        return LLMSchedulerMetrics(
+            queue_depth=len(self._waiters),
+            queue_depth_by_priority=by_priority,
+            in_flight=self._in_flight,
+            dispatched=self._dispatched,
+            total_wait_s=self._total_wait_s,
+            max_wait_s=self._max_wait_s,
+        )
@@ -0,0 +1,156 @@
+"""Dependency-aware scheduling of program startup work.
+
+Program initialization is a set of steps (parsing program files, creating
+agents, MCP and remote playbook discovery, agent initialization) where only
+some steps depend on others. StartupScheduler runs each step as soon as the
+steps it depends on are done, so startup takes as long as its critical path
+instead of the sum of all steps:
+
+- Steps are added with the names of the steps they depend on
+- Independent steps run concurrently, optionally capped
+- Steps may add further steps while they run (e.g. one discovery step per
+  agent, once the agents exist)
+- Start and end times of every step are kept for a startup timeline
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class StartupTask:
+    """One step of program startup and its timing."""
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    started_at: Optional[float] = None  # seconds since the scheduler started
+    ended_at: Optional[float] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.ended_at is None:
+            return 0.0
+        return self.ended_at - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "depends_on": list(self.depends_on),
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "error": repr(self.error) if self.error else None,
+        }
+
+
+class StartupScheduler:
+    """Runs startup tasks in dependency order, independent tasks concurrently.
+
+    Dependencies must be added before the tasks that depend on them, which
+    keeps the graph acyclic. A task whose dependency failed does not run;
+    run() raises the first error once every task has settled.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, clock=time.perf_counter):
+        self.max_concurrency = max_concurrency  # None runs all ready tasks at once
+        self.tasks: Dict[str, StartupTask] = {}
+        self._clock = clock
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._started_at: Optional[float] = None
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+    ) -> StartupTask:
+        """Add a task; it starts right away if the scheduler is running."""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate startup task: {name}")
+        depends_on = tuple(depends_on)
+        unknown = [dep for dep in depends_on if dep not in self.tasks]
+        if unknown:
+            raise ValueError(
+                f"Startup task {name} depends on unknown tasks: {', '.join(unknown)}"
+            )
+        task = StartupTask(name=name, run=run, depends_on=depends_on)
+        self.tasks[name] = task
+        if self._started_at is not None:
+            self._start(task)
+        return task
+
+    async def run(self) -> List[StartupTask]:
+        """Run every task, including tasks added while running.
+
+        Returns:
+            The tasks in the order they were added
+        """
+        self._started_at = self._clock()
+        if self.max_concurrency:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for task in list(self.tasks.values()):
+            self._start(task)
+
+        # Tasks may add more tasks, so wait until no new futures appear
+        while True:
+            futures = list(self._futures.values())
+            await asyncio.gather(*futures, return_exceptions=True)
+            if len(futures) == len(self._futures):
+                break
+
+        for task in self.tasks.values():
+            if task.error is not None:
+                raise task.error
+        return list(self.tasks.values())
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the start of run() to the end of the last task."""
+        return max((task.ended_at or 0.0 for task in self.tasks.values()), default=0.0)
+
+    def critical_path(self) -> List[str]:
+        """Names of the chain of tasks that determined the total startup time.
+
+        Starts from the task that ended last and follows, at each step, the
+        dependency that ended last.
+        """
+        finished = [task for task in self.tasks.values() if task.ended_at is not None]
+        if not finished:
+            return []
+        task = max(finished, key=lambda t: t.ended_at)
+        path = [task.name]
+        while task.depends_on:
+            task = max(
+                (self.tasks[dep] for dep in task.depends_on),
+                key=lambda t: t.ended_at or 0.0,
+            )
+            path.append(task.name)
+        return list(reversed(path))
+
+    def _start(self, task: StartupTask) -> None:
+        self._futures[task.name] = asyncio.ensure_future(self._run_task(task))
+
+    async def _run_task(self, task: StartupTask) -> Any:
+        for dep in task.depends_on:
+            await self._futures[dep]  # re-raises if the dependency failed
+
+        if self._semaphore is None:
+            return await self._execute(task)
+        async with self._semaphore:
+            return await self._execute(task)
+
+    async def _execute(self, task: StartupTask) -> Any:
+        task.started_at = self._clock() - self._started_at
+        try:
+            task.result = await task.run()
+            return task.result
+        except Exception as e:
+            task.error = e
+            raise
+        finally:
+            task.ended_at = self._clock() - self._started_at
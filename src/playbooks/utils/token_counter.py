@@ -1,40 +1,115 @@
 """Utility functions for counting tokens using tiktoken."""
 
 import json
-from typing import Dict, List, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union
 
 import tiktoken
 
 
-def get_token_count(text: str, model: str = "gpt-4") -> int:
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Return the tiktoken encoding for a model, loading it once per process.
+
+    Args:
+        model: The model to get the encoding for
+
+    Returns:
+        The model's encoding, or cl100k_base if tiktoken does not know the model
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback to cl100k_base encoding if model not found
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Estimate the number of tokens in a text string as characters / 4.
+
+    Much cheaper than encoding; good enough for telemetry and rate limiting.
+
+    Args:
+        text: The text to estimate tokens for
+
+    Returns:
+        The estimated number of tokens
+    """
+    return (len(text) + 3) // 4
+
+
+def get_token_count(text: str, model: str = "gpt-4", approximate: bool = False) -> int:
     """
     Count the number of tokens in a text string using tiktoken.
 
     Args:
         text: The text to count tokens for
         model: The model to use for tokenization (default: gpt-4)
+        approximate: Estimate as characters / 4 instead of encoding
 
     Returns:
         The number of tokens in the text
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
-    except KeyError:
-        # Fallback to cl100k_base encoding if model not found
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
+    if approximate:
+        return approximate_token_count(text)
+    return len(get_encoding(model).encode(text))
+
+
+# Token counts of recent dict message contents, keyed by (model, content
+# length, content hash). Only the str hash (which Python caches on the string)
+# is kept, so the memo never holds on to message contents. Cleared when full.
+_CONTENT_TOKEN_COUNTS: Dict[Tuple[str, int, int], int] = {}
+_CONTENT_TOKEN_COUNTS_SIZE = 8192
+
+
+def _content_token_count(content: str, model: str) -> int:
+    # Recounting an unchanged message in a later LLM call is a dict lookup
+    memo_key = (model, len(content), hash(content))
+    count = _CONTENT_TOKEN_COUNTS.get(memo_key)
+    if count is None:
+        count = get_token_count(content, model)
+        if len(_CONTENT_TOKEN_COUNTS) >= _CONTENT_TOKEN_COUNTS_SIZE:
+            _CONTENT_TOKEN_COUNTS.clear()
+        _CONTENT_TOKEN_COUNTS[memo_key] = count
+    return count
+
+
+def get_message_content_token_count(
+    message: Any, model: str = "gpt-4", approximate: bool = False
+) -> int:
+    """
+    Count the tokens in one message's content, memoized per message.
+
+    Args:
+        message: An LLMMessage or a message dictionary with a 'content' key
+        model: The model to use for tokenization (default: gpt-4)
+        approximate: Estimate as characters / 4 instead of encoding
+
+    Returns:
+        The number of tokens in the message content
+    """
+    if hasattr(message, "token_count"):
+        return message.token_count(model, approximate)
+
+    content = message.get("content", "")
+    if approximate or not isinstance(content, str):
+        return get_token_count(content, model, approximate)
+    return _content_token_count(content, model)
 
 
 def get_messages_token_count(
-    messages: List[Dict[str, str]], model: str = "gpt-4"
+    messages: List[Any], model: str = "gpt-4", approximate: bool = False
 ) -> int:
     """
     Count the total number of tokens in a list of messages.
 
     Args:
-        messages: List of message dictionaries with 'role' and 'content' keys
+        messages: List of LLMMessages or message dictionaries with 'role' and
+            'content' keys
         model: The model to use for tokenization (default: gpt-4)
+        approximate: Estimate as characters / 4 instead of encoding
 
     Returns:
         The total number of tokens in all messages
@@ -43,15 +118,14 @@ def get_messages_token_count(
 
     for message in messages:
         # Count tokens for the message content
-        content = message.get("content", "")
-        total_tokens += get_token_count(content, model)
+        total_tokens += get_message_content_token_count(message, model, approximate)
 
         # Add tokens for message structure (role, etc.)
         # OpenAI's ChatML format adds some overhead per message
         total_tokens += 4  # Approximate overhead per message
 
         # Handle name field if present
-        if "name" in message:
+        if isinstance(message, dict) and "name" in message:
             total_tokens += 1
 
     # Add tokens for conversation structure
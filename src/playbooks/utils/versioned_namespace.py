@@ -0,0 +1,80 @@
+"""Dict that tracks its own mutations.
+
+Kept free of playbooks imports so execution and agent modules can both use
+it without importing each other.
+"""
+
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class VersionedNamespace(dict):
+    """Namespace dict whose version advances on every mutation.
+
+    Views derived from an agent namespace (the execution namespace, the
+    imports shown in the interpreter prompt) are cached against the version
+    so they are only rebuilt after the namespace actually changes.
+
+    Code using the namespace as its globals (python playbooks) assigns
+    globals without calling the dict methods, so whoever runs such code
+    calls mark_changed() afterwards.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> "VersionedNamespace":
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Any]:
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def mark_changed(self) -> None:
+        """Invalidate derived views after writes that bypassed the dict methods."""
+        self.version += 1
+
+    def derived(self, key: str, build: Callable[[Dict[str, Any]], T]) -> T:
+        """Return build(self), rebuilding it only after the namespace changes.
+
+        Args:
+            key: Name of the derived view
+            build: Function computing the view from the namespace
+
+        Returns:
+            The cached or freshly built view; callers must not mutate it
+        """
+        cached = self._derived.get(key)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, build(self))
+            self._derived[key] = cached
+        return cached[1]
@@ -0,0 +1,144 @@
+"""
+Performance benchmarks for creating many agents at run time.
+
+Creates agents of one class the way CreateAgent and get_or_create_agent do
+(Program.create_agent, then discover_playbooks() and initialize()) and
+compares the previous behavior against the current one. Previously every
+creation rebuilt the agent list of every agent, every initialization
+collected trigger instructions from every other agent, every begin playbook
+was generated, written to disk and exec'd per instance, and every system
+prompt was read from disk.
+
+Measures:
+- Agents created per second for fan-outs of 100 to 1000 agents
+- Latency of a burst of agent creations with and without a warm pool
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from playbooks.agents import AIAgent
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.llm.messages import types as message_types
+from playbooks.program import Program
+
+sys.path.insert(0, str(Path(__file__).parent))
+from bench_agent_spawn import program_markdown  # noqa: E402
+
+BURST = 50
+
+_cached_begin_playbook_definitions = AIAgent._begin_playbook_definitions.__func__
+
+
+def legacy_event_agents_changed(self) -> None:
+    for agent in self.agents:
+        if isinstance(agent, AIAgent):
+            agent.agents_list = [str(agent) for agent in self.agents]
+
+
+def legacy_all_trigger_instructions(self):
+    instructions = self.trigger_instructions(with_namespace=False)
+    seen = set(instructions)
+    for agent in self.other_agents:
+        for instr in agent.trigger_instructions(with_namespace=True, public_only=True):
+            if instr not in seen:
+                instructions.append(instr)
+                seen.add(instr)
+    return instructions
+
+
+def legacy_begin_playbook_definitions(cls, name, code_block):
+    cls._begin_playbooks_cache = {}
+    return _cached_begin_playbook_definitions(cls, name, code_block)
+
+
+def legacy_patches() -> ExitStack:
+    stack = ExitStack()
+    stack.enter_context(
+        patch.object(Program, "event_agents_changed", legacy_event_agents_changed)
+    )
+    stack.enter_context(
+        patch.object(
+            AIAgent, "all_trigger_instructions", legacy_all_trigger_instructions
+        )
+    )
+    stack.enter_context(
+        patch.object(
+            AIAgent,
+            "_begin_playbook_definitions",
+            classmethod(legacy_begin_playbook_definitions),
+        )
+    )
+    stack.enter_context(
+        patch.object(
+            message_types,
+            "load_system_prompt",
+            message_types.load_system_prompt.__wrapped__,
+        )
+    )
+    return stack
+
+
+async def new_program(markdown: str) -> Program:
+    program = Program(EventBus("bench"), program_content=markdown)
+    await program.initialize()
+    return program
+
+
+async def create(program: Program) -> None:
+    agent = await program.create_agent("Worker")
+    await agent.discover_playbooks()
+    await agent.initialize()
+
+
+async def fanout_rate(count: int) -> float:
+    """Agents created per second, creating count agents one after another."""
+    program = await new_program(program_markdown())
+    start = time.perf_counter()
+    for _ in range(count):
+        await create(program)
+    return count / (time.perf_counter() - start)
+
+
+async def burst_latency(warm_pool: int) -> float:
+    """Seconds to create a burst of BURST agents."""
+    markdown = program_markdown().replace(
+        "# Worker\nA worker agent\n",
+        f"# Worker\nmetadata:\n  warm_pool: {warm_pool}\n---\nA worker agent\n",
+    )
+    program = await new_program(markdown)
+    start = time.perf_counter()
+    for _ in range(BURST):
+        await create(program)
+    return time.perf_counter() - start
+
+
+async def run() -> None:
+    print("=" * 70)
+    print("Creating agents of one class at run time")
+    print("=" * 70)
+    print(f"{'agents':>8} {'legacy (/s)':>13} {'current (/s)':>14} {'speedup':>9}")
+    for count in (100, 250, 500):
+        with legacy_patches():
+            legacy = await fanout_rate(count)
+        current = await fanout_rate(count)
+        print(f"{count:>8} {legacy:>13.0f} {current:>14.0f} {current / legacy:>8.1f}x")
+
+    cold = await burst_latency(0)
+    warm = await burst_latency(BURST)
+    print()
+    print(f"Burst of {BURST} agent creations:")
+    print(f"  no warm pool: {cold * 1000:>8.1f} ms")
+    print(f"  warm pool:    {warm * 1000:>8.1f} ms")
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Performance benchmarks for spawning many agents of one class.
+
+Compares the previous per-instance setup, which deep copied every class
+playbook and rebuilt each python playbook function over its own merged
+copy of the globals, against binding the shared class playbooks to each
+instance (Playbook.bind) with python playbooks running in the agent's
+namespace.
+
+Measures:
+- Agents spawned per second for 1000 agents of one class
+- Memory retained per agent (tracemalloc) and RSS growth per agent
+"""
+
+import asyncio
+import copy
+import gc
+import os
+import time
+import tracemalloc
+from typing import List, Optional
+
+from playbooks.agents.agent_builder import AgentBuilder
+from playbooks.agents.namespace_manager import AgentNamespaceManager
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.utils.misc import copy_func
+
+AGENTS = 1000
+LLM_PLAYBOOKS = 10
+PYTHON_PLAYBOOKS = 5
+
+
+def program_markdown() -> str:
+    """A worker agent with several LLM and python playbooks."""
+    python_playbooks = "\n".join(
+        f"@playbook\nasync def Tool{i}(x: int) -> int:\n"
+        f'    """Tool number {i}."""\n    return math.floor(x / {i + 1})\n'
+        for i in range(PYTHON_PLAYBOOKS)
+    )
+    llm_playbooks = "\n".join(
+        f"## Task{i}($topic: str) -> str\nWork on task {i}\n### Triggers\n"
+        f"- T1:CND When asked about task {i}\n### Steps\n"
+        + "".join(
+            f"- {step:02d}:QUE Think about $topic from angle {step}\n"
+            for step in range(1, 8)
+        )
+        + "- 08:RET Return the answer\n"
+        for i in range(LLM_PLAYBOOKS)
+    )
+    return (
+        "# Worker\nA worker agent\n\n```python\nimport json\nimport math\n"
+        "import re\n\n" + python_playbooks + "```\n\n" + llm_playbooks
+    )
+
+
+class LegacySetup:
+    """Reproduction of the previous deep copy and per-playbook globals merge."""
+
+    def bind_playbooks(self, playbooks):
+        playbooks_copy = copy.deepcopy(playbooks)
+        for playbook in playbooks_copy.values():
+            if hasattr(playbook, "func") and playbook.func:
+                playbook.func = copy_func(playbook.func)
+        return playbooks_copy
+
+    def _setup_isolated_namespace(self):
+        self.namespace_manager = AgentNamespaceManager(
+            namespace=self.__class__.namespace_manager.namespace.copy()
+        )
+        self.namespace_manager.namespace["self"] = self
+        self.namespace_manager.namespace["agent"] = self
+        self.namespace_manager.namespace["agents"] = self.all_agents
+        for playbook_name, playbook in self.playbooks.items():
+            call_through = playbook.create_namespace_function(self)
+            self.namespace_manager.namespace[playbook_name] = call_through
+            playbook.agent_name = str(self)
+        for playbook in self.playbooks.values():
+            if (
+                hasattr(playbook, "create_agent_specific_function")
+                and not playbook.func
+            ):
+                playbook.func = playbook.create_agent_specific_function(self)
+            else:
+                playbook.func = copy_func(
+                    playbook.func,
+                    globals={
+                        **playbook.func.__globals__,
+                        **self.namespace_manager.namespace,
+                    },
+                )
+        self._add_agent_classes_to_namespace()
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def spawn(agent_klass, count: int) -> List:
+    event_bus = EventBus("bench")
+    return [agent_klass(event_bus) for _ in range(count)]
+
+
+def measure(agent_klass) -> dict:
+    """Spawn rate, retained memory and RSS growth for AGENTS agents."""
+    spawn(agent_klass, 10)  # warm up
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    agents = spawn(agent_klass, AGENTS)
+    elapsed = time.perf_counter() - start
+    rss_after = rss_bytes()
+    del agents
+    gc.collect()
+
+    tracemalloc.start()
+    agents = spawn(agent_klass, AGENTS)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del agents
+    gc.collect()
+
+    return {
+        "rate": AGENTS / elapsed,
+        "retained": retained / AGENTS,
+        "rss": (
+            (rss_after - rss_before) / AGENTS
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+    }
+
+
+def main() -> None:
+    agent_klasses = asyncio.run(
+        AgentBuilder.create_agent_classes_from_ast(markdown_to_ast(program_markdown()))
+    )
+    worker_klass = agent_klasses["Worker"]
+    legacy_klass = type("Worker", (LegacySetup, worker_klass), {})
+
+    print("=" * 70)
+    print(f"Spawning {AGENTS} agents with {len(worker_klass.playbooks)} playbooks each")
+    print("=" * 70)
+    # Bound playbooks first, so the legacy run may reuse pages freed before it
+    results = {"bound": measure(worker_klass), "legacy": measure(legacy_klass)}
+    print(f"{'setup':>8} {'agents/s':>10} {'retained/agent':>16} {'RSS/agent':>12}")
+    for name in ("legacy", "bound"):
+        result = results[name]
+        rss = "n/a" if result["rss"] is None else f"{result['rss'] / 1024:.1f} KiB"
+        print(
+            f"{name:>8} {result['rate']:>10.0f} "
+            f"{result['retained'] / 1024:>12.1f} KiB {rss:>12}"
+        )
+    print(
+        f"speedup: {results['bound']['rate'] / results['legacy']['rate']:.1f}x, "
+        f"memory: {results['legacy']['retained'] / results['bound']['retained']:.1f}x"
+        " less"
+    )
+
+
+if __name__ == "__main__":
+    main()
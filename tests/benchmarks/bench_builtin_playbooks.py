@@ -0,0 +1,123 @@
+"""
+Performance benchmarks for adding the built-in playbooks to agent classes.
+
+Compares the previous behavior, where every agent class compiled the
+built-in LLM playbooks markdown (Compiler construction, cache key hashing
+and a .pbasm_cache lookup, here always a warm cache hit) and re-parsed the
+built-in python playbooks, against the precompiled .pbasm shipped with the
+package and loaded once per process.
+
+Measures:
+- CPU time to build the built-in AST nodes for 1 to 20 agent classes
+- CPU time of AgentBuilder.create_agent_classes_from_ast for 20 agent classes
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from playbooks.agents.agent_builder import AgentBuilder
+from playbooks.agents.builtin_playbooks import BuiltinPlaybooks
+from playbooks.compilation.compiler import Compiler
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+
+
+async def legacy_get_ast_nodes():
+    """Reproduction of the previous per-class compilation of the builtins."""
+    compiler = Compiler()
+    _, compiled_content, compiled_file_path = await compiler.compile(
+        content=BuiltinPlaybooks.get_llm_playbooks_markdown()
+    )
+    ast = markdown_to_ast(compiled_content, source_file_path=compiled_file_path)
+    h1 = [node for node in ast["children"] if node["type"] == "h1"][0]
+    llm_nodes = [node for node in h1["children"] if node["type"] == "h2"]
+    return BuiltinPlaybooks._parse_python_playbooks() + llm_nodes
+
+
+def warm_pbasm_cache() -> None:
+    """Put the compiled builtins where the compiler looks for them."""
+    compiler = Compiler()
+    markdown = BuiltinPlaybooks.get_llm_playbooks_markdown()
+    agent = compiler._extract_agents(markdown)[0]
+    cache_path = compiler._get_cache_path(
+        agent["name"], compiler._generate_cache_key(agent["content"])
+    )
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(BuiltinPlaybooks.load_compiled_llm_playbooks())
+
+
+def reset_builtins() -> None:
+    """Forget the per-process AST nodes, as in a fresh process."""
+    BuiltinPlaybooks._python_ast_nodes = None
+    BuiltinPlaybooks._llm_ast_nodes = None
+
+
+async def time_builtin_nodes(class_count: int, legacy: bool) -> float:
+    reset_builtins()
+    start = time.process_time()
+    for _ in range(class_count):
+        if legacy:
+            await legacy_get_ast_nodes()
+        else:
+            await BuiltinPlaybooks.get_ast_nodes()
+    return time.process_time() - start
+
+
+def program_ast(class_count: int) -> dict:
+    markdown = "\n".join(
+        f"# Agent{i}\nAgent number {i}\n\n## Main\n### Steps\n- 01:RET Done\n"
+        for i in range(class_count)
+    )
+    return markdown_to_ast(markdown)
+
+
+async def time_agent_classes(class_count: int, legacy: bool) -> float:
+    reset_builtins()
+    ast = program_ast(class_count)
+    start = time.process_time()
+    if legacy:
+        with patch.object(
+            BuiltinPlaybooks, "get_ast_nodes", side_effect=legacy_get_ast_nodes
+        ):
+            await AgentBuilder.create_agent_classes_from_ast(ast)
+    else:
+        await AgentBuilder.create_agent_classes_from_ast(ast)
+    return time.process_time() - start
+
+
+async def run() -> None:
+    print("=" * 70)
+    print("Built-in playbooks per agent class")
+    print("=" * 70)
+    print(f"{'classes':>8} {'compile (ms)':>14} {'shipped (ms)':>14} {'speedup':>9}")
+    for class_count in (1, 5, 20):
+        legacy = await time_builtin_nodes(class_count, legacy=True)
+        shipped = await time_builtin_nodes(class_count, legacy=False)
+        print(
+            f"{class_count:>8} {legacy * 1000:>14.2f} {shipped * 1000:>14.2f} "
+            f"{legacy / shipped:>8.1f}x"
+        )
+
+    legacy = await time_agent_classes(20, legacy=True)
+    shipped = await time_agent_classes(20, legacy=False)
+    print()
+    print("create_agent_classes_from_ast, 20 agent classes:")
+    print(f"  compile: {legacy * 1000:>10.2f} ms")
+    print(f"  shipped: {shipped * 1000:>10.2f} ms ({legacy / shipped:.1f}x)")
+
+
+def main() -> None:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            warm_pbasm_cache()
+            asyncio.run(run())
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Performance benchmarks for LLM cache key computation.
+
+Compares the previous full-serialization key (json.dumps of the whole
+request + sha256) against the rolling per-message digest used by
+`custom_get_cache_key`, at 10, 100 and 1000 messages. Each iteration
+appends one message, as an agent turn does, so the rolling key re-digests
+only the new message.
+
+Measures:
+- Mean time to compute one key
+"""
+
+import hashlib
+import json
+import time
+from typing import Callable, Dict, List
+
+from playbooks.llm.messages import base
+from playbooks.utils.llm_helper import custom_get_cache_key
+
+MESSAGE_SIZE = 2000  # characters per message
+ITERATIONS = 50
+
+
+def legacy_cache_key(**kwargs) -> str:
+    """Reproduction of the previous key: serialize and hash the full request."""
+    cache_components = {
+        "model": kwargs.get("model", ""),
+        "messages": kwargs.get("messages", []),
+        "temperature": kwargs.get("temperature", 0.2),
+        "logit_bias": kwargs.get("logit_bias", {}),
+    }
+    key_str = json.dumps(cache_components, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key_str.encode("utf-8")).hexdigest()[:32]
+
+
+def make_messages(count: int) -> List[Dict[str, str]]:
+    roles = ["user", "assistant"]
+    return [
+        {"role": roles[i % 2], "content": f"turn {i} " + "x" * MESSAGE_SIZE}
+        for i in range(count)
+    ]
+
+
+def time_growing_conversation(key_fn: Callable[..., str], message_count: int) -> float:
+    """Mean seconds per key while a conversation grows past message_count."""
+    messages = make_messages(message_count + ITERATIONS)
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        key_fn(model="gpt-4", messages=messages[: message_count + i], temperature=0.2)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def main() -> None:
+    print("=" * 60)
+    print("LLM cache key computation")
+    print("=" * 60)
+    print(f"{'messages':>10} {'legacy (ms)':>14} {'rolling (ms)':>14} {'speedup':>9}")
+    for count in (10, 100, 1000):
+        base._MESSAGE_DIGEST_MEMO.clear()
+        legacy = time_growing_conversation(legacy_cache_key, count)
+        rolling = time_growing_conversation(custom_get_cache_key, count)
+        print(
+            f"{count:>10} {legacy * 1000:>14.3f} {rolling * 1000:>14.3f} "
+            f"{legacy / rolling:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Performance benchmarks for streaming statement boundary detection.
+
+Compares the previous CodeBuffer (retrying ast.parse on successively shorter
+prefixes of the buffer at every newline) against the incremental scanner,
+for LLM responses of 30 to 1000 lines streamed in 4-character chunks. Each
+response ends with a long loop, the worst case for the previous algorithm:
+the loop body stays in the buffer until the dedent arrives.
+
+Measures:
+- CPU time to split the whole response into statements
+"""
+
+import ast
+import re
+import time
+from typing import Optional
+
+from playbooks.compilation.expression_engine import preprocess_program
+from playbooks.execution.incremental_code_buffer import CodeBuffer
+
+CHUNK_SIZE = 4  # characters per streamed chunk, roughly one token
+
+
+class LegacyCodeBuffer:
+    """Reproduction of the previous parse-retry CodeBuffer."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def add_chunk(self, chunk: str):
+        self._buffer += chunk
+
+    def get_executable_prefix(self) -> Optional[str]:
+        if not self._buffer.strip():
+            return None
+        last_newline_pos = self._buffer.rfind("\n")
+        if last_newline_pos == -1:
+            return None
+        code = self._strip_code_block_markers(self._buffer[: last_newline_pos + 1])
+        if not code.strip():
+            return None
+        lines = code.split("\n")
+        last = None
+        for i in range(len(lines) - 1, -1, -1):
+            if lines[i].strip() and lines[i][0] not in (" ", "\t"):
+                last = i
+                break
+        if last is None:
+            return None
+        prefer_previous = False
+        for i in range(last - 1, -1, -1):
+            if lines[i].strip():
+                prefer_previous = lines[i][0] in (" ", "\t")
+                break
+        for end_idx in range(last, -1, -1):
+            if end_idx == last and last > 0 and prefer_previous:
+                prefix = "\n".join(lines[0:last])
+                if prefix.strip() and self._can_parse(prefix):
+                    return prefix.rstrip()
+            prefix = "\n".join(lines[0 : end_idx + 1])
+            if prefix.strip() and self._can_parse(prefix):
+                return prefix.rstrip()
+        return None
+
+    def consume_prefix(self, prefix: str):
+        stripped_buffer = self._strip_code_block_markers(self._buffer)
+        prefix_stripped = prefix.rstrip()
+        if stripped_buffer.startswith(prefix_stripped):
+            remaining = stripped_buffer[len(prefix_stripped) :]
+            self._buffer = remaining[1:] if remaining.startswith("\n") else remaining
+
+    def _strip_code_block_markers(self, code: str) -> str:
+        code = re.sub(r"^```(?:[a-z0-9_-]*)\n?", "", code.strip())
+        return re.sub(r"\n?```$", "", code)
+
+    def _can_parse(self, code: str) -> bool:
+        try:
+            return len(ast.parse(preprocess_program(code)).body) > 0
+        except SyntaxError:
+            return False
+
+
+def make_response(line_count: int) -> str:
+    """A fenced response: flat statements, then one loop filling half the lines."""
+    flat = line_count // 2
+    lines = ["```python", "# execution_id: 1", "# recap: benchmark"]
+    lines += [f'$value_{i} = await Lookup("item {i}")' for i in range(flat)]
+    lines.append("for item in $items:")
+    lines += [f'    await Say("user", f"Line {i}: {{item}}")' for i in range(flat)]
+    lines += ['await Yld("user")', "```", ""]
+    return "\n".join(lines)
+
+
+def time_split(buffer_cls, response: str) -> float:
+    """CPU seconds to stream response through buffer_cls as the executor does."""
+    buffer = buffer_cls()
+    chunks = [response[i : i + CHUNK_SIZE] for i in range(0, len(response), CHUNK_SIZE)]
+    start = time.process_time()
+    for chunk in chunks:
+        buffer.add_chunk(chunk)
+        if "\n" in chunk:
+            prefix = buffer.get_executable_prefix()
+            if prefix:
+                buffer.consume_prefix(prefix)
+    return time.process_time() - start
+
+
+def main() -> None:
+    print("=" * 60)
+    print("Streaming statement boundary detection")
+    print("=" * 60)
+    print(f"{'lines':>8} {'legacy (ms)':>14} {'incremental (ms)':>18} {'speedup':>9}")
+    for line_count in (30, 100, 300, 1000):
+        response = make_response(line_count)
+        legacy = time_split(LegacyCodeBuffer, response)
+        incremental = time_split(CodeBuffer, response)
+        print(
+            f"{line_count:>8} {legacy * 1000:>14.2f} {incremental * 1000:>18.2f} "
+            f"{legacy / incremental:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Performance benchmarks for building the interpreter prompt's code context.
+
+Compares rendering the Python code context from scratch on every LLM call
+(what happens without an agent-level PromptSectionCache) against reusing the
+renderings of unchanged values, for agents holding 100 to 1000 state
+variables and locals. Between calls a single state variable is replaced, as
+in a typical turn.
+
+Measures:
+- CPU time per call to InterpreterPrompt._build_context_prefix()
+"""
+
+import time
+from types import SimpleNamespace
+
+from box import Box
+
+from playbooks.execution.interpreter_prompt import InterpreterPrompt
+from playbooks.execution.prompt_sections import PromptSectionCache
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.state.call_stack import CallStack, CallStackFrame, InstructionPointer
+
+CALLS = 50
+
+
+class BenchmarkAgent:
+    """Just enough of an AIAgent to build a prompt."""
+
+    def __init__(self, variable_count: int):
+        self.id = "1000"
+        self.klass = "Benchmark"
+        self.state = Box(
+            {
+                f"note_{i}": f"note {i} " + "lorem ipsum " * 200
+                for i in range(variable_count)
+            }
+        )
+        self.namespace_manager = SimpleNamespace(namespace={})
+        self.call_stack = CallStack(EventBus("bench"))
+        frame = CallStackFrame(instruction_pointer=InstructionPointer("Main", "01", 1))
+        frame.locals = {
+            f"draft_{i}": "draft text " * 100 for i in range(variable_count // 10)
+        }
+        self.call_stack.push(frame)
+        self.meeting_manager = SimpleNamespace(
+            get_current_meeting_from_call_stack=lambda: None
+        )
+        self.owned_meetings = {}
+        self.joined_meetings = {}
+        self.active_meetings = []
+        self.prompt_sections = PromptSectionCache()
+
+    def to_dict(self):
+        return {"call_stack": ["Main:01"], "agents": ["Benchmark(agent 1000)"]}
+
+
+def time_calls(variable_count: int, reuse: bool) -> float:
+    """Mean CPU seconds per context build over CALLS turns."""
+    agent = BenchmarkAgent(variable_count)
+    elapsed = 0.0
+    for turn in range(CALLS):
+        agent.state.note_0 = f"updated on turn {turn}"
+        if not reuse:
+            agent.prompt_sections = PromptSectionCache()
+        prompt = InterpreterPrompt(
+            agent,
+            playbooks={},
+            current_playbook=None,
+            instruction="",
+            agent_instructions="",
+            artifacts_to_load=[],
+            agent_information="",
+            other_agent_klasses_information=[],
+        )
+        start = time.process_time()
+        prompt._build_context_prefix()
+        elapsed += time.process_time() - start
+    return elapsed / CALLS
+
+
+def main() -> None:
+    print("=" * 70)
+    print("Interpreter prompt code context")
+    print("=" * 70)
+    print(f"{'variables':>10} {'rebuild (ms)':>14} {'reuse (ms)':>12} {'speedup':>9}")
+    for variable_count in (100, 300, 1000):
+        rebuild = time_calls(variable_count, reuse=False)
+        reuse = time_calls(variable_count, reuse=True)
+        print(
+            f"{variable_count:>10} {rebuild * 1000:>14.2f} {reuse * 1000:>12.2f} "
+            f"{rebuild / reuse:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Performance benchmarks for LLM context compaction over a long session.
+
+Compares the previous compaction, which rendered every message of the call
+stack into fresh dictionaries on every LLM call, against LLMContextCompactor
+with its compacted prefix kept between calls, over a synthetic 500-turn
+session. Each turn adds a user message, an assistant response and an
+execution result, then compacts the whole history as InterpreterPrompt does
+before each LLM call.
+
+Measures:
+- CPU time per compaction at several points of the session
+- Memory allocated by one compaction late in the session
+"""
+
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from playbooks.llm.llm_context_compactor import LLMContextCompactor
+from playbooks.llm.messages import (
+    AssistantResponseLLMMessage,
+    ExecutionResultLLMMessage,
+    LLMMessage,
+    PlaybookImplementationLLMMessage,
+    SystemPromptLLMMessage,
+    UserInputLLMMessage,
+)
+
+TURNS = 500
+CHECKPOINTS = (50, 100, 250, 500)
+
+
+class LegacyCompactor:
+    """Reproduction of the previous full re-render on every call."""
+
+    keep_last_n_assistant_messages = 2
+
+    def compact_messages(self, messages: List[LLMMessage]) -> List[Dict[str, Any]]:
+        assistant_indices = [
+            i
+            for i, msg in enumerate(messages)
+            if isinstance(msg, AssistantResponseLLMMessage)
+        ]
+        user_indices = [
+            i for i, msg in enumerate(messages) if isinstance(msg, UserInputLLMMessage)
+        ]
+        keep_full = set(assistant_indices[-self.keep_last_n_assistant_messages :])
+        if user_indices:
+            keep_full.add(user_indices[-1])
+
+        result = []
+        for i, msg in enumerate(messages):
+            if isinstance(msg, (AssistantResponseLLMMessage, UserInputLLMMessage)):
+                if i in keep_full:
+                    result.append(msg.to_full_message())
+                else:
+                    result.append(msg.to_compact_message())
+            else:
+                result.append(msg.to_full_message())
+        return result
+
+
+def add_turn(messages: List[LLMMessage], turn: int) -> None:
+    """Append one turn: a user message, an assistant response and a result."""
+    messages.append(
+        UserInputLLMMessage(
+            about_you="Remember: You are Benchmark (agent 1000)",
+            instruction=f"Continue with step {turn}",
+            python_code_context="```python\n" + f"x_{turn} = {turn}\n" * 20 + "```",
+        )
+    )
+    messages.append(
+        AssistantResponseLLMMessage(
+            f"```python\n# execution_id: {turn}\n# recap: step {turn}\n"
+            + f'result = await self.Lookup("item {turn}")\n' * 5
+            + "```"
+        )
+    )
+    messages.append(ExecutionResultLLMMessage(f"item {turn}: " + "ok " * 100, "Main"))
+
+
+def run_session(compactor) -> Dict[int, float]:
+    """CPU seconds per compaction at each checkpoint turn (mean of 5 calls)."""
+    messages: List[LLMMessage] = [
+        SystemPromptLLMMessage(),
+        PlaybookImplementationLLMMessage("## Main\n- Do things", "Main"),
+    ]
+    timings = {}
+    for turn in range(1, TURNS + 1):
+        add_turn(messages, turn)
+        start = time.process_time()
+        compactor.compact_messages(messages)
+        elapsed = time.process_time() - start
+        if turn in CHECKPOINTS:
+            # A few more calls for a steadier reading; the history is unchanged
+            for _ in range(4):
+                start = time.process_time()
+                compactor.compact_messages(messages)
+                elapsed += time.process_time() - start
+            timings[turn] = elapsed / 5
+    return timings
+
+
+def allocated_per_call(compactor) -> int:
+    """Bytes allocated by the compaction after the last turn of a session."""
+    messages: List[LLMMessage] = [
+        SystemPromptLLMMessage(),
+        PlaybookImplementationLLMMessage("## Main\n- Do things", "Main"),
+    ]
+    for turn in range(1, TURNS):
+        add_turn(messages, turn)
+        compactor.compact_messages(messages)
+    add_turn(messages, TURNS)
+    tracemalloc.start()
+    result = compactor.compact_messages(messages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main() -> None:
+    print("=" * 70)
+    print(f"Context compaction over a {TURNS}-turn session")
+    print("=" * 70)
+    legacy = run_session(LegacyCompactor())
+    incremental = run_session(LLMContextCompactor())
+    print(f"{'turn':>6} {'legacy (ms)':>14} {'incremental (ms)':>18} {'speedup':>9}")
+    for turn in CHECKPOINTS:
+        print(
+            f"{turn:>6} {legacy[turn] * 1000:>14.3f} "
+            f"{incremental[turn] * 1000:>18.3f} "
+            f"{legacy[turn] / incremental[turn]:>8.1f}x"
+        )
+
+    legacy_bytes = allocated_per_call(LegacyCompactor())
+    incremental_bytes = allocated_per_call(LLMContextCompactor())
+    print()
+    print(f"Allocated by the compaction at turn {TURNS}:")
+    print(f"  legacy:      {legacy_bytes / 1024:>10.1f} KiB")
+    print(f"  incremental: {incremental_bytes / 1024:>10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Performance benchmarks for LLM completion streaming.
+
+Compares the legacy thread-per-stream design (a background thread feeding a
+queue.Queue that the event loop polls) against the native async path used by
+`_make_completion_request_stream`, at 1, 10 and 100 concurrent streams.
+
+Measures:
+- Time to first token
+- Inter-token latency
+- Total wall time
+- Peak thread count
+"""
+
+import asyncio
+import queue
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+from playbooks.utils import llm_helper
+
+TOKENS_PER_STREAM = 50
+TOKEN_INTERVAL = 0.005  # 200 tokens/sec per stream
+TIME_TO_FIRST_TOKEN = 0.05
+
+
+def _make_chunk(text: str):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+    )
+
+
+def fake_sync_completion(**kwargs):
+    """Blocking fake provider, as litellm.completion(stream=True) behaves."""
+    time.sleep(TIME_TO_FIRST_TOKEN)
+    for i in range(TOKENS_PER_STREAM):
+        yield _make_chunk(f"t{i} ")
+        time.sleep(TOKEN_INTERVAL)
+
+
+async def fake_async_completion(**kwargs):
+    """Non-blocking fake provider, as litellm.acompletion(stream=True) behaves."""
+
+    async def _stream():
+        for i in range(TOKENS_PER_STREAM):
+            yield _make_chunk(f"t{i} ")
+            await asyncio.sleep(TOKEN_INTERVAL)
+
+    await asyncio.sleep(TIME_TO_FIRST_TOKEN)
+    return _stream()
+
+
+async def legacy_thread_stream(completion_kwargs: dict):
+    """Reproduction of the previous thread + queue polling implementation."""
+    chunk_queue = queue.Queue()
+
+    def _stream_in_thread():
+        try:
+            for chunk in fake_sync_completion(**completion_kwargs):
+                content = chunk.choices[0].delta.content
+                if content is not None:
+                    chunk_queue.put(("chunk", content))
+            chunk_queue.put(("done", None))
+        except Exception as e:
+            chunk_queue.put(("error", e))
+
+    threading.Thread(target=_stream_in_thread, daemon=True).start()
+
+    while True:
+        try:
+            item_type, item_value = await asyncio.to_thread(
+                chunk_queue.get, timeout=0.1
+            )
+        except queue.Empty:
+            await asyncio.sleep(0.01)
+            continue
+
+        if item_type == "chunk":
+            yield item_value
+            await asyncio.sleep(0)
+        elif item_type == "error":
+            raise item_value
+        elif item_type == "done":
+            break
+
+
+class BenchmarkResults:
+    """Container for benchmark results."""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.first_token_latencies: List[float] = []
+        self.inter_token_latencies: List[float] = []
+        self.wall_time: float = 0
+        self.peak_threads: int = 0
+
+    def calculate_stats(self):
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "avg_ttft_ms": statistics.mean(self.first_token_latencies) * 1000,
+            "p99_ttft_ms": max(self.first_token_latencies) * 1000,
+            "avg_inter_token_ms": statistics.mean(self.inter_token_latencies) * 1000,
+            "wall_time_s": self.wall_time,
+            "peak_threads": self.peak_threads,
+        }
+
+
+async def _consume(stream, results: BenchmarkResults):
+    start = time.perf_counter()
+    last = None
+    async for _ in stream:
+        now = time.perf_counter()
+        if last is None:
+            results.first_token_latencies.append(now - start)
+        else:
+            results.inter_token_latencies.append(now - last)
+        last = now
+
+
+async def _run(name: str, make_stream, concurrency: int) -> BenchmarkResults:
+    results = BenchmarkResults(name, concurrency)
+    stop = asyncio.Event()
+
+    async def _watch_threads():
+        while not stop.is_set():
+            results.peak_threads = max(results.peak_threads, threading.active_count())
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(_watch_threads())
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[_consume(make_stream({"model": "fake"}), results) for _ in range(concurrency)]
+    )
+    results.wall_time = time.perf_counter() - start
+    stop.set()
+    await watcher
+    return results
+
+
+async def benchmark_thread_per_stream(concurrency: int) -> BenchmarkResults:
+    """Benchmark the legacy thread-per-stream implementation."""
+    return await _run("thread-per-stream", legacy_thread_stream, concurrency)
+
+
+async def benchmark_native_async(concurrency: int) -> BenchmarkResults:
+    """Benchmark the native async implementation in llm_helper."""
+    with patch.object(llm_helper, "acompletion", fake_async_completion):
+        return await _run(
+            "native async",
+            llm_helper._make_completion_request_stream,
+            concurrency,
+        )
+
+
+def print_results(results: List[BenchmarkResults]):
+    """Print benchmark results."""
+    print("\n" + "=" * 96)
+    print(
+        f"{'Implementation':<20} {'Streams':>8} {'Avg TTFT':>12} {'Max TTFT':>12} "
+        f"{'Inter-token':>13} {'Wall time':>11} {'Threads':>9}"
+    )
+    print("-" * 96)
+    for result in results:
+        stats = result.calculate_stats()
+        print(
+            f"{stats['name']:<20} {stats['concurrency']:>8} "
+            f"{stats['avg_ttft_ms']:>10.1f}ms {stats['p99_ttft_ms']:>10.1f}ms "
+            f"{stats['avg_inter_token_ms']:>11.2f}ms {stats['wall_time_s']:>10.2f}s "
+            f"{stats['peak_threads']:>9}"
+        )
+    print("=" * 96 + "\n")
+
+
+async def main():
+    """Run all benchmarks."""
+    print("Starting LLM streaming benchmarks...")
+    print(
+        f"Fake provider: {TIME_TO_FIRST_TOKEN * 1000:.0f}ms TTFT, "
+        f"{TOKENS_PER_STREAM} tokens at {TOKEN_INTERVAL * 1000:.0f}ms intervals\n"
+    )
+
+    results = []
+    for concurrency in (1, 10, 100):
+        print(f"Running {concurrency} concurrent stream(s)...")
+        results.append(await benchmark_thread_per_stream(concurrency))
+        results.append(await benchmark_native_async(concurrency))
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Performance benchmarks for loading compiled programs from the program cache.
+
+Compares parsing a compiled program (markdown_to_ast, then parsing every LLM
+playbook and compiling every python code block while the agent classes are
+built) against loading the parsed program from a warm .pbasm_cache entry.
+
+Measures:
+- CPU time to get the AST of a program with 2 to 40 agents
+- CPU time to build its agent classes, AST included
+- Size of the cache entry
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from playbooks.agents.agent_builder import AgentBuilder
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.compilation.program_cache import load_program_ast
+from playbooks.playbook.python_playbook import _compile_code_block
+
+REPEATS = 10
+
+AGENT = """# Agent{i}
+metadata:
+  model: claude-haiku-4-5
+---
+Agent number {i}
+
+```python
+@playbook
+async def Score{i}(text: str) -> int:
+    words = text.split()
+    return len(words) * {i}
+
+@playbook
+async def Tag{i}(text: str, tag: str = "x") -> str:
+    return f"{{tag}}:{{text}}"
+```
+
+## Main
+### Triggers
+- T1:BGN When program starts
+### Steps
+- 01:QUE Say(user, Ask what to review)
+- 02:CND While the user has documents
+  - 02.01:QUE $score = Score{i}(text=$document)
+  - 02.02:CND If $score is high
+    - 02.02.01:QUE $tag = Tag{i}(text=$document, tag="long")
+  - 02.03:QUE Say(user, Report $score)
+- 03:RET Done
+
+## Review($document)
+Review a document
+### Triggers
+- T1:CND When a document needs review
+### Steps
+- 01:EXE Read $document
+- 02:QUE $score = Score{i}(text=$document)
+- 03:RET $score
+
+## Summarize($document)
+execution_mode: react
+---
+Summarize a document in one paragraph
+"""
+
+
+def program_markdown(agent_count: int) -> str:
+    return "\n".join(AGENT.format(i=i) for i in range(agent_count))
+
+
+def cpu_ms(func) -> float:
+    start = time.process_time()
+    for _ in range(REPEATS):
+        func()
+    return (time.process_time() - start) / REPEATS * 1000
+
+
+async def build_ms(get_ast) -> float:
+    start = time.process_time()
+    for _ in range(REPEATS):
+        # As in a fresh process, no code block has been compiled yet
+        _compile_code_block.cache_clear()
+        await AgentBuilder.create_agent_classes_from_ast(get_ast())
+    return (time.process_time() - start) / REPEATS * 1000
+
+
+async def run() -> None:
+    print("=" * 70)
+    print("Loading a compiled program")
+    print("=" * 70)
+    print(
+        f"{'agents':>7} {'parse AST':>10} {'cached AST':>11} "
+        f"{'parse+build':>12} {'cached+build':>13} {'speedup':>8} {'entry':>9}"
+    )
+    for agent_count in (2, 10, 40):
+        markdown = program_markdown(agent_count)
+        path = f"/programs/review_{agent_count}.pbasm"
+        load_program_ast(markdown, path)  # Warm the cache
+
+        def parse():
+            return markdown_to_ast(markdown, source_file_path=path)
+
+        def cached():
+            return load_program_ast(markdown, path)
+
+        parse_ast = cpu_ms(parse)
+        cached_ast = cpu_ms(cached)
+        parse_build = await build_ms(parse)
+        cached_build = await build_ms(cached)
+        entry_kib = (
+            sum(entry.stat().st_size for entry in os.scandir(".pbasm_cache")) / 1024
+        )
+        print(
+            f"{agent_count:>7} {parse_ast:>8.2f}ms {cached_ast:>9.2f}ms "
+            f"{parse_build:>10.2f}ms {cached_build:>11.2f}ms "
+            f"{parse_build / cached_build:>7.1f}x {entry_kib:>6.0f}KiB"
+        )
+        for entry in os.scandir(".pbasm_cache"):
+            os.remove(entry.path)
+
+
+def main() -> None:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            asyncio.run(run())
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Performance benchmarks for Program initialization.
+
+Compares the previous initialization, which parsed program files one after
+another, gathered playbook discovery and then initialized agents one at a
+time, against the dependency-aware startup scheduler. Startup I/O is
+simulated: each agent's discovery waits as listing the tools of an MCP
+server would, and each agent's initialization waits as connecting to a
+remote agent would.
+
+Measures:
+- Wall time of Program.initialize for 2 to 16 agents in 4 program files
+- Wall time with startup_max_concurrency set to 4
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from playbooks.agents import AIAgent
+from playbooks.agents.local_ai_agent import LocalAIAgent
+from playbooks.config import config
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.program import AgentWarmPool, Program
+
+DISCOVERY_S = 0.05
+INITIALIZE_S = 0.02
+FILES = 4
+
+
+async def legacy_initialize(self: Program) -> None:
+    """Reproduction of the previous sequential initialization."""
+    for i in range(len(self.compiled_program_paths)):
+        # The compiled files were read again on every markdown_contents access
+        self._markdown_contents = None
+        self.agent_klasses.update(
+            await self._create_agent_classes(
+                self.markdown_contents[i], self._source_path(i)
+            )
+        )
+    self.agents = [
+        await self.create_agent(klass)
+        for klass in self.agent_klasses.values()
+        if klass.should_create_instance_at_start()
+    ]
+    self._setup_start_agents()
+    await asyncio.gather(
+        *[
+            agent.discover_playbooks()
+            for agent in self.agents
+            if isinstance(agent, AIAgent)
+        ],
+        return_exceptions=True,
+    )
+    for agent in self.agents:
+        await agent.initialize()
+    for klass in self.agent_klasses.values():
+        if AgentWarmPool.size(klass):
+            self.warm_pool.fill(klass)
+    self.initialized = True
+
+
+def write_program(directory: str, agent_count: int) -> list:
+    """Compiled program files with agent_count agents spread over FILES files."""
+    paths = []
+    for f in range(FILES):
+        markdown = "\n".join(
+            f"# Agent{i}\nAgent number {i}\n\n## Main\n### Triggers\n"
+            "- T1:BGN When program starts\n### Steps\n- 01:RET Done\n"
+            for i in range(f, agent_count, FILES)
+        )
+        path = os.path.join(directory, f"program{f}.pbasm")
+        with open(path, "w") as file:
+            file.write(markdown)
+        paths.append(path)
+    return paths
+
+
+def simulated_io(stack: ExitStack) -> None:
+    """Make discovery and initialization wait as network I/O would."""
+    discover = LocalAIAgent.discover_playbooks
+    initialize = AIAgent.initialize
+
+    async def slow_discover(self):
+        await asyncio.sleep(DISCOVERY_S)
+        await discover(self)
+
+    async def slow_initialize(self):
+        await asyncio.sleep(INITIALIZE_S)
+        await initialize(self)
+
+    stack.enter_context(patch.object(LocalAIAgent, "discover_playbooks", slow_discover))
+    stack.enter_context(patch.object(AIAgent, "initialize", slow_initialize))
+
+
+async def time_startup(paths: list, legacy: bool, max_concurrency=None) -> float:
+    with ExitStack() as stack:
+        simulated_io(stack)
+        stack.enter_context(
+            patch.object(config, "startup_max_concurrency", max_concurrency)
+        )
+        if legacy:
+            stack.enter_context(patch.object(Program, "initialize", legacy_initialize))
+        program = Program(EventBus("bench"), compiled_program_paths=paths)
+        start = time.perf_counter()
+        await program.initialize()
+        elapsed = time.perf_counter() - start
+    assert program.initialized
+    return elapsed
+
+
+async def run(directory: str) -> None:
+    print("=" * 70)
+    print(
+        f"Program startup ({DISCOVERY_S * 1000:.0f} ms discovery, "
+        f"{INITIALIZE_S * 1000:.0f} ms init per agent)"
+    )
+    print("=" * 70)
+    print(f"{'agents':>7} {'legacy (ms)':>13} {'scheduled (ms)':>16} {'speedup':>9}")
+    for agent_count in (2, 4, 8, 16):
+        paths = write_program(os.path.join(directory, str(agent_count)), agent_count)
+        legacy = await time_startup(paths, legacy=True)
+        scheduled = await time_startup(paths, legacy=False)
+        print(
+            f"{agent_count:>7} {legacy * 1000:>13.1f} {scheduled * 1000:>16.1f} "
+            f"{legacy / scheduled:>8.1f}x"
+        )
+
+    paths = write_program(os.path.join(directory, "capped"), 16)
+    capped = await time_startup(paths, legacy=False, max_concurrency=4)
+    print()
+    print(f"16 agents, startup_max_concurrency = 4: {capped * 1000:.1f} ms")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (2, 4, 8, 16):
+            os.makedirs(os.path.join(tmp, str(count)))
+        os.makedirs(os.path.join(tmp, "capped"))
+        asyncio.run(run(tmp))
+
+
+if __name__ == "__main__":
+    main()
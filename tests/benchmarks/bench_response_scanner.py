@@ -0,0 +1,138 @@
+"""
+Performance benchmarks for scanning streamed interpreter responses.
+
+Compares the previous per-chunk scan in PlaybookLLMExecution (appending to
+a string buffer, re-splitting it into lines until indentation is seen, and
+searching the whole unprocessed tail for Say() calls) against
+ResponseScanner, for responses of 1k to 10k tokens streamed one token or
+one character at a time. Each response ends with a long Say("user", ...)
+message, which the previous scan re-sliced from its start on every chunk.
+
+Measures:
+- CPU time to scan the whole response, including reading the assistant
+  message content once at the end of the turn
+"""
+
+import time
+from typing import List
+
+from playbooks.execution.response_scanner import ResponseScanner
+
+CHARS_PER_TOKEN = 4
+
+
+class LegacyScanner:
+    """Reproduction of the previous string-buffer scan (without the I/O)."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.content = ""
+        self.indented_code_detected = False
+        self.in_say_call = False
+        self.processed_up_to = 0
+        self.say_start_pos = 0
+        self.say_end_pattern = '")'
+        self.say_quote_type = None
+        self.current_say_content = ""
+        self.say_has_placeholders = False
+
+    def add_chunk(self, chunk: str) -> List[str]:
+        events = []
+        self.buffer += chunk
+        buffer = self.buffer
+        if not self.indented_code_detected and "\n" in buffer:
+            for line in buffer.split("\n")[:-1]:
+                if line and line[0] in (" ", "\t"):
+                    self.indented_code_detected = True
+                    break
+        # set_content() on every chunk
+        self.content = buffer
+
+        if not self.in_say_call:
+            pos = buffer.find('Say("', self.processed_up_to)
+            if pos != -1:
+                recipient_end = buffer.find('", "', pos + 5)
+                if recipient_end != -1:
+                    self.in_say_call = True
+                    self.say_start_pos = recipient_end + 4
+                    self.say_quote_type = None
+                    self.current_say_content = ""
+                    self.processed_up_to = self.say_start_pos
+
+        if self.in_say_call:
+            if self.say_quote_type is None:
+                if len(buffer) < self.say_start_pos + 3:
+                    return events
+                self.say_quote_type = "single"
+            end_pos = buffer.find(self.say_end_pattern, self.say_start_pos)
+            if end_pos != -1:
+                events.append(buffer[self.say_start_pos : end_pos])
+                self.in_say_call = False
+                self.processed_up_to = end_pos + 2
+            else:
+                available = buffer[self.say_start_pos :]
+                if "{" in available:
+                    self.say_has_placeholders = True
+                if available.endswith('"'):
+                    available = available[:-1]
+                if len(available) > len(self.current_say_content):
+                    events.append(available[len(self.current_say_content) :])
+                    self.current_say_content = available
+        return events
+
+
+def make_response(token_count: int) -> str:
+    """A fenced response: a few statements, then one long Say() message."""
+    lines = ["```python", "# execution_id: 1", "# recap: benchmark"]
+    lines += [f'self.state.value_{i} = await self.Lookup("item {i}")' for i in range(5)]
+    prefix = "\n".join(lines) + '\nawait self.Say("user", "'
+    suffix = '")\nawait self.Yield("user")\n```\n'
+    words = []
+    size = len(prefix) + len(suffix)
+    while size < token_count * CHARS_PER_TOKEN:
+        word = f"word{len(words)} "
+        words.append(word)
+        size += len(word)
+    return prefix + "".join(words) + suffix
+
+
+def time_scan(response: str, chunk_size: int, legacy: bool) -> float:
+    """CPU seconds to stream response through a scanner in chunk_size pieces."""
+    chunks = [response[i : i + chunk_size] for i in range(0, len(response), chunk_size)]
+    start = time.process_time()
+    if legacy:
+        scanner = LegacyScanner()
+        for chunk in chunks:
+            scanner.add_chunk(chunk)
+        content = scanner.content
+    else:
+        scanner = ResponseScanner(accept=lambda recipient: True)
+        for chunk in chunks:
+            scanner.add_chunk(chunk)
+        content = scanner.text
+    elapsed = time.process_time() - start
+    assert content == response
+    return elapsed
+
+
+def main() -> None:
+    print("=" * 70)
+    print("Streamed response scanning")
+    print("=" * 70)
+    print(
+        f"{'tokens':>8} {'chunk':>6} {'legacy (ms)':>14} {'scanner (ms)':>14} "
+        f"{'speedup':>9}"
+    )
+    for token_count in (1000, 3000, 10000):
+        response = make_response(token_count)
+        for chunk_size in (CHARS_PER_TOKEN, 1):
+            legacy = time_scan(response, chunk_size, legacy=True)
+            scanner = time_scan(response, chunk_size, legacy=False)
+            print(
+                f"{token_count:>8} {chunk_size:>6} {legacy * 1000:>14.2f} "
+                f"{scanner * 1000:>14.2f} {legacy / scanner:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
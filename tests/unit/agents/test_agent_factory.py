@@ -1,9 +1,11 @@
 """Tests for agent factory methods (get_or_create, get_all)."""
 
 import asyncio
+from collections import defaultdict
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+import pytest_asyncio
 
 from playbooks.agents.local_ai_agent import LocalAIAgent
 from playbooks.program import Program
@@ -63,7 +65,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach the real get_or_create_agent method
@@ -107,7 +109,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach real method
@@ -145,7 +147,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach real method
@@ -183,7 +185,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach real method
@@ -225,7 +227,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach real method
@@ -264,7 +266,7 @@ class TestGetOrCreate:
         mock_program.runtime.start_agent = AsyncMock()
 
         # Set up required attributes for get_or_create_agent
-        mock_program._agent_creation_lock = asyncio.Lock()
+        mock_program._agent_creation_locks = defaultdict(asyncio.Lock)
         mock_program.event_agents_changed = Mock()
 
         # Attach real method
@@ -324,3 +326,106 @@ class TestGetAll:
 
         assert result == [accountant]
         assert other_agent not in result
+
+
+WORKERS_PROGRAM = """# Worker
+metadata:
+  warm_pool: 2
+---
+A worker agent
+
+## Work
+### Steps
+- 01:RET Done
+
+# Reviewer
+A reviewer agent
+
+## Review
+### Steps
+- 01:RET Done
+"""
+
+
+@pytest_asyncio.fixture
+async def workers_program():
+    """An initialized program whose agents are never started."""
+    from playbooks.infrastructure.event_bus import EventBus
+
+    program = Program(EventBus("test"), program_content=WORKERS_PROGRAM)
+    await program.initialize()
+    program.runtime.start_agent = AsyncMock()
+    return program
+
+
+@pytest.mark.asyncio
+class TestCreationFastPath:
+    """Tests for warm agent pools and per-class creation locks."""
+
+    async def test_create_agent_takes_from_warm_pool(self, workers_program):
+        """Test agents are taken from the warm pool, which then refills."""
+        pool = workers_program.warm_pool._agents["Worker"]
+        assert len(pool) == 2
+        warm_agent = pool[0]
+
+        agent = await workers_program.create_agent("Worker", topic="a")
+
+        assert agent is warm_agent
+        assert agent.kwargs == {"topic": "a"}
+        assert workers_program.agents_by_id[agent.id] is agent
+        assert len(pool) == 1
+        await asyncio.sleep(0)
+        assert len(pool) == 2
+        assert agent not in pool
+
+    async def test_agent_ids_follow_creation_order(self, workers_program):
+        """Test pooled agents get the next agent ID when taken, not when built."""
+        first_id = int(workers_program.agent_id_registry.get_next_id()) + 1
+
+        agents = []
+        for klass in ["Worker", "Reviewer", "Worker", "Worker", "Reviewer"]:
+            agents.append(await workers_program.create_agent(klass))
+            await asyncio.sleep(0)  # Let the pool refill in between
+
+        assert [int(agent.id) for agent in agents] == list(
+            range(first_id, first_id + len(agents))
+        )
+        worker = agents[0]
+        assert worker.session_log.agent_id == worker.id
+        assert worker.call_stack.agent_id == worker.id
+        assert worker.meeting_manager.meeting_message_handler.agent_id == worker.id
+        assert worker.playbooks["Work"].agent_name == str(worker)
+
+    async def test_shutdown_clears_warm_pool(self, workers_program):
+        """Test pooled agents are released when the program shuts down."""
+        assert workers_program.warm_pool._agents["Worker"]
+
+        await workers_program.shutdown()
+
+        assert not workers_program.warm_pool._agents
+
+    async def test_classes_without_warm_pool_are_constructed(self, workers_program):
+        """Test classes without a warm pool construct agents on demand."""
+        assert "Reviewer" not in workers_program.warm_pool._agents
+
+        agent = await workers_program.create_agent("Reviewer")
+
+        assert agent.klass == "Reviewer"
+        assert workers_program.agents_by_id[agent.id] is agent
+
+    async def test_creation_locks_are_per_class(self, workers_program):
+        """Test creating an agent does not wait for other classes' creation."""
+        async with workers_program._agent_creation_locks["Reviewer"]:
+            agent = await asyncio.wait_for(
+                workers_program.get_or_create_agent("Worker"), timeout=5
+            )
+
+        assert agent.klass == "Worker"
+
+    async def test_invalid_warm_pool_size(self):
+        """Test a negative warm pool size is rejected."""
+        with pytest.raises(ValueError, match="Invalid warm pool size"):
+
+            class BadPool(LocalAIAgent):
+                klass = "BadPool"
+                metadata = {"warm_pool": -1}
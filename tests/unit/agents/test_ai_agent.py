@@ -1,5 +1,8 @@
+import asyncio
 from unittest.mock import Mock, patch
 
+import pytest
+
 from playbooks.agents.ai_agent import AIAgent
 from playbooks.infrastructure.event_bus import EventBus
 from playbooks.playbook.python_playbook import PythonPlaybook
@@ -56,3 +59,227 @@ def test_create_begin_playbook_multiple_bgn_playbooks(mock_create_playbooks):
 
     agent.create_begin_playbook()
     assert agent.bgn_playbook_name is not None
+
+
+SHARED_PLAYBOOKS_PROGRAM = """# Worker
+A worker agent
+
+```python
+@playbook
+async def WhoAmI() -> str:
+    return agent.id
+```
+
+## Main
+### Steps
+- 01:RET Done
+"""
+
+
+async def create_worker_class():
+    """Create the Worker agent class from markdown."""
+    from playbooks.agents.agent_builder import AgentBuilder
+    from playbooks.compilation.markdown_to_ast import markdown_to_ast
+
+    agent_klasses = await AgentBuilder.create_agent_classes_from_ast(
+        markdown_to_ast(SHARED_PLAYBOOKS_PROGRAM)
+    )
+    return agent_klasses["Worker"]
+
+
+@pytest.mark.asyncio
+async def test_instances_share_playbook_definitions():
+    """Test agent instances bind the class playbooks instead of copying them."""
+    worker_klass = await create_worker_class()
+    first = worker_klass(Mock(spec=EventBus))
+    second = worker_klass(Mock(spec=EventBus))
+
+    definition = worker_klass.playbooks["Main"]
+    for agent in (first, second):
+        main = agent.playbooks["Main"]
+        assert main is not definition
+        assert main.step_collection is definition.step_collection
+        assert main.triggers is definition.triggers
+        assert main.agent_name == str(agent)
+    assert first.playbooks["Main"].func is not second.playbooks["Main"].func
+
+
+@pytest.mark.asyncio
+async def test_playbook_assignment_is_local_to_instance():
+    """Test assigning a playbook attribute does not leak to other instances."""
+    worker_klass = await create_worker_class()
+    first = worker_klass(Mock(spec=EventBus))
+    second = worker_klass(Mock(spec=EventBus))
+
+    signature = worker_klass.playbooks["Main"].signature
+    first.playbooks["Main"].signature = "Main(topic: str) -> None"
+
+    assert second.playbooks["Main"].signature == signature
+    assert worker_klass.playbooks["Main"].signature == signature
+
+
+@pytest.mark.asyncio
+async def test_python_playbooks_run_in_own_namespace():
+    """Test python playbooks of each instance see that instance's namespace."""
+    worker_klass = await create_worker_class()
+    first = worker_klass(Mock(spec=EventBus))
+    second = worker_klass(Mock(spec=EventBus))
+
+    assert await first.playbooks["WhoAmI"].func() == first.id
+    assert await second.playbooks["WhoAmI"].func() == second.id
+    assert "self" not in worker_klass.namespace_manager.namespace
+
+
+@pytest.mark.asyncio
+async def test_begin_playbook_is_created_once_per_class():
+    """Test instances bind the begin playbook created for their class."""
+    worker_klass = await create_worker_class()
+    first = worker_klass(Mock(spec=EventBus))
+
+    with patch.object(
+        PythonPlaybook,
+        "create_playbooks_from_code_block",
+        side_effect=AssertionError("created again"),
+    ):
+        second = worker_klass(Mock(spec=EventBus))
+
+    name = first.bgn_playbook_name
+    assert second.bgn_playbook_name == name
+    first_begin = first.playbooks[name]
+    second_begin = second.playbooks[name]
+    assert first_begin.func.__code__ is second_begin.func.__code__
+    assert first_begin.func.__globals__ is first.namespace_manager.namespace
+    assert second_begin.func.__globals__ is second.namespace_manager.namespace
+    assert first_begin.agent_name == str(first)
+
+
+GLOBALS_PROGRAM = """# Counter
+A counting agent
+
+```python
+@playbook
+async def Remember() -> int:
+    global counter, statistics
+    import statistics
+    counter = 1
+    return counter
+```
+
+## Main
+### Steps
+- 01:RET Done
+"""
+
+
+@pytest.mark.asyncio
+async def test_global_writes_invalidate_namespace_views():
+    """Test `global` assignments in a playbook refresh the namespace's derived views."""
+    from playbooks.agents.agent_builder import AgentBuilder
+    from playbooks.compilation.markdown_to_ast import markdown_to_ast
+    from playbooks.execution.interpreter_prompt import _namespace_imports
+    from playbooks.execution.python_executor import _layer_agent_namespace
+
+    agent_klasses = await AgentBuilder.create_agent_classes_from_ast(
+        markdown_to_ast(GLOBALS_PROGRAM)
+    )
+    agent = agent_klasses["Counter"](Mock(spec=EventBus))
+    namespace = agent.namespace_manager.namespace
+    assert "counter" not in namespace.derived("execution", _layer_agent_namespace)
+    assert "import statistics" not in namespace.derived("imports", _namespace_imports)
+
+    assert await agent.playbooks["Remember"].execute() == 1
+
+    assert namespace["counter"] == 1
+    assert namespace.derived("execution", _layer_agent_namespace)["counter"] == 1
+    assert "import statistics" in namespace.derived("imports", _namespace_imports)
+
+
+@pytest.mark.asyncio
+async def test_playbooks_without_global_writes_keep_namespace_views():
+    """Test calling a playbook that writes no globals keeps the namespace version."""
+    worker = (await create_worker_class())(Mock(spec=EventBus))
+    namespace = worker.namespace_manager.namespace
+    version = namespace.version
+
+    assert await worker.playbooks["WhoAmI"].execute() == worker.id
+
+    assert namespace.version == version
+
+
+async def create_parallel_worker():
+    """A Worker with a caller frame on its call stack."""
+    from playbooks.state.call_stack import CallStackFrame, InstructionPointer
+
+    worker = (await create_worker_class())(Mock(spec=EventBus))
+    caller = CallStackFrame(InstructionPointer("Main", "01", 1))
+    worker.call_stack.push(caller)
+    return worker, caller
+
+
+async def pushing_call(worker, name: str, delay: float, events: list, fail=False):
+    """A call that leaves its own frame pushed, as a playbook in progress does."""
+    from playbooks.state.call_stack import CallStackFrame, InstructionPointer
+
+    worker.call_stack.push(CallStackFrame(InstructionPointer(name, "01", 1)))
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        events.append(f"{name} cancelled")
+        raise
+    if fail:
+        raise ValueError(name)
+    events.append(f"{name} done")
+    return name
+
+
+@pytest.mark.asyncio
+async def test_parallel_returns_results_in_argument_order():
+    """Test Parallel returns results in call order, not completion order."""
+    worker, caller = await create_parallel_worker()
+    events = []
+
+    results = await worker.Parallel(
+        pushing_call(worker, "Slow", 0.03, events),
+        pushing_call(worker, "Fast", 0, events),
+    )
+
+    assert results == ["Slow", "Fast"]
+    assert events == ["Fast done", "Slow done"]
+    assert worker.call_stack.frames == [caller]
+
+
+@pytest.mark.asyncio
+async def test_parallel_failure_cancels_sibling_calls():
+    """Test a failing call cancels the calls still running before raising."""
+    worker, caller = await create_parallel_worker()
+    events = []
+
+    with pytest.raises(ValueError, match="Broken"):
+        await worker.Parallel(
+            pushing_call(worker, "Long", 10, events),
+            pushing_call(worker, "Broken", 0, events, fail=True),
+        )
+
+    assert events == ["Long cancelled"]
+    assert worker.call_stack.frames == [caller]
+    assert worker.call_stack.peek() is caller
+
+
+@pytest.mark.asyncio
+async def test_llm_call_priority_follows_human_conversation():
+    """Test only turns of agents talking to a human use the INTERACTIVE lane."""
+    from playbooks.core.enums import LLMCallPriority
+    from playbooks.execution.playbook import PlaybookLLMExecution
+
+    worker = (await create_worker_class())(Mock(spec=EventBus))
+    execution = PlaybookLLMExecution(worker, worker.playbooks["Main"])
+
+    # An agent that has never talked to a human
+    assert execution._llm_call_priority() == LLMCallPriority.AGENT
+
+    with patch.object(worker, "_say_without_streaming"):
+        await worker._say_direct("human", "Hello")
+        assert execution._llm_call_priority() == LLMCallPriority.INTERACTIVE
+
+        await worker._say_direct("1001", "Over to you")
+        assert execution._llm_call_priority() == LLMCallPriority.AGENT
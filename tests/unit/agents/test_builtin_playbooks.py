@@ -0,0 +1,65 @@
+"""Tests for the built-in playbooks."""
+
+from unittest.mock import patch
+
+import pytest
+
+from playbooks.agents.builtin_playbooks import (
+    BUILTIN_PLAYBOOKS_PBASM_PATH,
+    BuiltinPlaybooks,
+)
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.playbook import LLMPlaybook
+
+
+def h2_titles(markdown):
+    """Titles of the H2 sections of the first H1 in markdown."""
+    h1 = next(
+        node for node in markdown_to_ast(markdown)["children"] if node["type"] == "h1"
+    )
+    return [node["text"] for node in h1["children"] if node["type"] == "h2"]
+
+
+def test_shipped_pbasm_is_compiled_from_current_markdown():
+    """Test the shipped .pbasm matches the markdown it was compiled from."""
+    compiled = BuiltinPlaybooks.load_compiled_llm_playbooks()
+
+    assert compiled is not None, (
+        f"Recompile {BUILTIN_PLAYBOOKS_PBASM_PATH} after changing "
+        "BuiltinPlaybooks.get_llm_playbooks_markdown()"
+    )
+    assert h2_titles(compiled) == h2_titles(
+        BuiltinPlaybooks.get_llm_playbooks_markdown()
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_playbooks_load_without_compiling():
+    """Test the LLM playbooks come from the shipped .pbasm, once per process."""
+    with patch(
+        "playbooks.agents.builtin_playbooks.Compiler",
+        side_effect=AssertionError("compiled"),
+    ):
+        first = await BuiltinPlaybooks.get_llm_playbooks_ast_nodes()
+        second = await BuiltinPlaybooks.get_llm_playbooks_ast_nodes()
+
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+    assert first[0]["source_file_path"] == BUILTIN_PLAYBOOKS_PBASM_PATH
+
+    playbooks = [LLMPlaybook.from_h2(node) for node in first]
+    assert [playbook.name for playbook in playbooks] == [
+        "ResolveDescriptionPlaceholders",
+        "ProcessMessages",
+    ]
+    assert all(playbook.hidden for playbook in playbooks)
+    assert len(playbooks[1].step_collection) > 0
+
+
+def test_python_playbooks_are_parsed_once():
+    """Test the python playbooks AST nodes are shared between calls."""
+    first = BuiltinPlaybooks.get_python_playbooks_ast_nodes()
+    second = BuiltinPlaybooks.get_python_playbooks_ast_nodes()
+
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
@@ -0,0 +1,62 @@
+"""Tests for agent namespace management."""
+
+import json
+
+from playbooks.agents.namespace_manager import (
+    AgentNamespaceManager,
+    VersionedNamespace,
+)
+
+
+class TestVersionedNamespace:
+    """Test version tracking and derived views."""
+
+    def test_mutations_advance_version(self):
+        namespace = VersionedNamespace()
+        versions = [namespace.version]
+
+        namespace["a"] = 1
+        versions.append(namespace.version)
+        namespace.update(b=2)
+        versions.append(namespace.version)
+        namespace.setdefault("c", 3)
+        versions.append(namespace.version)
+        del namespace["a"]
+        versions.append(namespace.version)
+        namespace.pop("b")
+        versions.append(namespace.version)
+
+        assert versions == sorted(set(versions))
+        assert namespace == {"c": 3}
+
+    def test_derived_view_rebuilt_only_after_change(self):
+        namespace = VersionedNamespace(a=1)
+        builds = []
+
+        def keys(ns):
+            builds.append(ns.version)
+            return sorted(ns)
+
+        assert namespace.derived("keys", keys) == ["a"]
+        assert namespace.derived("keys", keys) == ["a"]
+        namespace["b"] = 2
+        assert namespace.derived("keys", keys) == ["a", "b"]
+        assert len(builds) == 2
+
+    def test_global_assignment_needs_mark_changed(self):
+        namespace = VersionedNamespace()
+        exec("def remember():\n    global x\n    x = 1", namespace)
+        keys = namespace.derived("keys", sorted)
+        version = namespace.version
+
+        namespace["remember"]()  # STORE_GLOBAL skips __setitem__
+        assert namespace["x"] == 1
+        assert namespace.version == version
+        namespace.mark_changed()
+        assert namespace.derived("keys", sorted) == sorted(keys + ["x"])
+
+    def test_manager_wraps_namespace(self):
+        manager = AgentNamespaceManager(namespace={"json": json})
+
+        assert isinstance(manager.namespace, VersionedNamespace)
+        assert manager.namespace["json"] is json
@@ -0,0 +1,164 @@
+"""Tests for the binary cache of parsed programs."""
+
+from unittest.mock import patch
+
+import pytest
+
+from playbooks.agents.agent_builder import AgentBuilder
+from playbooks.compilation import program_cache
+from playbooks.compilation.markdown_to_ast import markdown_to_ast
+from playbooks.compilation.program_cache import load_program_ast, program_cache_key
+from playbooks.playbook import LLMPlaybook, PythonPlaybook
+
+PROGRAM = """# Librarian
+metadata:
+  role: archive
+---
+A librarian agent
+
+```python
+@playbook
+async def Shelve(book: str) -> str:
+    return f"shelved {book}"
+```
+
+## Main
+### Triggers
+- T1:BGN When program starts
+### Steps
+- 01:QUE Say(user, Ask for a book title)
+- 02:CND If the user gave a title
+  - 02.01:QUE $result = Shelve(book=$title)
+- 03:RET Done
+
+## Lookup($title)
+execution_mode: react
+---
+Find a book by title
+"""
+
+
+def describe(agent_klasses):
+    """Everything agent class creation derives from the AST, in comparable form."""
+    result = {}
+    for name, klass in agent_klasses.items():
+        playbooks = {}
+        for playbook in klass.playbooks.values():
+            if isinstance(playbook, LLMPlaybook):
+                steps = playbook.step_collection
+                playbooks[playbook.name] = (
+                    playbook.signature,
+                    playbook.description,
+                    playbook.metadata,
+                    playbook.markdown,
+                    playbook.source_line_number,
+                    (
+                        [str(t) for t in playbook.triggers.triggers]
+                        if playbook.triggers
+                        else None
+                    ),
+                    steps.ordered_line_numbers if steps else None,
+                )
+            else:
+                playbooks[playbook.name] = (
+                    playbook.code,
+                    playbook.source_line_number,
+                    playbook.source_file_path,
+                )
+        result[name] = (klass.description, klass.metadata, playbooks)
+    return result
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / ".pbasm_cache"
+
+
+@pytest.mark.asyncio
+async def test_cached_program_builds_the_same_agents(cache_dir):
+    """Test agents built from a cache entry match agents built from markdown."""
+    expected = describe(
+        await AgentBuilder.create_agent_classes_from_ast(
+            markdown_to_ast(PROGRAM, source_file_path="/p/library.pb")
+        )
+    )
+
+    # First load parses and writes the entry, second load only unpickles it
+    first = await AgentBuilder.create_agent_classes_from_ast(
+        load_program_ast(PROGRAM, "/p/library.pb", cache_dir=cache_dir)
+    )
+    assert len(list(cache_dir.glob("*.pbir"))) == 1
+    with (
+        patch.object(
+            program_cache, "markdown_to_ast", side_effect=AssertionError("parsed")
+        ),
+        patch.object(
+            LLMPlaybook, "from_h2", side_effect=LLMPlaybook.from_h2
+        ) as from_h2,
+        patch.object(
+            PythonPlaybook,
+            "compile_code_block",
+            side_effect=PythonPlaybook.compile_code_block,
+        ) as compile_code_block,
+    ):
+        second = await AgentBuilder.create_agent_classes_from_ast(
+            load_program_ast(PROGRAM, "/p/library.pb", cache_dir=cache_dir)
+        )
+
+    # Only the built-in playbooks added to every agent class are parsed
+    parsed = [call.args[0]["text"] for call in from_h2.call_args_list]
+    assert "Main" not in parsed and "Lookup($title)" not in parsed
+    compiled = [call.args[0] for call in compile_code_block.call_args_list]
+    assert not any("Shelve" in code for code in compiled)
+
+    assert describe(first) == expected
+    assert describe(second) == expected
+    shelve = second["Librarian"].playbooks["Shelve"]
+    assert await shelve.func("dune") == "shelved dune"
+
+
+@pytest.mark.asyncio
+async def test_precompiled_playbooks_are_used_once(cache_dir):
+    """Test two classes built from one AST never share playbook objects."""
+    ast = load_program_ast(PROGRAM, cache_dir=cache_dir)
+    main = next(
+        node
+        for node in ast["children"][0]["children"]
+        if node["type"] == "h2" and node["text"] == "Main"
+    )
+    assert isinstance(main["playbook"], LLMPlaybook)
+
+    first = await AgentBuilder.create_agent_classes_from_ast(ast)
+    assert "playbook" not in main
+
+    second = await AgentBuilder.create_agent_classes_from_ast(
+        load_program_ast(PROGRAM, cache_dir=cache_dir)
+    )
+    assert (
+        first["Librarian"].playbooks["Main"]
+        is not second["Librarian"].playbooks["Main"]
+    )
+
+
+def test_key_covers_content_source_path_and_version():
+    """Test entries are not shared across contents, source paths or versions."""
+    key = program_cache_key(PROGRAM, "/p/library.pb")
+
+    assert program_cache_key(PROGRAM, "/p/library.pb") == key
+    assert program_cache_key(PROGRAM + "\n", "/p/library.pb") != key
+    assert program_cache_key(PROGRAM, "/q/library.pb") != key
+    with patch.object(program_cache, "_version_salt", return_value="1:9.9.9"):
+        assert program_cache_key(PROGRAM, "/p/library.pb") != key
+
+
+def test_unreadable_entry_is_replaced(cache_dir):
+    """Test a corrupt entry is parsed again and overwritten."""
+    load_program_ast(PROGRAM, cache_dir=cache_dir)
+    (entry,) = cache_dir.glob("*.pbir")
+    entry.write_bytes(b"truncated")
+
+    ast = load_program_ast(PROGRAM, cache_dir=cache_dir)
+
+    assert ast["children"][0]["text"] == "Librarian"
+    assert entry.read_bytes() != b"truncated"
+    assert list(cache_dir.glob("*.pbir")) == [entry]
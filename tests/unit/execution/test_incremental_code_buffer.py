@@ -95,12 +95,11 @@ class TestCodeBuffer:
         # Now add line with lower indent
         buffer.add_chunk("print('i done')\n")
 
-        # Now the for loop is complete and executable
+        # Now the for loop is complete, and so is the line that closed it
         prefix = buffer.get_executable_prefix()
         assert prefix is not None
-        assert "for i in range(3):" in prefix
-        assert "print('j done')" in prefix
-        assert "print('i done')" not in prefix  # Not part of for loop
+        assert prefix.startswith("for i in range(3):")
+        assert "print('j done')\nprint('i done')" in prefix
 
     def test_simple_for_loop(self, buffer):
         """Test a simple for loop."""
@@ -114,9 +113,7 @@ class TestCodeBuffer:
 
         # Now it's executable
         prefix = buffer.get_executable_prefix()
-        assert "for i in range(3):" in prefix
-        assert "print(i)" in prefix
-        assert "print('done')" not in prefix
+        assert prefix == "for i in range(3):\n  print(i)\nprint('done')"
 
     def test_if_statement(self, buffer):
         """Test if statement completion detection."""
@@ -130,13 +127,8 @@ class TestCodeBuffer:
         buffer.add_chunk("else:\n")
         buffer.add_chunk("  result = 'small'\n")
 
-        # Now we have a complete if/else (even though else block ends with indent)
-        # The 'else:' at column 0 closes the if block, making it executable
-        prefix = buffer.get_executable_prefix()
-        assert "x = 10" in prefix
-        assert "if x > 5:" in prefix
-        assert "result = 'big'" in prefix
-        # Note: else block is included even though it ends with indentation
+        # 'else:' continues the if statement rather than closing it
+        assert buffer.get_executable_prefix() == "x = 10"
 
         buffer.add_chunk("print(result)\n")
 
@@ -145,7 +137,7 @@ class TestCodeBuffer:
         assert "if x > 5:" in prefix
         assert "else:" in prefix
         assert "result = 'small'" in prefix
-        assert "print(result)" not in prefix
+        assert prefix.endswith("print(result)")
 
     def test_function_definition(self, buffer):
         """Test function definition completion detection."""
@@ -162,7 +154,7 @@ class TestCodeBuffer:
         prefix = buffer.get_executable_prefix()
         assert "def add(a, b):" in prefix
         assert "return a + b" in prefix
-        assert "result = add(3, 4)" not in prefix
+        assert prefix.endswith("result = add(3, 4)")
 
     def test_code_block_markers_stripped(self, buffer):
         """Test that ```python and ``` markers are stripped."""
@@ -340,7 +332,7 @@ class TestCodeBuffer:
 
         prefix = buffer.get_executable_prefix()
         assert "class MyClass:" in prefix
-        assert "obj = MyClass()" not in prefix
+        assert prefix.endswith("obj = MyClass()")
 
     def test_try_except_block(self, buffer):
         """Test try-except block completion."""
@@ -357,7 +349,7 @@ class TestCodeBuffer:
         prefix = buffer.get_executable_prefix()
         assert "try:" in prefix
         assert "except:" in prefix
-        assert "print(x)" not in prefix
+        assert prefix.endswith("print(x)")
 
     def test_list_comprehension(self, buffer):
         """Test list comprehension."""
@@ -430,3 +422,71 @@ class TestCodeBuffer:
         assert "x = 10" not in remaining
         assert "y = 20" not in remaining
         assert "z = (1 + 2" in remaining
+
+    def test_colon_inside_string_does_not_open_block(self, buffer):
+        """Test that brackets, colons and quotes inside strings are ignored."""
+        buffer.add_chunk('await Say("user", "Options: (a), [b] or {c}:")\n')
+
+        prefix = buffer.get_executable_prefix()
+
+        assert prefix == 'await Say("user", "Options: (a), [b] or {c}:")'
+
+    def test_comment_at_column_zero_does_not_close_block(self, buffer):
+        """Test that a comment does not end an indented block."""
+        buffer.add_chunk("for i in range(3):\n")
+        buffer.add_chunk("# still in the loop\n")
+        buffer.add_chunk("  print(i)\n")
+
+        assert buffer.get_executable_prefix() is None
+
+    def test_decorator_stays_with_definition(self, buffer):
+        """Test that a decorated definition is returned as one statement."""
+        buffer.add_chunk("@staticmethod\n")
+        buffer.add_chunk("def helper():\n")
+        buffer.add_chunk("  return 1\n")
+
+        assert buffer.get_executable_prefix() is None
+
+        buffer.add_chunk("x = helper()\n")
+
+        prefix = buffer.get_executable_prefix()
+        assert prefix.startswith("@staticmethod\ndef helper():")
+
+    def test_one_line_if_waits_for_else(self, buffer):
+        """Test that a one-line if is held until its else clause is known."""
+        buffer.add_chunk("if x: y = 1\n")
+
+        assert buffer.get_executable_prefix() is None
+
+        buffer.add_chunk("else: y = 2\n")
+        buffer.add_chunk("z = y\n")
+
+        assert buffer.get_executable_prefix() == "if x: y = 1\nelse: y = 2\nz = y"
+
+    def test_escaped_quotes_and_line_continuation(self, buffer):
+        """Test escaped quotes and backslash continuations."""
+        buffer.add_chunk('x = "a \\" (" + \\\n')
+
+        assert buffer.get_executable_prefix() is None
+
+        buffer.add_chunk('  "b"\n')
+
+        assert buffer.get_executable_prefix() == 'x = "a \\" (" + \\\n  "b"'
+
+    def test_close_completes_trailing_block(self, buffer):
+        """Test that closing the buffer completes a block left open at the end."""
+        buffer.add_chunk("for i in range(3):\n")
+        buffer.add_chunk("  print(i)")
+
+        buffer.close()
+
+        assert buffer.get_executable_prefix() == "for i in range(3):\n  print(i)"
+
+    def test_close_keeps_truncated_statement(self, buffer):
+        """Test that closing the buffer does not complete an unclosed bracket."""
+        buffer.add_chunk("x = 10\n")
+        buffer.add_chunk("y = (1 +")
+
+        buffer.close()
+
+        assert buffer.get_executable_prefix() == "x = 10"
@@ -1,14 +1,25 @@
 """Tests for InterpreterPrompt class."""
 
+import json
 import types
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from box import Box
 
+from playbooks.agents.namespace_manager import VersionedNamespace
+from playbooks.execution import interpreter_prompt as interpreter_prompt_module
 from playbooks.execution.interpreter_prompt import InterpreterPrompt, SetEncoder
+from playbooks.execution.prompt_sections import PromptSectionCache
 from playbooks.infrastructure.event_bus import EventBus
-from playbooks.llm.messages import AssistantResponseLLMMessage, UserInputLLMMessage
+from playbooks.llm.llm_context_compactor import CompactionConfig, LLMContextCompactor
+from playbooks.llm.messages import (
+    AssistantResponseLLMMessage,
+    ExecutionResultLLMMessage,
+    PlaybookImplementationLLMMessage,
+    SystemPromptLLMMessage,
+    UserInputLLMMessage,
+)
 from playbooks.state.call_stack import CallStack, CallStackFrame, InstructionPointer
 
 
@@ -450,6 +461,28 @@ class TestInterpreterPromptHelpers:
         result = prompt._extract_imports()
         assert result == sorted(result)
 
+    def test_extract_imports_tracks_versioned_namespace(self):
+        """Test _extract_imports reflects changes to a versioned namespace."""
+        import json
+
+        namespace = VersionedNamespace({"json": json})
+        agent = MockAgent()
+        agent.namespace_manager.namespace = namespace
+        prompt = InterpreterPrompt(
+            agent=agent,
+            playbooks={},
+            current_playbook=None,
+            instruction="Test",
+            agent_instructions="",
+            artifacts_to_load=[],
+            agent_information="",
+            other_agent_klasses_information=[],
+        )
+
+        assert "import json" in prompt._extract_imports()
+        namespace["js"] = namespace.pop("json")
+        assert "import json as js" in prompt._extract_imports()
+
 
 class TestBuildContextPrefix:
     """Test suite for _build_context_prefix method."""
@@ -653,6 +686,119 @@ class TestBuildContextPrefix:
         # Should end with code block close and double newline
         assert result.endswith("```\n\n")
 
+    def test_context_prefix_state_matches_json_dumps(self):
+        """Test state rendered entry by entry matches a single json.dumps."""
+        agent = MockAgent()
+        agent.state.count = 42
+        agent.state.notes = "line 1\nline 2 — ünïcode"
+        agent.state.nested = {"a": [1, {"b": None}], "tags": {"x"}}
+        agent.state.empty = {}
+
+        prompt = InterpreterPrompt(
+            agent=agent,
+            playbooks={},
+            current_playbook=None,
+            instruction="Test",
+            agent_instructions="",
+            artifacts_to_load=[],
+            agent_information="",
+            other_agent_klasses_information=[],
+        )
+
+        expected = json.dumps(
+            dict(agent.state), indent=2, cls=SetEncoder, ensure_ascii=False
+        )
+        assert f"self.state: Box = Box({expected})" in prompt._build_context_prefix()
+
+    def test_context_prefix_reuses_agent_prompt_sections(self):
+        """Test unchanged values reuse their rendering across calls."""
+        agent = MockAgent()
+        agent.prompt_sections = PromptSectionCache()
+        agent.state.document = "x" * 10_000
+        agent.state.entries = [1, 2]
+
+        def build():
+            return InterpreterPrompt(
+                agent=agent,
+                playbooks={},
+                current_playbook=None,
+                instruction="Test",
+                agent_instructions="",
+                artifacts_to_load=[],
+                agent_information="",
+                other_agent_klasses_information=[],
+            )._build_context_prefix()
+
+        build()
+        with patch(
+            "playbooks.execution.interpreter_prompt._render_json_member",
+            wraps=interpreter_prompt_module._render_json_member,
+        ) as render:
+            # Mutable containers are rendered again since they may have
+            # changed in place
+            agent.state.entries.append(3)
+            result = build()
+            assert [c.args[0] for c in render.call_args_list] == ["entries"]
+            assert '"entries": [\n    1,\n    2,\n    3\n  ]' in result
+
+            render.reset_mock()
+            agent.state.document = "y" * 10_000
+            build()
+            assert [c.args[0] for c in render.call_args_list] == [
+                "document",
+                "entries",
+            ]
+
+
+class TestPromptSectionCache:
+    """Test suite for PromptSectionCache."""
+
+    def test_reuses_immutable_values_by_identity(self):
+        """Test entries with the same immutable value are not re-rendered."""
+        cache = PromptSectionCache()
+        render = Mock(side_effect=lambda key, value: f"{key}={value}")
+        value = "v" * 100
+
+        assert cache.render_entries("s", [("a", value)], render) == [f"a={value}"]
+        assert cache.render_entries("s", [("a", value)], render) == [f"a={value}"]
+        assert render.call_count == 1
+
+    def test_rerenders_mutable_and_changed_values(self):
+        """Test mutable containers and replaced values are rendered again."""
+        cache = PromptSectionCache()
+        render = Mock(side_effect=lambda key, value: f"{key}={value}")
+        items = [1]
+
+        cache.render_entries("s", [("items", items), ("n", 1)], render)
+        items.append(2)
+        result = cache.render_entries("s", [("items", items), ("n", 2)], render)
+
+        assert result == ["items=[1, 2]", "n=2"]
+        assert render.call_count == 4
+
+    def test_drops_entries_missing_from_the_source(self):
+        """Test entries not rendered in the last call are forgotten."""
+        cache = PromptSectionCache()
+        render = Mock(side_effect=lambda key, value: f"{key}={value}")
+        value = "value"
+
+        cache.render_entries("s", [("a", value)], render)
+        cache.render_entries("s", [], render)
+        cache.render_entries("s", [("a", value)], render)
+
+        assert render.call_count == 2
+
+    def test_sections_are_independent(self):
+        """Test the same key in different sections is cached separately."""
+        cache = PromptSectionCache()
+        render = Mock(side_effect=lambda key, value: f"{key}={value}")
+        value = "value"
+
+        cache.render_entries("state", [("a", value)], render)
+        cache.render_entries("locals", [("a", value)], render)
+
+        assert render.call_count == 2
+
 
 class TestAddArtifactHints:
     """Test suite for _add_artifact_hints method."""
@@ -1086,6 +1232,55 @@ class TestInterpreterPromptCompaction:
         assert "Test agent instructions" in messages[6]["content"]
         assert "Test instruction" in messages[6]["content"]
 
+    def test_cache_breakpoints_after_dropping_history(self):
+        """Test breakpoints are still planned once the token budget drops spans."""
+        event_bus = EventBus("test-session")
+        call_stack = CallStack(event_bus, "test-agent")
+        call_stack.push(
+            CallStackFrame(
+                instruction_pointer=InstructionPointer(
+                    playbook="Main", line_number="01", source_line_number=1
+                )
+            )
+        )
+        call_stack.add_llm_message(SystemPromptLLMMessage())
+        call_stack.add_llm_message(
+            PlaybookImplementationLLMMessage("## Main\n- Do things", "Main")
+        )
+        for i in range(20):
+            call_stack.add_llm_message(UserInputLLMMessage(instruction=f"Step {i}"))
+            call_stack.add_llm_message(
+                AssistantResponseLLMMessage(f"# execution_id: {i}\n# recap: {i}")
+            )
+            call_stack.add_llm_message(
+                ExecutionResultLLMMessage(f"result {i} " + "x" * 2000, "Main")
+            )
+        call_stack.add_llm_message(UserInputLLMMessage(instruction="Continue"))
+
+        agent = MockAgent(call_stack=call_stack)
+        agent.context_compactor = LLMContextCompactor(
+            CompactionConfig(token_budget=4000, summary_span_messages=6)
+        )
+        prompt = InterpreterPrompt(
+            agent=agent,
+            playbooks={},
+            current_playbook=None,
+            instruction="Continue",
+            agent_instructions="Test agent instructions",
+            artifacts_to_load=[],
+            agent_information="Test agent info",
+            other_agent_klasses_information=[],
+            execution_id=1,
+        )
+
+        messages = prompt.messages
+
+        assert len(messages) < len(call_stack.get_llm_message_objects())
+        marked = [i for i, m in enumerate(messages) if "cache_control" in m]
+        # End of the system prompt, and of the history the next call resends
+        assert marked[0] == 0
+        assert marked[-1] == len(messages) - 7
+
     def test_compaction_disabled_returns_full_messages(self):
         """Test that when compaction is disabled, all messages are returned in full."""
 
@@ -0,0 +1,57 @@
+"""Tests for ReAct execution."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from playbooks.agents import AIAgent
+from playbooks.execution.react import ReActLLMExecution
+
+
+def make_execution():
+    """A ReAct execution of a playbook without steps."""
+    playbook = Mock()
+    playbook.name = "Solver"
+    playbook.step_collection = None
+    return ReActLLMExecution(Mock(spec=AIAgent), playbook)
+
+
+class TestReactSteps:
+    """Test adding the precompiled ReAct loop steps."""
+
+    @pytest.mark.asyncio
+    async def test_adds_precompiled_steps(self):
+        """Test a playbook without steps gets the ReAct loop."""
+        execution = make_execution()
+        assert not execution._has_steps()
+
+        await execution._add_react_steps()
+
+        steps = execution.playbook.step_collection
+        assert execution._has_steps()
+        assert steps.ordered_line_numbers[0] == "01"
+        assert steps.steps["03"].is_conditional()
+        assert [child.line_number for child in steps.steps["03"].children] == [
+            "03.01",
+            "03.02",
+            "03.03",
+            "03.04",
+            "03.05",
+        ]
+        assert steps.steps["04"].is_return()
+        assert steps.steps["01"].source_file_path.endswith("react_agent.pbasm")
+
+    @pytest.mark.asyncio
+    async def test_each_playbook_gets_its_own_steps(self):
+        """Test step collections are copies that do not share steps."""
+        first = make_execution()
+        second = make_execution()
+
+        await first._add_react_steps()
+        await second._add_react_steps()
+
+        first_steps = first.playbook.step_collection
+        second_steps = second.playbook.step_collection
+        assert first_steps is not second_steps
+        assert first_steps.steps["01"] is not second_steps.steps["01"]
+        assert first_steps.ordered_line_numbers == second_steps.ordered_line_numbers
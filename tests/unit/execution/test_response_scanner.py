@@ -0,0 +1,87 @@
+"""Unit tests for ResponseScanner."""
+
+from playbooks.execution.response_scanner import ResponseScanner
+
+
+def _scan(response, chunk_size=1, accept=lambda recipient: True):
+    scanner = ResponseScanner(accept=accept)
+    events = []
+    for i in range(0, len(response), chunk_size):
+        events.extend(scanner.add_chunk(response[i : i + chunk_size]))
+    return scanner, events
+
+
+def _kinds(events):
+    return [event.kind for event in events]
+
+
+class TestResponseScanner:
+    """Test suite for ResponseScanner."""
+
+    def test_text_joins_chunks(self):
+        response = 'x = 1\nawait self.Say("user", "Hi")\n'
+        scanner, _ = _scan(response, chunk_size=3)
+
+        assert scanner.text == response
+        assert "".join(scanner.chunks) == response
+
+    def test_streams_say_message_one_character_at_a_time(self):
+        scanner, events = _scan('await self.Say("user", "Hello there")\nx = 1\n')
+
+        deltas = [event.text for event in events if event.kind == "delta"]
+        assert _kinds(events)[0] == "start"
+        assert events[0].recipient == "user"
+        assert "".join(deltas) == "Hello there"
+        assert events[-1].kind == "end"
+        assert events[-1].text == "Hello there"
+        assert not scanner.in_say_call
+
+    def test_triple_quoted_message(self):
+        _, events = _scan('await self.Say("user", """Line 1\nLine "2"""")\n')
+
+        deltas = "".join(event.text for event in events if event.kind == "delta")
+        assert events[-1].text == 'Line 1\nLine "2"'
+        assert events[-1].text.startswith(deltas)
+
+    def test_rejected_recipient_is_skipped(self):
+        _, events = _scan(
+            'await self.Say("agent 1000", "Hi")\nawait self.Say("user", "Yo")\n',
+            accept=lambda recipient: recipient == "user",
+        )
+
+        assert [event.recipient for event in events] == ["user"] * len(events)
+        assert events[-1].text == "Yo"
+
+    def test_indented_code_disables_streaming(self):
+        _, events = _scan(
+            'for x in items:\n    total += x\nawait self.Say("user", "Done")\n'
+        )
+
+        assert events == []
+
+    def test_placeholders_stop_deltas(self):
+        _, events = _scan('await self.Say("user", "Hi {$name}, welcome")\n')
+
+        deltas = "".join(event.text for event in events if event.kind == "delta")
+        assert deltas == "Hi "
+        assert events[-1].has_placeholders
+        assert events[-1].text == "Hi {$name}, welcome"
+
+    def test_several_says_in_one_chunk(self):
+        _, events = _scan(
+            'await self.Say("user", "One")\nawait self.Say("human", "Two")\n',
+            chunk_size=1000,
+        )
+
+        assert _kinds(events) == ["start", "end", "start", "end"]
+        assert [event.text for event in events if event.kind == "end"] == [
+            "One",
+            "Two",
+        ]
+
+    def test_unfinished_say_reports_sent_message(self):
+        scanner, _ = _scan('await self.Say("user", "Partial mess')
+
+        assert scanner.in_say_call
+        assert scanner.recipient == "user"
+        assert scanner.sent_message == "Partial mess"
@@ -1,7 +1,15 @@
 import pytest
 from box import Box
 
-from playbooks.execution.streaming_python_executor import StreamingPythonExecutor
+import ast
+from unittest.mock import patch
+
+from playbooks.execution import streaming_python_executor
+from playbooks.execution.streaming_python_executor import (
+    StreamingPythonExecutor,
+    _statement_sources,
+    compile_statement,
+)
 from playbooks.infrastructure.event_bus import EventBus
 from playbooks.state.call_stack import CallStack, CallStackFrame, InstructionPointer
 
@@ -113,3 +121,74 @@ async def test_streaming_executor_blocks_read_of_joined_meetings():
     await executor.add_chunk("x = [m['meeting_id'] for m in self.joined_meetings]\n")
     result = await executor.finalize()
     assert result.error_message is None
+
+
+def test_compile_statement_is_cached_by_source():
+    first = compile_statement('await Step("TestPlaybook:01:EXE")')
+    second = compile_statement('await Step("TestPlaybook:01:EXE")')
+
+    assert first is second
+    assert first.is_async
+    assert first.skip_reason is None
+
+
+def test_compile_statement_flags_protected_attributes():
+    assignment = compile_statement("self.call_stack = None")
+    read = compile_statement("meetings = list(agent.owned_meetings)")
+
+    assert assignment.code is None
+    assert "assignment" in assignment.skip_reason
+    assert read.code is None
+    assert "owned_meetings" in read.skip_reason
+
+
+def test_statement_sources_split_semicolons_and_unicode():
+    source = "x = 'caf\u00e9'; y = 2\nfor i in range(2):\n    y += i\n"
+
+    sources = _statement_sources(source, ast.parse(source).body)
+
+    assert sources == ["x = 'caf\u00e9'", "y = 2", "for i in range(2):\n    y += i"]
+
+
+@pytest.mark.asyncio
+async def test_streaming_executor_captures_locals_of_await_statements():
+    agent = _MockAgent()
+    executor = StreamingPythonExecutor(agent)
+
+    await executor.add_chunk("import asyncio\n")
+    await executor.add_chunk("value = await asyncio.sleep(0, result=42)\n")
+    result = await executor.finalize()
+
+    assert result.error_message is None
+    assert agent.call_stack.peek().locals["value"] == 42
+
+
+def test_compile_statement_uses_top_level_await():
+    plain = compile_statement("value = await fetch()")
+    nested = compile_statement("value = await fetch(x for x in items)")
+    legacy = compile_statement("value = await fetch()", top_level_await=False)
+
+    assert plain.is_async and not plain.wrapped
+    assert nested.is_async and nested.wrapped
+    assert legacy.is_async and legacy.wrapped
+
+
+@pytest.mark.parametrize("top_level_await", [True, False])
+@pytest.mark.asyncio
+async def test_streaming_executor_await_sees_frame_locals(top_level_await):
+    agent = _MockAgent()
+    agent.call_stack.peek().locals["offset"] = 2
+    executor = StreamingPythonExecutor(agent)
+
+    with patch.object(streaming_python_executor, "top_level_await", top_level_await):
+        await executor.add_chunk("import asyncio\n")
+        await executor.add_chunk("a = await asyncio.sleep(0, result=1 + offset)\n")
+        await executor.add_chunk(
+            "b = await asyncio.sleep(0, result=sum(i + offset for i in [a]))\n"
+        )
+        result = await executor.finalize()
+
+    assert result.error_message is None
+    assert agent.call_stack.peek().locals["a"] == 3
+    assert agent.call_stack.peek().locals["b"] == 5
+    assert "a" not in executor.namespace
@@ -343,6 +343,25 @@ class TestStreamingComplexScenarios:
         assert callable(frame.locals["multiply"])
         assert frame.locals["result"] == 42
 
+    @pytest.mark.asyncio
+    async def test_streaming_decorators_are_applied(self, mock_agent):
+        """Test decorated definitions keep their decorators when executed."""
+        executor = StreamingPythonExecutor(mock_agent)
+
+        await executor.add_chunk("import functools\n")
+        await executor.add_chunk("@functools.lru_cache\n")
+        await executor.add_chunk("def square(n):\n")
+        await executor.add_chunk("    return n * n\n")
+        await executor.add_chunk("\n")
+        await executor.add_chunk("result = square(4)\n")
+        result = await executor.finalize()
+
+        assert result.error_message is None
+
+        frame = mock_agent.call_stack.peek()
+        assert frame.locals["square"].cache_info().misses == 1
+        assert frame.locals["result"] == 16
+
     @pytest.mark.asyncio
     async def test_streaming_with_collections(self, mock_agent):
         """Test streaming capture of collection types."""
@@ -1,6 +1,7 @@
 """Tests for the semantic LLMMessage subclasses."""
 
 import time
+from unittest.mock import patch
 
 from playbooks.core.enums import LLMMessageRole, LLMMessageType
 from playbooks.llm.messages import (
@@ -18,6 +19,7 @@ from playbooks.llm.messages import (
     TriggerInstructionsLLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.llm.messages.base import _MESSAGE_DIGEST_MEMO, message_digest
 from playbooks.llm.messages.timestamp import get_timestamp, reset_timestamp_manager
 
 
@@ -71,6 +73,32 @@ class TestLLMMessageBase:
         assert msg1 == msg2
         assert msg1 != msg3
 
+    def test_content_digest(self):
+        """Test the digest is memoized and depends on role and content."""
+        msg = LLMMessage("Hello", LLMMessageRole.USER)
+
+        assert msg.content_digest is msg.content_digest
+        assert (
+            msg.content_digest
+            == LLMMessage("Hello", LLMMessageRole.USER).content_digest
+        )
+        assert (
+            msg.content_digest
+            != LLMMessage("Hello", LLMMessageRole.SYSTEM).content_digest
+        )
+        assert (
+            msg.content_digest != LLMMessage("Hi", LLMMessageRole.USER).content_digest
+        )
+
+    def test_message_digest_memo_does_not_keep_content(self):
+        """Test the digest memo is keyed without holding message contents."""
+        content = "".join(["retained? "] * 1000)
+        digest = message_digest("user", None, content)
+
+        assert message_digest("user", None, content) == digest
+        assert message_digest("user", "other", content) != digest
+        assert all(part is not content for key in _MESSAGE_DIGEST_MEMO for part in key)
+
     def test_timestamp_field(self):
         """Test that timestamp is set automatically and can be provided."""
         # Reset timestamp manager for consistent testing
@@ -128,6 +156,56 @@ class TestAssistantResponseLLMMessage:
         assert msg.role == LLMMessageRole.ASSISTANT
         assert msg.type == LLMMessageType.ASSISTANT_RESPONSE
 
+    def test_set_content_invalidates_digest(self):
+        """Test streaming content into the message refreshes its digest."""
+        msg = AssistantResponseLLMMessage("")
+        empty_digest = msg.content_digest
+
+        msg.set_content("Step 1 done")
+
+        assert msg.content_digest != empty_digest
+        assert (
+            msg.content_digest
+            == AssistantResponseLLMMessage("Step 1 done").content_digest
+        )
+
+    def test_stream_content_joins_chunks_on_read(self):
+        """Test streamed chunks replace the placeholder once they arrive."""
+        chunks = []
+        msg = AssistantResponseLLMMessage("Thinking...")
+        msg.stream_content(chunks)
+
+        assert msg.content == "Thinking..."
+        chunks.extend(["Step ", "1"])
+        first_digest = msg.content_digest
+        assert msg.content == "Step 1"
+        chunks.append(" done")
+        assert msg.content_digest != first_digest
+        assert msg.content == "Step 1 done"
+
+        msg.set_content("final")
+        chunks.append(" ignored")
+        assert msg.content == "final"
+
+    def test_renderings_are_memoized_until_content_changes(self):
+        """Test rendered() reuses renderings while the content is unchanged."""
+        chunks = ["Step 1"]
+        msg = AssistantResponseLLMMessage("")
+        msg.stream_content(chunks)
+
+        full = msg.rendered()
+        version = msg.content_version
+        assert full == msg.to_full_message()
+        assert msg.rendered() is full
+        assert msg.rendered(compact=True) == msg.to_compact_message()
+
+        chunks.append(" done")
+        assert msg.content_version > version
+        assert msg.rendered()["content"] == "Step 1 done"
+
+        msg.set_content("final")
+        assert msg.rendered(compact=True)["content"] == "final"
+
 
 class TestMeetingLLMMessage:
     """Test the MeetingLLMMessage class."""
@@ -273,6 +351,15 @@ class TestSystemPromptLLMMessage:
         assert msg.role == LLMMessageRole.SYSTEM
         assert msg.type == LLMMessageType.SYSTEM_PROMPT
 
+    def test_prompt_file_is_read_once(self):
+        """Test system prompt messages share the prompt loaded from file."""
+        first = SystemPromptLLMMessage()
+
+        with patch("builtins.open", side_effect=AssertionError("read again")):
+            second = SystemPromptLLMMessage()
+
+        assert second.content is first.content
+
 
 class TestUserInputLLMMessage:
     """Test the UserInputLLMMessage class."""
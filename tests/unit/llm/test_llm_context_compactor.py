@@ -1,15 +1,22 @@
 """Tests for LLM context compaction functionality."""
 
+import asyncio
 from unittest.mock import patch
 
 import pytest
 
+from playbooks.config import config as playbooks_config
+from playbooks.core.enums import LLMCallPriority
 from playbooks.llm.llm_context_compactor import CompactionConfig, LLMContextCompactor
 from playbooks.llm.messages import (
     AssistantResponseLLMMessage,
+    ExecutionResultLLMMessage,
+    PlaybookImplementationLLMMessage,
     SystemPromptLLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.llm.prompt_cache import apply_cache_breakpoints
+from playbooks.utils.token_counter import get_messages_token_count
 
 
 class TestCompactionConfig:
@@ -35,6 +42,15 @@ class TestCompactionConfig:
             assert config.enabled is True
             assert config.min_preserved_assistant_messages == 2
 
+    def test_config_from_settings_selects_model_budget(self):
+        """Test the [llm_compaction] settings pick a per-model token budget."""
+        settings = playbooks_config.llm_compaction.model_copy(
+            update={"token_budget": 1000, "models": {"big-model": 5000}}
+        )
+        with patch.object(playbooks_config, "llm_compaction", settings):
+            assert CompactionConfig.from_settings("big-model").token_budget == 5000
+            assert CompactionConfig.from_settings("other-model").token_budget == 1000
+
 
 def get_assistant_contents_compacted(index):
     return f"""# execution_id: {index}
@@ -159,6 +175,221 @@ class TestLLMContextCompactor:
         assert system_messages[0]["content"]
         assert "# Playbooks" in system_messages[0]["content"]
 
+    def test_stable_prefix_ends_before_next_compacted_message(self):
+        """Test the stable prefix stops where the next call's rendering changes."""
+        compactor = LLMContextCompactor(
+            CompactionConfig(min_preserved_assistant_messages=2)
+        )
+
+        # u0, a1, u2, a3, u4, a5, u6, a7, u8
+        messages = get_message_pairs(4)
+        messages.append(UserInputLLMMessage(instruction=get_user_contents(8)))
+
+        # a5 is compacted once the next assistant response is added
+        assert compactor.get_stable_prefix_length(messages) == 5
+        assert compactor.get_stable_prefix_length(messages[:2]) == 0
+        assert (
+            LLMContextCompactor(
+                CompactionConfig(enabled=False)
+            ).get_stable_prefix_length(messages)
+            == 9
+        )
+
+
+class TestIncrementalCompaction:
+    """Test the compacted prefix kept between calls."""
+
+    def test_growing_session_matches_fresh_compaction(self):
+        """Test each call renders the same messages as a fresh compactor."""
+        messages = get_session(30)
+        compactor = LLMContextCompactor()
+        previous, stable = [], 0
+        for end in range(1, len(messages) + 1):
+            result = compactor.compact_messages(messages[:end])
+            assert result == LLMContextCompactor().compact_messages(messages[:end])
+            # Compacted history is reused, not rendered again
+            assert all(a is b for a, b in zip(result[:stable], previous[:stable]))
+            previous = result
+            stable = compactor.get_stable_prefix_length(messages[:end])
+
+    def test_renderings_are_not_modified_by_cache_breakpoints(self):
+        """Test marking a rendering for caching does not leak into later calls."""
+        messages = get_session(5)
+        compactor = LLMContextCompactor()
+
+        result = compactor.compact_messages(messages)
+        apply_cache_breakpoints(result, [0, 4])
+
+        assert "cache_control" in result[4]
+        again = compactor.compact_messages(messages)
+        assert not any("cache_control" in message for message in again)
+
+    def test_rewritten_history_invalidates_prefix(self):
+        """Test a popped frame or inserted message cuts the prefix back."""
+        messages = get_session(10)
+        compactor = LLMContextCompactor()
+        compactor.compact_messages(messages)
+
+        popped = messages[:12] + [UserInputLLMMessage(instruction="Returned")]
+        assert compactor.compact_messages(popped) == (
+            LLMContextCompactor().compact_messages(popped)
+        )
+
+        inserted = list(messages)
+        inserted.insert(5, ExecutionResultLLMMessage("nested result", "Main"))
+        assert compactor.compact_messages(inserted) == (
+            LLMContextCompactor().compact_messages(inserted)
+        )
+
+    def test_streamed_response_is_rendered_once_complete(self):
+        """Test a response still streaming is not frozen into the prefix."""
+        chunks = ["Step "]
+        response = AssistantResponseLLMMessage("")
+        response.stream_content(chunks)
+        messages = get_session(2) + [response]
+        compactor = LLMContextCompactor()
+
+        assert compactor.compact_messages(messages)[-1]["content"] == "Step "
+        chunks.append("1")
+        assert compactor.compact_messages(messages)[-1]["content"] == "Step 1"
+
+    def test_budget_shortening_continues_between_calls(self):
+        """Test shortened history stays shortened as the session grows."""
+        messages = get_session(12)
+        compactor = LLMContextCompactor(CompactionConfig(token_budget=3000))
+        previous, stable = [], 0
+        # The budget binds from the first call on
+        for end in range(22, len(messages) + 1, 3):
+            result = compactor.compact_messages(messages[:end])
+            assert len(result) == end
+            assert get_messages_token_count(result, approximate=True) <= 3000
+            assert result[:stable] == previous[:stable]
+            previous = result
+            stable = compactor.get_stable_prefix_length(messages[:end])
+        assert result[3]["content"].endswith("more characters)")
+
+
+def get_session(turn_count):
+    """Playbook implementation, then turns with long execution results."""
+    messages = [PlaybookImplementationLLMMessage("## Main\n- Do things", "Main")]
+    for i in range(turn_count):
+        messages.append(UserInputLLMMessage(instruction=get_user_contents(i)))
+        messages.append(AssistantResponseLLMMessage(get_assistant_contents(i)))
+        messages.append(ExecutionResultLLMMessage(f"result {i} " + "x" * 2000, "Main"))
+    messages.append(UserInputLLMMessage(instruction="Continue"))
+    return messages
+
+
+class TestTokenBudget:
+    """Test compaction against a token budget."""
+
+    def test_within_budget_matches_fixed_rule(self):
+        """Test messages that fit the budget are compacted as without one."""
+        messages = get_session(3)
+        expected = LLMContextCompactor().compact_messages(messages)
+
+        compactor = LLMContextCompactor(CompactionConfig(token_budget=100_000))
+        assert compactor.compact_messages(messages) == expected
+
+    def test_truncates_oldest_messages_first(self):
+        """Test older results are truncated until the messages fit."""
+        messages = get_session(6)
+        full = LLMContextCompactor().compact_messages(messages)
+        budget = get_messages_token_count(full, approximate=True) - 300
+
+        result = LLMContextCompactor(
+            CompactionConfig(token_budget=budget)
+        ).compact_messages(messages)
+
+        assert len(result) == len(messages)
+        assert get_messages_token_count(result, approximate=True) <= budget
+        # Only the oldest result was truncated
+        assert result[3]["content"].endswith("more characters)")
+        assert result[:3] == full[:3]
+        assert result[4:] == full[4:]
+
+    def test_drops_spans_and_keeps_recent_and_pinned_messages(self):
+        """Test old history is dropped in whole spans when truncation is not enough."""
+        messages = get_session(20)
+        full = LLMContextCompactor().compact_messages(messages)
+        compactor = LLMContextCompactor(
+            CompactionConfig(token_budget=1500, summary_span_messages=6)
+        )
+
+        result = compactor.compact_messages(messages)
+
+        assert get_messages_token_count(result, approximate=True) <= 1500
+        dropped = len(messages) - len(result)
+        assert dropped > 0 and dropped % 6 == 0
+        # Playbook implementation is pinned; the last two turns stay verbatim
+        assert result[0] == full[0]
+        assert result[-6:] == full[-6:]
+        # All older history is shortened already; only new messages change
+        assert compactor.get_stable_prefix_length(messages) == len(messages) - 6
+
+    def test_summarizes_each_dropped_span_once(self):
+        """Test dropped spans are summarized in the background, once."""
+        messages = get_session(20)
+        compactor = LLMContextCompactor(
+            CompactionConfig(token_budget=1500, summary_span_messages=6, summarize=True)
+        )
+
+        async def run():
+            first = compactor.compact_messages(messages)
+            await compactor._summary_task
+            second = compactor.compact_messages(messages)
+            third = compactor.compact_messages(messages)
+            return first, second, third
+
+        with patch(
+            "playbooks.llm.llm_context_compactor.get_completion",
+            side_effect=lambda **kwargs: iter(["- did things"]),
+        ) as get_completion:
+            first, second, third = asyncio.run(run())
+
+        spans = (len(messages) - len(first)) // 6
+        assert get_completion.call_count == spans
+        assert all(
+            call.kwargs["priority"] == LLMCallPriority.BACKGROUND
+            for call in get_completion.call_args_list
+        )
+        assert not any("Summary of earlier" in m["content"] for m in first)
+        assert second[1]["content"] == "*Summary of earlier activity*\n- did things"
+        assert third == second
+        assert get_messages_token_count(second, approximate=True) <= 1500
+
+    def test_output_sources_map_back_to_input_messages(self):
+        """Test the output of a compaction that dropped spans maps to its inputs."""
+        messages = get_session(20)
+        # A playbook loaded mid-session is pinned inside the dropped history
+        messages.insert(4, PlaybookImplementationLLMMessage("## Other", "Other"))
+        compactor = LLMContextCompactor(
+            CompactionConfig(token_budget=1500, summary_span_messages=6, summarize=True)
+        )
+
+        async def run():
+            compactor.compact_messages(messages)
+            await compactor._summary_task
+            return compactor.compact_messages(messages)
+
+        with patch(
+            "playbooks.llm.llm_context_compactor.get_completion",
+            side_effect=lambda **kwargs: iter(["- did things"]),
+        ):
+            result = asyncio.run(run())
+        sources = compactor.get_output_sources()
+
+        assert len(sources) == len(result) < len(messages)
+        assert sources[:3] == [0, None, 4]
+        assert result[1]["content"].startswith("*Summary of earlier activity*")
+        assert result[2] == messages[4].rendered()
+        kept = [source for source in sources if source is not None]
+        assert kept == sorted(kept)
+        assert sources[-6:] == list(range(len(messages) - 6, len(messages)))
+        for source, rendering in zip(sources, result):
+            if source is not None:
+                assert rendering["role"] == messages[source].rendered()["role"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
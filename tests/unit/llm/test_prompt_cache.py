@@ -0,0 +1,52 @@
+"""Tests for prompt-cache breakpoint planning."""
+
+from playbooks.core.enums import LLMMessageStability
+from playbooks.llm.prompt_cache import apply_cache_breakpoints, plan_cache_breakpoints
+
+STATIC = LLMMessageStability.STATIC
+SESSION = LLMMessageStability.SESSION
+VOLATILE = LLMMessageStability.VOLATILE
+
+
+def make_messages(sizes):
+    return [{"role": "user", "content": "x" * size} for size in sizes]
+
+
+def test_breakpoints_at_static_and_stable_prefix_ends():
+    """Test the static prefix and the longest stable prefix are marked."""
+    messages = make_messages([8000, 400, 4000, 4000, 400])
+    stability = [STATIC, STATIC, SESSION, SESSION, VOLATILE]
+
+    assert plan_cache_breakpoints(messages, stability) == [1, 3]
+
+
+def test_segment_ends_fill_remaining_breakpoints_evenly():
+    """Test frame boundaries between the two prefixes use the spare markers."""
+    messages = make_messages([8000] + [2000] * 10 + [400])
+    stability = [STATIC] + [SESSION] * 10 + [VOLATILE]
+
+    breakpoints = plan_cache_breakpoints(
+        messages, stability, segment_ends=[1, 3, 5, 7, 9, 12]
+    )
+
+    assert breakpoints == [0, 4, 6, 10]
+
+
+def test_small_prefixes_are_not_marked():
+    """Test prefixes below the provider's minimum cacheable size are skipped."""
+    messages = make_messages([400, 400, 400])
+    stability = [STATIC, SESSION, VOLATILE]
+
+    assert plan_cache_breakpoints(messages, stability) == []
+
+
+def test_apply_cache_breakpoints_replaces_existing_markers():
+    """Test only planned messages keep cache_control."""
+    messages = make_messages([10, 10, 10])
+    messages[2]["cache_control"] = {"type": "ephemeral"}
+
+    apply_cache_breakpoints(messages, [0])
+
+    assert messages[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in messages[1]
+    assert "cache_control" not in messages[2]
@@ -0,0 +1,51 @@
+"""Tests for running concurrent calls on forks of a CallStack."""
+
+import asyncio
+
+import pytest
+
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.llm.messages import UserInputLLMMessage
+from playbooks.state.call_stack import CallStack, CallStackFrame, InstructionPointer
+
+
+def _frame(playbook: str) -> CallStackFrame:
+    return CallStackFrame(InstructionPointer(playbook, "01", 1))
+
+
+async def _call(call_stack: CallStack, playbook: str, delay: float) -> list:
+    call_stack.push(_frame(playbook))
+    await asyncio.sleep(delay)
+    seen = [frame.playbook for frame in call_stack.frames]
+    call_stack.pop()
+    call_stack.add_llm_message(UserInputLLMMessage(instruction=f"{playbook} done"))
+    return seen
+
+
+class TestCallStackForking:
+    """Test that concurrent calls see only their own frames."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_do_not_interleave_frames(self):
+        call_stack = CallStack(EventBus("test_session"), "test_agent")
+        caller = _frame("Main")
+        call_stack.push(caller)
+
+        results = await asyncio.gather(
+            call_stack.run_forked(_call(call_stack, "A", 0.02)),
+            call_stack.run_forked(_call(call_stack, "B", 0.01)),
+        )
+
+        assert results == [["Main", "A"], ["Main", "B"]]
+        assert call_stack.frames == [caller]
+        # Messages added after returning land on the shared caller frame
+        assert len(caller.llm_messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_fork_is_released_after_call(self):
+        call_stack = CallStack(EventBus("test_session"), "test_agent")
+
+        await call_stack.run_forked(_call(call_stack, "A", 0))
+        call_stack.push(_frame("Main"))
+
+        assert [frame.playbook for frame in call_stack.frames] == ["Main"]
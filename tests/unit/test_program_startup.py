@@ -0,0 +1,130 @@
+"""Tests for Program initialization."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from playbooks.agents import AIAgent
+from playbooks.agents.local_ai_agent import LocalAIAgent
+from playbooks.config import config
+from playbooks.core.events import ProgramStartupEvent
+from playbooks.infrastructure.event_bus import EventBus
+from playbooks.program import Program
+from playbooks.utils import file_utils
+
+PROGRAM = """# Researcher
+A research agent
+
+## Research
+### Triggers
+- T1:BGN When program starts
+### Steps
+- 01:RET Done
+
+# Writer
+A writing agent
+
+## Write
+### Triggers
+- T1:BGN When program starts
+### Steps
+- 01:RET Done
+"""
+
+
+def slow_discovery(in_flight):
+    """A discover_playbooks that takes a while, like an MCP server would."""
+
+    async def discover_playbooks(self):
+        in_flight["current"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        await asyncio.sleep(0.02)
+        in_flight["current"] -= 1
+
+    return discover_playbooks
+
+
+async def initialize(program: Program):
+    events = []
+    program.event_bus.subscribe(ProgramStartupEvent, events.append)
+    await program.initialize()
+    return events
+
+
+@pytest.mark.asyncio
+async def test_initialize_publishes_startup_timeline():
+    """Test initialization publishes the timeline and critical path of its steps."""
+    program = Program(EventBus("test"), program_content=PROGRAM)
+
+    events = await initialize(program)
+
+    assert program.initialized
+    assert len(events) == 1
+    event = events[0]
+    names = [task["name"] for task in event.tasks]
+    assert names[:3] == ["parse:0", "agents", "register"]
+    for agent in program.agents:
+        assert f"initialize:{agent.id}" in names
+        if isinstance(agent, AIAgent):
+            assert f"discover:{agent.id}" in names
+    assert names[-1] == "warm_pool"
+    assert event.critical_path[0] == "parse:0"
+    assert event.critical_path[-1] == "warm_pool"
+    assert event.duration > 0
+    assert all(task["error"] is None for task in event.tasks)
+
+
+@pytest.mark.asyncio
+async def test_agents_discover_playbooks_concurrently():
+    """Test slow discoveries overlap instead of adding up."""
+    program = Program(EventBus("test"), program_content=PROGRAM)
+    in_flight = {"current": 0, "peak": 0}
+
+    with patch.object(LocalAIAgent, "discover_playbooks", slow_discovery(in_flight)):
+        await initialize(program)
+
+    assert in_flight["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_startup_max_concurrency_limits_parallel_steps():
+    """Test startup_max_concurrency caps how many steps run at once."""
+    program = Program(EventBus("test"), program_content=PROGRAM)
+    in_flight = {"current": 0, "peak": 0}
+
+    with (
+        patch.object(config, "startup_max_concurrency", 1),
+        patch.object(LocalAIAgent, "discover_playbooks", slow_discovery(in_flight)),
+    ):
+        await initialize(program)
+
+    assert in_flight["peak"] == 1
+    assert program.initialized
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_initialization_does_not_stop_startup():
+    """Test an agent failing to initialize is logged and startup continues."""
+    program = Program(EventBus("test"), program_content=PROGRAM)
+
+    with patch.object(AIAgent, "initialize", side_effect=RuntimeError("down")):
+        await initialize(program)
+
+    assert program.initialized
+    assert {agent.klass for agent in program.agents} >= {"Researcher", "Writer"}
+
+
+@pytest.mark.asyncio
+async def test_compiled_files_are_read_once(tmp_path, monkeypatch):
+    """Test public.json extraction and parsing share one read of each file."""
+    monkeypatch.chdir(tmp_path)  # The program cache is written to the cwd
+    compiled = tmp_path / "program.pbasm"
+    compiled.write_text(PROGRAM)
+
+    with patch.object(file_utils, "read_file", wraps=file_utils.read_file) as read_file:
+        program = Program(EventBus("test"), compiled_program_paths=[str(compiled)])
+        await program.initialize()
+
+    read_file.assert_called_once_with(str(compiled))
+    assert {agent.klass for agent in program.agents} >= {"Researcher", "Writer"}
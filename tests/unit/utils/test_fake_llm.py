@@ -0,0 +1,205 @@
+"""Tests for the offline fake LLM provider and the session recorder."""
+
+import asyncio
+from unittest.mock import patch
+
+import litellm
+import pytest
+
+from playbooks.config import config
+from playbooks.utils import llm_helper
+from playbooks.utils.fake_llm import (
+    FakeLLMProvider,
+    LLMSessionRecorder,
+    load_recording,
+    register_fake_llm_provider,
+)
+from playbooks.utils.llm_config import LLMConfig
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def use_provider():
+    """Register a provider for the test and restore the configured one afterwards."""
+    yield register_fake_llm_provider
+    register_fake_llm_provider(FakeLLMProvider.from_config(config.fake_llm))
+
+
+async def _complete(model, content="Hello", stream=True):
+    with (
+        patch.object(llm_helper, "_check_llm_calls_allowed", return_value=True),
+        patch.object(llm_helper, "approximate_token_counts", True),
+    ):
+        return [
+            chunk
+            async for chunk in llm_helper.get_completion(
+                llm_config=LLMConfig(model=model, api_key="test-key"),
+                messages=[{"role": "user", "content": content}],
+                stream=stream,
+                use_cache=False,
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_synthetic_mode_streams_tokens_through_litellm(use_provider):
+    """Test synthetic responses stream token by token through get_completion."""
+    use_provider(FakeLLMProvider(ttft_s=0, tokens_per_s=10_000, response="a b c"))
+
+    assert await _complete("playbooks-fake/synthetic") == ["a ", "b ", "c"]
+    assert await _complete("playbooks-fake/synthetic", stream=False) == ["a b c"]
+
+
+@pytest.mark.asyncio
+async def test_synthetic_mode_paces_first_token(use_provider):
+    """Test time to first token is simulated without blocking the event loop."""
+    use_provider(FakeLLMProvider(ttft_s=0.1, tokens_per_s=10_000, response="x"))
+
+    started = asyncio.get_running_loop().time()
+    results = await asyncio.gather(
+        *[_complete("playbooks-fake/synthetic", f"q{i}") for i in range(5)]
+    )
+
+    assert results == [["x"]] * 5
+    assert asyncio.get_running_loop().time() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_burst_raises_429(use_provider):
+    """Test calls inside a 429 burst fail with a rate limit error."""
+    clock = FakeClock()
+    use_provider(
+        FakeLLMProvider(
+            ttft_s=0,
+            response="ok",
+            rate_limit_every_s=60,
+            rate_limit_burst_s=5,
+            clock=clock,
+        )
+    )
+
+    with pytest.raises(litellm.RateLimitError):
+        await litellm.acompletion(
+            model="playbooks-fake/synthetic",
+            messages=[{"role": "user", "content": "Hello"}],
+        )
+
+    clock.now = 10.0
+    response = await litellm.acompletion(
+        model="playbooks-fake/synthetic",
+        messages=[{"role": "user", "content": "Hello"}],
+    )
+    assert response.choices[0].message.content == "ok"
+
+
+@pytest.mark.asyncio
+async def test_recorded_session_replays_by_request(tmp_path, use_provider):
+    """Test recorded calls replay for matching requests, with their chunks."""
+    recorder = LLMSessionRecorder(str(tmp_path / "session.jsonl"))
+    first = [{"role": "user", "content": "first"}]
+    second = [{"role": "user", "content": "second"}]
+    recorder.record(first, "claude", [(0.01, "one "), (0.02, "1")])
+    recorder.record(second, "claude", [(0.01, "two")])
+
+    use_provider(
+        FakeLLMProvider(recording=load_recording(str(tmp_path / "session.jsonl")))
+    )
+
+    assert await _complete("playbooks-fake/replay", "second") == ["two"]
+    assert await _complete("playbooks-fake/replay", "first") == ["one ", "1"]
+    with pytest.raises(litellm.BadRequestError):
+        await _complete("playbooks-fake/replay", "third")
+
+
+@pytest.mark.asyncio
+async def test_get_completion_records_provider_calls(tmp_path, use_provider):
+    """Test the recorder captures get_completion traffic for later replay."""
+    use_provider(FakeLLMProvider(ttft_s=0, tokens_per_s=10_000, response="a b"))
+    recorder = LLMSessionRecorder(str(tmp_path / "session.jsonl"))
+
+    with patch.object(llm_helper, "llm_recorder", recorder):
+        await _complete("playbooks-fake/synthetic")
+
+    (entry,) = load_recording(str(tmp_path / "session.jsonl"))
+    assert entry["model"] == "playbooks-fake/synthetic"
+    assert [text for _, text in entry["chunks"]] == ["a ", "b"]
+
+
+@pytest.mark.asyncio
+async def test_replay_is_paced_by_the_injected_clock(tmp_path, use_provider):
+    """Test replay delays follow the provider's clock, not wall time."""
+    recorder = LLMSessionRecorder(str(tmp_path / "session.jsonl"))
+    recorder.record(
+        [{"role": "user", "content": "Hello"}], "claude", [(30.0, "late "), (60, "!")]
+    )
+    clock = FakeClock()
+
+    def advancing_clock():
+        clock.now += 100.0  # Every chunk is already overdue
+        return clock.now
+
+    use_provider(
+        FakeLLMProvider(
+            recording=load_recording(str(tmp_path / "session.jsonl")),
+            clock=advancing_clock,
+        )
+    )
+
+    started = asyncio.get_running_loop().time()
+    assert await _complete("playbooks-fake/replay") == ["late ", "!"]
+    assert asyncio.get_running_loop().time() - started < 5
+
+
+@pytest.mark.asyncio
+async def test_recorded_offsets_exclude_consumer_time(tmp_path, use_provider):
+    """Test chunk timing is taken where chunks arrive, not where they are used."""
+    use_provider(FakeLLMProvider(ttft_s=0, tokens_per_s=10_000, response="a b c"))
+    recorder = LLMSessionRecorder(str(tmp_path / "session.jsonl"))
+
+    with (
+        patch.object(llm_helper, "llm_recorder", recorder),
+        patch.object(llm_helper, "llm_cache_enabled", False),
+        patch.object(llm_helper, "_check_llm_calls_allowed", return_value=True),
+        patch.object(llm_helper, "approximate_token_counts", True),
+    ):
+        async for _ in llm_helper.get_completion(
+            llm_config=LLMConfig(model="playbooks-fake/synthetic", api_key="key"),
+            messages=[{"role": "user", "content": "Hello"}],
+            stream=True,
+        ):
+            await asyncio.sleep(0.1)  # A slow consumer
+
+    (entry,) = load_recording(str(tmp_path / "session.jsonl"))
+    assert [text for _, text in entry["chunks"]] == ["a ", "b ", "c"]
+    assert entry["chunks"][-1][0] < 0.1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recordings_keep_their_order(tmp_path):
+    """Test calls recorded from the event loop are written in recorded order."""
+    recorder = LLMSessionRecorder(str(tmp_path / "session.jsonl"))
+
+    await asyncio.gather(
+        *(
+            recorder.arecord([{"role": "user", "content": str(i)}], "claude", [])
+            for i in range(20)
+        )
+    )
+
+    recorded = [entry["key"] for entry in load_recording(recorder.path)]
+    expected = [
+        llm_helper.custom_get_cache_key(
+            model="", messages=[{"role": "user", "content": str(i)}], temperature=None
+        )
+        for i in range(20)
+    ]
+    assert recorded == expected
@@ -0,0 +1,286 @@
+"""Tests for the tiered LLM response cache."""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+from diskcache import FanoutCache
+
+from playbooks.utils import llm_cache
+from playbooks.utils.llm_cache import (
+    AsyncRedisCacheTier,
+    DiskCacheTier,
+    LLMCacheTier,
+    MemoryLRUCache,
+    TieredLLMCache,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DictTier(LLMCacheTier):
+    """Minimal persistent tier storing raw values, like a Redis client would."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def aget(self, key):
+        return self.data.get(key)
+
+    async def aset(self, key, value, ttl_s=None):
+        self.data[key] = value
+
+
+class FakeAsyncRedis:
+    """In-process stand-in for redis.asyncio.Redis recording round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.mget_calls = []
+        self.pipelines = []
+        self.closed = False
+
+    async def mget(self, keys):
+        self.mget_calls.append(list(keys))
+        await asyncio.sleep(0)
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, px=None):
+        self.commands.append((key, value, px))
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        self.client.pipelines.append(self.commands)
+        for key, value, px in self.commands:
+            self.client.data[key] = value
+            self.client.expiry[key] = px
+
+
+def test_memory_lru_evicts_least_recently_used_over_budget():
+    """Test the memory tier stays within max_bytes by evicting LRU entries."""
+    entry_size = sys.getsizeof("a" * 100)
+    memory = MemoryLRUCache(max_bytes=entry_size * 2)
+
+    memory.set("first", "a" * 100)
+    memory.set("second", "b" * 100)
+    assert memory.get("first") == "a" * 100  # "second" is now least recently used
+    memory.set("third", "c" * 100)
+
+    assert memory.get("second") is None
+    assert memory.get("first") == "a" * 100
+    assert memory.get("third") == "c" * 100
+    assert memory.evictions == 1
+    assert memory.size_bytes <= memory.max_bytes
+
+
+def test_memory_lru_expires_entries_after_ttl():
+    """Test memory entries are dropped once their TTL has passed."""
+    clock = FakeClock()
+    memory = MemoryLRUCache(max_bytes=10_000, clock=clock)
+    memory.set("key", "value", ttl_s=10)
+
+    clock.now = 9.0
+    assert memory.get("key") == "value"
+    clock.now = 10.0
+    assert memory.get("key") is None
+    assert memory.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_promotes_persistent_hits_to_memory():
+    """Test a persistent hit is served from memory afterwards and counted."""
+    persistent = DictTier()
+    persistent.data["key"] = "cached response"
+    cache = TieredLLMCache(persistent, memory_max_bytes=10_000)
+
+    assert await cache.aget("key") == "cached response"
+    persistent.data.clear()
+    assert await cache.aget("key") == "cached response"
+    assert await cache.aget("missing") is None
+
+    stats = cache.stats()
+    assert stats.persistent_hits == 1
+    assert stats.memory_hits == 1
+    assert stats.misses == 1
+    assert stats.hits == 2
+    assert stats.memory_entries == 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_decodes_bytes_from_persistent_tier():
+    """Test byte values (as returned by Redis) are decoded to text."""
+    persistent = DictTier()
+    persistent.data["key"] = "héllo".encode("utf-8")
+    cache = TieredLLMCache(persistent)
+
+    assert await cache.aget("key") == "héllo"
+
+
+@pytest.mark.skipif(llm_cache.zstd is None, reason="zstd is not available")
+@pytest.mark.asyncio
+async def test_tiered_cache_zstd_compression_round_trip():
+    """Test compressed responses are stored as zstd frames and read back."""
+    persistent = DictTier()
+    cache = TieredLLMCache(persistent, compression="zstd")
+    response = "Step 1\n" * 1000
+
+    await cache.aset("key", response)
+
+    stored = persistent.data["key"]
+    assert stored.startswith(llm_cache.ZSTD_MAGIC)
+    assert len(stored) < len(response)
+    assert await cache.aget("key") == response
+
+
+def test_tiered_cache_rejects_unknown_compression():
+    """Test configuration errors surface when the cache is built."""
+    with pytest.raises(ValueError, match="compression"):
+        TieredLLMCache(DictTier(), compression="gzip")
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_applies_ttl(tmp_path):
+    """Test the diskcache tier passes the TTL through as an expiry."""
+    fanout = FanoutCache(directory=str(tmp_path))
+    cache = TieredLLMCache(DiskCacheTier(fanout), ttl_s=60)
+
+    await cache.aset("key", "value")
+
+    value, expire_time = fanout.get("key", expire_time=True)
+    assert value == "value"
+    assert expire_time is not None
+    fanout.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_does_io_off_the_event_loop(tmp_path):
+    """Test diskcache reads and writes run in worker threads."""
+    fanout = FanoutCache(directory=str(tmp_path))
+    loop_thread = threading.get_ident()
+    io_threads = []
+
+    class RecordingFanout:
+        def get(self, key):
+            io_threads.append(threading.get_ident())
+            return fanout.get(key)
+
+        def set(self, key, value, expire=None):
+            io_threads.append(threading.get_ident())
+            fanout.set(key, value, expire=expire)
+
+    cache = TieredLLMCache(DiskCacheTier(RecordingFanout()))
+
+    await cache.aset("key", "value")
+    assert await cache.aget_many(["key", "other"]) == ["value", None]
+
+    assert len(io_threads) == 3
+    assert loop_thread not in io_threads
+    fanout.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_batches_concurrent_lookups():
+    """Test lookups issued together are served by a single MGET."""
+    client = FakeAsyncRedis()
+    client.data = {"a": b"first", "c": b"third"}
+    cache = TieredLLMCache(
+        AsyncRedisCacheTier("redis://test", client_factory=lambda: client)
+    )
+
+    values = await asyncio.gather(
+        cache.aget("a"), cache.aget("b"), cache.aget("c"), cache.aget("a")
+    )
+
+    assert values == ["first", None, "third", "first"]
+    assert client.mget_calls == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_writes_behind_in_one_pipeline():
+    """Test writes return immediately, are readable, and are pipelined on flush."""
+    client = FakeAsyncRedis()
+    cache = TieredLLMCache(
+        AsyncRedisCacheTier("redis://test", client_factory=lambda: client),
+        ttl_s=60,
+    )
+
+    await cache.aset("a", "first")
+    await cache.aset("b", "second")
+    assert client.data == {}
+    assert await cache.aget("b") == "second"
+    assert client.mget_calls == []
+
+    await cache.flush()
+
+    assert client.pipelines == [[("a", "first", 60000), ("b", "second", 60000)]]
+    assert client.data == {"a": "first", "b": "second"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "ttl_s, px", [(0.25, 250), (0.0001, 1), (1.5, 1500), (None, None)]
+)
+async def test_redis_tier_keeps_fractional_ttls(ttl_s, px):
+    """Test TTLs are sent in milliseconds and never round down to zero."""
+    client = FakeAsyncRedis()
+    tier = AsyncRedisCacheTier("redis://test", client_factory=lambda: client)
+
+    await tier.aset("a", "first", ttl_s)
+    await tier.flush()
+
+    assert client.expiry == {"a": px}
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_drops_failed_writes():
+    """Test a Redis write failure is logged and does not reach the caller."""
+
+    class FailingRedis(FakeAsyncRedis):
+        def pipeline(self, transaction=True):
+            raise ConnectionError("redis down")
+
+    tier = AsyncRedisCacheTier("redis://test", client_factory=FailingRedis)
+
+    await tier.aset("a", "first")
+    await tier.aclose()
+
+    assert await tier.aget("a") is None
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_finds_longest_cached_prefix():
+    """Test prefix lookup returns the longest prefix key with a cached value."""
+    persistent = DictTier()
+    persistent.data = {"p0": "short", "p2": "long"}
+    cache = TieredLLMCache(persistent)
+
+    assert await cache.aget_longest_prefix(["p0", "p1", "p2", "p3"]) == (2, "long")
+    assert await cache.aget_longest_prefix(["x0", "x1"]) == (-1, None)
@@ -1,26 +1,37 @@
 """Tests for LLM helper functions using clean semantic message architecture."""
 
+import asyncio
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
 from playbooks.core.enums import LLMMessageRole
+from playbooks.core.events import LLMCallEndedEvent
 from playbooks.core.exceptions import (
     CompilationError,
     VendorAPIOverloadedError,
     VendorAPIRateLimitError,
 )
+from playbooks.infrastructure.event_bus import EventBus
 from playbooks.llm.messages import (
     AssistantResponseLLMMessage,
     LLMMessage,
     SystemPromptLLMMessage,
     UserInputLLMMessage,
 )
+from playbooks.utils.llm_config import LLMConfig
 from playbooks.utils.llm_helper import (
+    _amake_completion_request,
     _make_completion_request,
+    _make_completion_request_stream,
     consolidate_messages,
     custom_get_cache_key,
+    get_cache_key_prefixes,
     ensure_upto_N_cached_messages,
+    get_completion,
     get_messages_for_prompt,
     remove_empty_messages,
     retry_on_overload,
@@ -130,6 +141,35 @@ def test_ensure_upto_N_cached_messages_user_message_cached():
     assert result[0]["cache_control"] == {"type": "ephemeral"}
 
 
+def test_ensure_upto_N_cached_messages_keeps_planned_breakpoints():
+    """Test the earliest of four planned markers survives when System is unmarked."""
+    messages = [
+        LLMMessage(f"Message {i}", LLMMessageRole.USER).to_full_message(
+            is_cached=i in (1, 5, 7, 11)
+        )
+        for i in range(12)
+    ]
+    messages[0] = SystemPromptLLMMessage().to_full_message(is_cached=False)
+
+    result = ensure_upto_N_cached_messages(messages)
+
+    marked = [i for i, message in enumerate(result) if "cache_control" in message]
+    assert marked == [1, 5, 7, 11]
+
+
+def test_ensure_upto_N_cached_messages_drops_oldest_beyond_limit():
+    """Test a cached System message leaves room for three more markers."""
+    messages = [SystemPromptLLMMessage().to_full_message(is_cached=True)] + [
+        LLMMessage(f"Message {i}", LLMMessageRole.USER).to_full_message(is_cached=True)
+        for i in range(1, 6)
+    ]
+
+    result = ensure_upto_N_cached_messages(messages)
+
+    marked = [i for i, message in enumerate(result) if "cache_control" in message]
+    assert marked == [0, 3, 4, 5]
+
+
 def test_semantic_message_integration():
     """Test that semantic message types work correctly with helper functions."""
     messages = [
@@ -242,6 +282,38 @@ def test_custom_get_cache_key():
     assert isinstance(key1, str)
 
 
+def test_cache_key_prefixes_roll_over_messages():
+    """Test prefix keys match the keys of the truncated requests."""
+    messages = [
+        {"role": "system", "content": "You are helpful"},
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi"},
+    ]
+
+    prefixes = get_cache_key_prefixes(model="gpt-4", messages=messages)
+
+    assert len(prefixes) == 3
+    assert prefixes[-1] == custom_get_cache_key(model="gpt-4", messages=messages)
+    assert prefixes[1] == custom_get_cache_key(model="gpt-4", messages=messages[:2])
+    assert prefixes[0] != custom_get_cache_key(model="gpt-3.5", messages=messages[:1])
+
+
+def test_cache_key_matches_llm_message_objects():
+    """Test rendered dicts and LLMMessage objects key identically, ignoring cache_control."""
+    message = UserInputLLMMessage(instruction="Hello")
+    rendered = message.to_full_message(is_cached=True)
+
+    assert "cache_control" in rendered
+    assert custom_get_cache_key(model="gpt-4", messages=[rendered]) == (
+        custom_get_cache_key(model="gpt-4", messages=[message])
+    )
+    assert custom_get_cache_key(
+        model="gpt-4", messages=[{"role": "user", "content": "Hello", "name": "x"}]
+    ) != custom_get_cache_key(
+        model="gpt-4", messages=[{"role": "user", "content": "Hello"}]
+    )
+
+
 @patch("playbooks.utils.llm_helper.completion")
 def test_make_completion_request(mock_completion):
     """Test _make_completion_request function with valid response."""
@@ -366,3 +438,380 @@ def test_make_completion_request_none_content(mock_completion):
         _make_completion_request(kwargs)
 
     assert "empty content" in str(exc_info.value)
+
+
+def _stream_chunk(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+
+
+def _fake_acompletion(chunks):
+    async def _acompletion(**kwargs):
+        async def _stream():
+            for content in chunks:
+                yield _stream_chunk(content)
+
+        return _stream()
+
+    return _acompletion
+
+
+@pytest.mark.asyncio
+async def test_make_completion_request_stream_yields_chunks():
+    """Test streaming yields content chunks from the async client, skipping None."""
+    with patch(
+        "playbooks.utils.llm_helper.acompletion",
+        side_effect=_fake_acompletion(["Hello", None, " world"]),
+    ) as mock_acompletion:
+        chunks = [
+            chunk
+            async for chunk in _make_completion_request_stream(
+                {"model": "gpt-4", "messages": [], "stream": True}
+            )
+        ]
+
+    assert chunks == ["Hello", " world"]
+    mock_acompletion.assert_called_once_with(model="gpt-4", messages=[], stream=True)
+
+
+@pytest.mark.asyncio
+async def test_make_completion_request_stream_retries_before_first_chunk():
+    """Test streaming retries on rate limit errors raised before any output."""
+    call_count = 0
+    succeed = _fake_acompletion(["ok"])
+
+    async def flaky_acompletion(**kwargs):
+        nonlocal call_count
+        call_count += 1
+        if call_count < 3:
+            raise VendorAPIRateLimitError("Rate limited")
+        return await succeed(**kwargs)
+
+    with (
+        patch("playbooks.utils.llm_helper.acompletion", flaky_acompletion),
+        patch("playbooks.utils.llm_helper.asyncio.sleep") as mock_sleep,
+    ):
+        chunks = [
+            chunk async for chunk in _make_completion_request_stream({"model": "x"})
+        ]
+
+    assert chunks == ["ok"]
+    assert call_count == 3
+    assert mock_sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_make_completion_request_stream_does_not_retry_after_output():
+    """Test errors after chunks were yielded are raised instead of replaying output."""
+    call_count = 0
+
+    async def failing_midstream(**kwargs):
+        nonlocal call_count
+        call_count += 1
+
+        async def _stream():
+            yield _stream_chunk("partial")
+            raise VendorAPIOverloadedError("Overloaded")
+
+        return _stream()
+
+    chunks = []
+    with patch("playbooks.utils.llm_helper.acompletion", failing_midstream):
+        with pytest.raises(VendorAPIOverloadedError):
+            async for chunk in _make_completion_request_stream({"model": "x"}):
+                chunks.append(chunk)
+
+    assert chunks == ["partial"]
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_amake_completion_request():
+    """Test _amake_completion_request awaits the async client and validates content."""
+
+    async def fake_acompletion(**kwargs):
+        return {
+            "choices": [
+                {"message": {"content": "Async response"}, "finish_reason": "stop"}
+            ]
+        }
+
+    with patch("playbooks.utils.llm_helper.acompletion", fake_acompletion):
+        result = await _amake_completion_request({"model": "gpt-4", "messages": []})
+
+    assert result == "Async response"
+
+
+@pytest.mark.asyncio
+async def test_retry_on_overload_async_uses_asyncio_sleep():
+    """Test retry_on_overload backs off with asyncio.sleep for coroutine functions."""
+    call_count = 0
+
+    @retry_on_overload(max_retries=3, base_delay=0.01)
+    async def failing_coroutine():
+        nonlocal call_count
+        call_count += 1
+        if call_count < 3:
+            raise VendorAPIOverloadedError("Overloaded")
+        return "Success"
+
+    with patch("playbooks.utils.llm_helper.time.sleep") as mock_time_sleep:
+        result = await failing_coroutine()
+
+    assert result == "Success"
+    assert call_count == 3
+    mock_time_sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_completion_non_streaming_does_not_block_event_loop():
+    """Test a slow non-streaming provider call leaves the event loop responsive."""
+    provider_latency = 5.0
+    tick_interval = 0.05
+    max_lag = 0.0
+
+    async def slow_acompletion(**kwargs):
+        await asyncio.sleep(provider_latency)
+        return {"choices": [{"message": {"content": "Done"}, "finish_reason": "stop"}]}
+
+    async def measure_lag(stop: asyncio.Event):
+        nonlocal max_lag
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(tick_interval)
+            max_lag = max(max_lag, time.perf_counter() - start - tick_interval)
+
+    async def run_completion():
+        return [
+            chunk
+            async for chunk in get_completion(
+                llm_config=LLMConfig(model="gpt-4", api_key="test-key"),
+                messages=[{"role": "user", "content": "Hello"}],
+                stream=False,
+                use_cache=False,
+            )
+        ]
+
+    stop = asyncio.Event()
+    with (
+        patch("playbooks.utils.llm_helper._check_llm_calls_allowed", return_value=True),
+        patch("playbooks.utils.llm_helper.get_messages_token_count", return_value=1),
+        patch("playbooks.utils.llm_helper.acompletion", slow_acompletion),
+    ):
+        ticker = asyncio.create_task(measure_lag(stop))
+        chunks = await run_completion()
+        stop.set()
+        await ticker
+
+    assert chunks == ["Done"]
+    assert max_lag < 0.25
+
+
+def _gated_acompletion(chunks, release: asyncio.Event, calls: list):
+    """Fake streaming provider that emits chunks[0] and waits on release for the rest."""
+
+    async def _acompletion(**kwargs):
+        calls.append(kwargs)
+
+        async def _stream():
+            yield _stream_chunk(chunks[0])
+            await release.wait()
+            for content in chunks[1:]:
+                yield _stream_chunk(content)
+
+        return _stream()
+
+    return _acompletion
+
+
+@contextmanager
+def _single_flight_patches(fake_acompletion):
+    with (
+        patch("playbooks.utils.llm_helper._check_llm_calls_allowed", return_value=True),
+        patch("playbooks.utils.llm_helper.get_messages_token_count", return_value=1),
+        patch("playbooks.utils.llm_helper.llm_cache_enabled", False),
+        patch("playbooks.utils.llm_helper.acompletion", fake_acompletion),
+    ):
+        yield
+
+
+async def _collect_completion(content: str = "Hello", stream: bool = True):
+    return [
+        chunk
+        async for chunk in get_completion(
+            llm_config=LLMConfig(model="gpt-4", api_key="test-key"),
+            messages=[{"role": "user", "content": content}],
+            stream=stream,
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_completion_coalesces_identical_in_flight_requests():
+    """Test identical concurrent requests share one provider call and late joiners replay."""
+    release = asyncio.Event()
+    calls = []
+    with _single_flight_patches(_gated_acompletion(["a", "b", "c"], release, calls)):
+        leader = asyncio.create_task(_collect_completion())
+        await asyncio.sleep(0.01)  # leader has received its first chunk
+        follower = asyncio.create_task(_collect_completion())
+        other = asyncio.create_task(_collect_completion(content="Different"))
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(leader, follower, other)
+
+    assert results == [["a", "b", "c"]] * 3
+    # One shared call for the identical requests, one for the different request
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_differing_in_other_arguments_are_not_coalesced():
+    """Test arguments outside the cache key still keep in-flight calls apart."""
+    release = asyncio.Event()
+    calls = []
+
+    async def collect(max_completion_tokens: int):
+        return [
+            chunk
+            async for chunk in get_completion(
+                llm_config=LLMConfig(
+                    model="gpt-4",
+                    api_key="test-key",
+                    max_completion_tokens=max_completion_tokens,
+                ),
+                messages=[{"role": "user", "content": "Hello"}],
+                stream=True,
+            )
+        ]
+
+    with _single_flight_patches(_gated_acompletion(["a"], release, calls)):
+        short = asyncio.create_task(collect(16))
+        await asyncio.sleep(0.01)
+        long = asyncio.create_task(collect(4096))
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(short, long)
+
+    assert sorted(call["max_completion_tokens"] for call in calls) == [16, 4096]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_follower_does_not_cancel_shared_call():
+    """Test a cancelled follower detaches without affecting the other subscribers."""
+    release = asyncio.Event()
+    calls = []
+    with _single_flight_patches(_gated_acompletion(["a", "b"], release, calls)):
+        leader = asyncio.create_task(_collect_completion())
+        follower = asyncio.create_task(_collect_completion())
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        release.set()
+        result = await leader
+
+    assert result == ["a", "b"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_after_last_subscriber_left_starts_a_new_call():
+    """Test a call being cancelled is not joined by a new identical request."""
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_to_cancel_acompletion(**kwargs):
+        calls.append(kwargs)
+
+        async def _stream():
+            yield _stream_chunk("a")
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.05)  # Closing the connection takes a while
+                raise
+            yield _stream_chunk("b")
+
+        return _stream()
+
+    with _single_flight_patches(slow_to_cancel_acompletion):
+        leader = asyncio.create_task(_collect_completion())
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        retry = asyncio.create_task(_collect_completion())
+        await asyncio.sleep(0.01)
+        release.set()
+        result = await retry
+
+    assert result == ["a", "b"]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_use_cache_false_does_not_coalesce():
+    """Test requests that opt out of caching always make their own provider call."""
+    release = asyncio.Event()
+    release.set()
+    calls = []
+
+    async def uncached():
+        return [
+            chunk
+            async for chunk in get_completion(
+                llm_config=LLMConfig(model="gpt-4", api_key="test-key"),
+                messages=[{"role": "user", "content": "Hello"}],
+                stream=True,
+                use_cache=False,
+            )
+        ]
+
+    with _single_flight_patches(_gated_acompletion(["a"], release, calls)):
+        await asyncio.gather(uncached(), uncached())
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_completion_reports_prompt_cache_tokens():
+    """Test provider prompt-cache usage is published on LLMCallEndedEvent."""
+
+    async def fake_acompletion(**kwargs):
+        async def _stream():
+            yield _stream_chunk("Done")
+            yield SimpleNamespace(
+                choices=[],
+                usage={
+                    "prompt_tokens": 5000,
+                    "cache_read_input_tokens": 4000,
+                    "cache_creation_input_tokens": 600,
+                },
+            )
+
+        return _stream()
+
+    event_bus = EventBus("test-session")
+    events = []
+    event_bus.subscribe(LLMCallEndedEvent, events.append)
+    with (
+        _single_flight_patches(fake_acompletion),
+        patch("playbooks.utils.llm_helper.approximate_token_counts", True),
+    ):
+        chunks = [
+            chunk
+            async for chunk in get_completion(
+                llm_config=LLMConfig(model="gpt-4", api_key="test-key"),
+                messages=[{"role": "user", "content": "Hello"}],
+                stream=True,
+                event_bus=event_bus,
+                agent_id="agent",
+                session_id="test-session",
+            )
+        ]
+
+    assert chunks == ["Done"]
+    assert events[-1].cache_read_tokens == 4000
+    assert events[-1].cache_write_tokens == 600
@@ -0,0 +1,197 @@
+"""Tests for the process-wide LLM scheduler."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from playbooks.config import LLMRateLimitConfig, LLMSchedulerConfig
+from playbooks.core.enums import LLMCallPriority
+from playbooks.utils.llm_config import LLMConfig
+from playbooks.utils.llm_helper import get_completion
+from playbooks.utils.llm_scheduler import LLMScheduler, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_per_minute_rate():
+    """Test the bucket starts full and refills continuously."""
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+
+    assert bucket.time_until_available(60) == 0
+    bucket.consume(60)
+    assert bucket.time_until_available(1) == pytest.approx(1.0)
+
+    clock.now = 30.0
+    assert bucket.time_until_available(30) == 0
+    assert bucket.time_until_available(31) == pytest.approx(1.0)
+
+
+def test_token_bucket_clamps_oversized_requests():
+    """Test a request larger than the bucket waits for a full bucket, not forever."""
+    clock = FakeClock()
+    bucket = TokenBucket(100, clock=clock)
+    bucket.consume(100)
+
+    assert bucket.time_until_available(10_000) == pytest.approx(60.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_dispatches_by_priority():
+    """Test queued calls are granted in priority order, FIFO within a priority."""
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=1))
+    order = []
+
+    async def call(name, priority):
+        async with scheduler.reserve("model", priority=priority):
+            order.append(name)
+
+    await scheduler.acquire("model")  # Occupy the only slot
+    tasks = [
+        asyncio.create_task(call("compile", LLMCallPriority.BACKGROUND)),
+        asyncio.create_task(call("agent-1", LLMCallPriority.AGENT)),
+        asyncio.create_task(call("say", LLMCallPriority.INTERACTIVE)),
+        asyncio.create_task(call("agent-2", LLMCallPriority.AGENT)),
+    ]
+    await asyncio.sleep(0)
+
+    metrics = scheduler.get_metrics()
+    assert metrics.queue_depth == 4
+    assert metrics.queue_depth_by_priority == {
+        "background": 1,
+        "agent": 2,
+        "interactive": 1,
+    }
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["say", "agent-1", "agent-2", "compile"]
+    assert scheduler.get_metrics().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_applies_model_tpm_limit():
+    """Test calls wait for tokens-per-minute capacity and record their wait."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(
+        LLMSchedulerConfig(models={"model": LLMRateLimitConfig(tpm=100)}),
+        clock=clock,
+    )
+
+    async with scheduler.reserve("model", tokens=100):
+        pass
+
+    waiting = asyncio.create_task(scheduler.acquire("model", tokens=50))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    assert scheduler.get_metrics().queue_depth == 1
+
+    clock.now = 30.0
+    scheduler._dispatch()
+    await waiting
+    scheduler.release()
+
+    metrics = scheduler.get_metrics()
+    assert metrics.queue_depth == 0
+    assert metrics.dispatched == 2
+    assert metrics.max_wait_s == pytest.approx(30.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rate_limit_does_not_block_other_providers():
+    """Test a call blocked on one provider's RPM does not hold back another provider."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(
+        LLMSchedulerConfig(providers={"anthropic": LLMRateLimitConfig(rpm=1)}),
+        clock=clock,
+    )
+    await scheduler.acquire("claude", provider="anthropic")
+
+    blocked = asyncio.create_task(
+        scheduler.acquire(
+            "claude", provider="anthropic", priority=LLMCallPriority.INTERACTIVE
+        )
+    )
+    other = asyncio.create_task(
+        scheduler.acquire(
+            "gemini", provider="gemini", priority=LLMCallPriority.BACKGROUND
+        )
+    )
+    await asyncio.sleep(0)
+
+    assert other.done()
+    assert not blocked.done()
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    assert scheduler.get_metrics().queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_get_completion_respects_scheduler_concurrency():
+    """Test get_completion calls against a fake provider never exceed max_concurrency."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_acompletion(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {
+            "choices": [
+                {
+                    "message": {"content": kwargs["messages"][0]["content"]},
+                    "finish_reason": "stop",
+                }
+            ]
+        }
+
+    async def ask(content):
+        return [
+            chunk
+            async for chunk in get_completion(
+                llm_config=LLMConfig(model="gpt-4", api_key="test-key"),
+                messages=[{"role": "user", "content": content}],
+                use_cache=False,
+            )
+        ]
+
+    scheduler = LLMScheduler(LLMSchedulerConfig(max_concurrency=2))
+    with (
+        patch("playbooks.utils.llm_helper._check_llm_calls_allowed", return_value=True),
+        patch("playbooks.utils.llm_helper.get_messages_token_count", return_value=1),
+        patch("playbooks.utils.llm_helper.acompletion", fake_acompletion),
+        patch("playbooks.utils.llm_helper.llm_scheduler", scheduler),
+    ):
+        results = await asyncio.gather(*[ask(f"q{i}") for i in range(6)])
+
+    assert results == [[f"q{i}"] for i in range(6)]
+    assert peak == 2
+    assert scheduler.get_metrics().dispatched == 6
+
+
+def test_scheduler_config_parses_limits():
+    """Test scheduler limits load from the config schema."""
+    scheduler_config = LLMSchedulerConfig.model_validate(
+        {
+            "max_concurrency": 8,
+            "models": {"gemini/gemini-3-flash-preview": {"rpm": 1000}},
+            "providers": {"anthropic": {"rpm": 50, "tpm": 40000}},
+        }
+    )
+
+    assert scheduler_config.models["gemini/gemini-3-flash-preview"].rpm == 1000
+    assert scheduler_config.providers["anthropic"].rpm == 50
+    assert scheduler_config.providers["anthropic"].tpm == 40000
@@ -1,6 +1,6 @@
 """Test suite for Playbooks-LM preprocessing handler."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -218,12 +218,14 @@ class TestCompletionWrapper:
 
     @pytest.mark.asyncio
     @patch("playbooks.utils.llm_helper._check_llm_calls_allowed", return_value=True)
-    @patch("playbooks.utils.llm_helper._original_completion")
+    @patch("playbooks.utils.llm_helper._original_acompletion", new_callable=AsyncMock)
     async def test_playbooks_lm_preprocessing_via_get_completion(
         self, mock_completion, mock_check
     ):
         """Test that playbooks-lm models get preprocessing through get_completion."""
-        mock_completion.return_value = MagicMock()
+        mock_completion.return_value = {
+            "choices": [{"message": {"content": "Response"}, "finish_reason": "stop"}]
+        }
 
         messages = [
             {
@@ -0,0 +1,147 @@
+"""Tests for the dependency-aware program startup scheduler."""
+
+import asyncio
+
+import pytest
+
+from playbooks.utils.startup_scheduler import StartupScheduler
+
+
+class InFlight:
+    """Counts concurrently running steps."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    def step(self, order=None, name=None, delay=0.01):
+        async def run():
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+            await asyncio.sleep(delay)
+            self.current -= 1
+            if order is not None:
+                order.append(name)
+            return name
+
+        return run
+
+
+@pytest.mark.asyncio
+async def test_runs_dependencies_first_and_independent_steps_together():
+    """Test steps wait for their dependencies and otherwise run concurrently."""
+    scheduler = StartupScheduler()
+    in_flight = InFlight()
+    order = []
+    scheduler.add("parse", in_flight.step(order, "parse"))
+    scheduler.add("a", in_flight.step(order, "a"), depends_on=["parse"])
+    scheduler.add("b", in_flight.step(order, "b"), depends_on=["parse"])
+    scheduler.add("done", in_flight.step(order, "done"), depends_on=["a", "b"])
+
+    tasks = await scheduler.run()
+
+    assert order[0] == "parse"
+    assert set(order[1:3]) == {"a", "b"}
+    assert order[3] == "done"
+    assert in_flight.peak == 2
+    assert [task.result for task in tasks] == ["parse", "a", "b", "done"]
+    assert all(task.started_at >= 0 for task in tasks)
+    assert tasks[3].started_at >= max(tasks[1].ended_at, tasks[2].ended_at)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_running_steps():
+    """Test no more than max_concurrency steps run at once."""
+    scheduler = StartupScheduler(max_concurrency=2)
+    in_flight = InFlight()
+    for i in range(6):
+        scheduler.add(f"discover:{i}", in_flight.step())
+
+    await scheduler.run()
+
+    assert in_flight.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_steps_added_while_running_are_run():
+    """Test a step can add more steps, which depend on it."""
+    scheduler = StartupScheduler()
+    order = []
+
+    async def register():
+        order.append("register")
+        for i in range(3):
+            scheduler.add(
+                f"initialize:{i}", InFlight().step(order, i), depends_on=["register"]
+            )
+
+    scheduler.add("register", register)
+    tasks = await scheduler.run()
+
+    assert order[0] == "register"
+    assert sorted(order[1:]) == [0, 1, 2]
+    assert [task.name for task in tasks] == [
+        "register",
+        "initialize:0",
+        "initialize:1",
+        "initialize:2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failure_skips_dependents_and_is_raised():
+    """Test dependents of a failed step do not run and run() raises its error."""
+    scheduler = StartupScheduler()
+    ran = []
+
+    async def fail():
+        raise RuntimeError("parse failed")
+
+    async def dependent():
+        ran.append("dependent")
+
+    async def independent():
+        ran.append("independent")
+
+    scheduler.add("parse", fail)
+    scheduler.add("agents", dependent, depends_on=["parse"])
+    scheduler.add("other", independent)
+
+    with pytest.raises(RuntimeError, match="parse failed"):
+        await scheduler.run()
+
+    assert ran == ["independent"]
+    assert scheduler.tasks["agents"].started_at is None
+    assert "parse failed" in scheduler.tasks["parse"].to_dict()["error"]
+
+
+def test_dependencies_must_be_added_first():
+    """Test unknown dependencies and duplicate names are rejected."""
+    scheduler = StartupScheduler()
+    scheduler.add("parse", InFlight().step())
+
+    with pytest.raises(ValueError, match="unknown tasks: agents"):
+        scheduler.add("register", InFlight().step(), depends_on=["agents"])
+    with pytest.raises(ValueError, match="Duplicate"):
+        scheduler.add("parse", InFlight().step())
+
+
+@pytest.mark.asyncio
+async def test_critical_path_follows_slowest_dependencies():
+    """Test the critical path is the chain of steps that ended last."""
+    scheduler = StartupScheduler()
+    in_flight = InFlight()
+    scheduler.add("parse", in_flight.step(delay=0))
+    scheduler.add("discover:fast", in_flight.step(delay=0), depends_on=["parse"])
+    scheduler.add("discover:mcp", in_flight.step(delay=0.05), depends_on=["parse"])
+    scheduler.add(
+        "initialize",
+        in_flight.step(delay=0),
+        depends_on=["discover:fast", "discover:mcp"],
+    )
+
+    await scheduler.run()
+
+    assert scheduler.critical_path() == ["parse", "discover:mcp", "initialize"]
+    assert scheduler.duration >= 0.05
+    assert scheduler.duration == scheduler.tasks["initialize"].ended_at
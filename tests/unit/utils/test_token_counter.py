@@ -0,0 +1,86 @@
+"""Tests for token counting and its memoization."""
+
+from unittest.mock import patch
+
+from playbooks.llm.messages import AssistantResponseLLMMessage
+from playbooks.utils import token_counter
+from playbooks.utils.token_counter import (
+    approximate_token_count,
+    get_encoding,
+    get_messages_token_count,
+)
+
+
+class FakeEncoding:
+    """Encodes one token per whitespace-separated word, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+
+def test_approximate_token_count_is_chars_over_four():
+    """Test the approximate mode rounds characters / 4 up."""
+    assert approximate_token_count("") == 0
+    assert approximate_token_count("abcd") == 1
+    assert approximate_token_count("abcde") == 2
+
+
+def test_get_encoding_loads_each_model_once():
+    """Test the encoder registry memoizes tiktoken lookups per model."""
+    get_encoding.cache_clear()
+    with patch.object(
+        token_counter.tiktoken, "encoding_for_model", return_value=FakeEncoding()
+    ) as encoding_for_model:
+        assert get_encoding("test-model") is get_encoding("test-model")
+
+    assert encoding_for_model.call_count == 1
+    get_encoding.cache_clear()
+
+
+def test_messages_token_count_encodes_unchanged_messages_once():
+    """Test repeated counts of a growing history only encode new content."""
+    encoding = FakeEncoding()
+    message = AssistantResponseLLMMessage("")
+    history = [{"role": "user", "content": "one two three"}, message]
+    with patch.object(token_counter, "get_encoding", return_value=encoding):
+        token_counter._CONTENT_TOKEN_COUNTS.clear()
+        message.set_content("four five")
+        first = get_messages_token_count(history, "test-model")
+        second = get_messages_token_count(history, "test-model")
+        message.set_content("four five six")
+        third = get_messages_token_count(history, "test-model")
+        token_counter._CONTENT_TOKEN_COUNTS.clear()
+
+    # 2 messages * 4 overhead + 2 conversation overhead
+    assert first == second == 5 + 10
+    assert third == 6 + 10
+    assert encoding.calls == 3
+
+
+def test_messages_token_count_approximate_mode_skips_encoding():
+    """Test approximate mode never touches the tokenizer."""
+    messages = [{"role": "user", "content": "x" * 40}]
+    with patch.object(token_counter, "get_encoding") as get_encoding_mock:
+        assert get_messages_token_count(messages, approximate=True) == 10 + 4 + 2
+
+    get_encoding_mock.assert_not_called()
+
+
+def test_content_token_counts_do_not_keep_content():
+    """Test the dict message memo is keyed without holding message contents."""
+    content = "".join(["retained? "] * 1000)
+    with patch.object(token_counter, "get_encoding", return_value=FakeEncoding()):
+        token_counter._CONTENT_TOKEN_COUNTS.clear()
+        count = get_messages_token_count([{"role": "user", "content": content}])
+
+    assert count == 1000 + 4 + 2
+    assert all(
+        part is not content
+        for key in token_counter._CONTENT_TOKEN_COUNTS
+        for part in key
+    )
+    token_counter._CONTENT_TOKEN_COUNTS.clear()